@@ -1,11 +1,20 @@
 """
 Configuration de la base de données SQLAlchemy.
-Gère la connexion async à SQLite et les sessions.
+Gère la connexion async (SQLite/aiosqlite ou PostgreSQL/asyncpg) et les sessions.
+
+Trois engines:
+- `engine`: sessions lecture/écriture des routes (get_db)
+- `read_engine`: pool de connexions en lecture seule pour les routes GET (get_read_db)
+- `writer_engine`: connexion d'écriture unique alimentée par la file d'écriture
+  (cf. backend.app.write_queue), qui regroupe les petites écritures des workers
+  en un commit; les écritures des routes passent par `engine`
 """
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy import bindparam, event, inspect, or_, select, text, update
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Dict
 
 from backend.app.config import settings
 
@@ -16,13 +25,130 @@ class Base(DeclarativeBase):
     pass
 
 
-# Engine async SQLite
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,  # Log SQL queries si DEBUG=True
-    future=True,
-    pool_pre_ping=True,  # Vérifier la connexion avant utilisation
-)
+def engine_url(database_url) -> URL:
+    """
+    URL de connexion complétée selon le backend.
+    PostgreSQL (asyncpg): taille du cache de requêtes préparées côté SQLAlchemy.
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() == "postgresql" and url.get_driver_name() == "asyncpg":
+        url = url.update_query_dict(
+            {"prepared_statement_cache_size": str(settings.DATABASE_STATEMENT_CACHE_SIZE)}
+        )
+    return url
+
+
+def engine_options(database_url) -> Dict[str, Any]:
+    """
+    Options d'engine selon le backend.
+    SQLite garde le pool par défaut (un fichier local, un seul écrivain);
+    PostgreSQL reçoit un pool dimensionné et le cache de requêtes asyncpg.
+    """
+    options: Dict[str, Any] = {
+        "echo": settings.DEBUG,  # Log SQL queries si DEBUG=True
+        "future": True,
+        "pool_pre_ping": True,  # Vérifier la connexion avant utilisation
+    }
+
+    url = make_url(database_url)
+    if url.get_backend_name() == "postgresql":
+        options.update(
+            pool_size=settings.DATABASE_POOL_SIZE,
+            max_overflow=settings.DATABASE_MAX_OVERFLOW,
+            pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+            pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        )
+        if url.get_driver_name() == "asyncpg":
+            options["connect_args"] = {"statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE}
+
+    return options
+
+
+# Engine async principal (lecture/écriture)
+engine = create_async_engine(engine_url(settings.DATABASE_URL), **engine_options(settings.DATABASE_URL))
+
+
+def sqlite_pragmas() -> Dict[str, Any]:
+    """PRAGMA SQLite issus des settings (ordre d'application conservé)"""
+    return {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "temp_store": settings.SQLITE_TEMP_STORE,
+    }
+
+
+def enable_sqlite_tuning(async_engine: AsyncEngine, pragmas: Dict[str, Any]):
+    """
+    Applique les PRAGMA à chaque nouvelle connexion SQLite du pool.
+    
+    Args:
+        async_engine: Engine async (sqlite+aiosqlite)
+        pragmas: {nom: valeur}, ex: sqlite_pragmas()
+    """
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def read_only_url(database_url) -> URL:
+    """
+    URL de connexion en lecture seule.
+    SQLite fichier: URI `file:...?mode=ro` (toute écriture est refusée par SQLite).
+    Autres bases ou SQLite en mémoire: URL inchangée.
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return url
+    return url.set(database=f"file:{url.database}?mode=ro", query={"uri": "true"})
+
+
+def enable_sqlite_explicit_begin(async_engine: AsyncEngine, begin_statement: str = "BEGIN"):
+    """
+    Laisse SQLAlchemy émettre lui-même le BEGIN (au lieu du pilote sqlite3),
+    pour que les SAVEPOINT restent imbriqués dans la transaction englobante.
+    
+    Args:
+        async_engine: Engine async (sqlite+aiosqlite)
+        begin_statement: "BEGIN IMMEDIATE" pour prendre le verrou d'écriture dès l'ouverture
+    """
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def disable_driver_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(async_engine.sync_engine, "begin")
+    def emit_begin(connection):
+        connection.exec_driver_sql(begin_statement)
+
+
+# Engine lecture seule (routes GET): lectures concurrentes en WAL, jamais bloquées par l'écrivain.
+# PostgreSQL: réplique optionnelle (DATABASE_READ_URL), transactions READ ONLY.
+_read_url = settings.DATABASE_READ_URL or settings.DATABASE_URL
+_read_options = engine_options(_read_url)
+if make_url(_read_url).get_backend_name() == "postgresql":
+    _read_options["execution_options"] = {"postgresql_readonly": True}
+read_engine = create_async_engine(engine_url(read_only_url(_read_url)), **_read_options)
+
+# Engine d'écriture unique (file d'écriture): une seule connexion, les écritures
+# des workers sont sérialisées en mémoire plutôt que sur le verrou du fichier
+_writer_options = engine_options(settings.DATABASE_URL)
+_writer_options.update(pool_size=1, max_overflow=0)
+writer_engine = create_async_engine(engine_url(settings.DATABASE_URL), **_writer_options)
+
+if engine.dialect.name == "sqlite":
+    if settings.SQLITE_TUNING_ENABLED:
+        enable_sqlite_tuning(engine, sqlite_pragmas())
+        enable_sqlite_tuning(writer_engine, sqlite_pragmas())
+        # journal_mode est persistant dans le fichier: inutile (et refusé) en lecture seule
+        read_pragmas = sqlite_pragmas()
+        read_pragmas.pop("journal_mode")
+        enable_sqlite_tuning(read_engine, read_pragmas)
+    enable_sqlite_explicit_begin(writer_engine, "BEGIN IMMEDIATE")
 
 # Session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -33,14 +159,35 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+AsyncReadSessionLocal = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
+AsyncWriterSessionLocal = async_sessionmaker(
+    writer_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency FastAPI pour obtenir une session de base de données.
     
+    Unité de travail: les services ne font que `flush`, la requête est validée
+    par un unique commit ici (rollback si une exception est levée).
+    Déclarée avec scope="function" pour que le commit ait lieu avant l'envoi
+    de la réponse: un échec de commit produit une erreur, pas un faux succès.
+    
     Usage:
         @app.get("/...")
-        async def endpoint(db: AsyncSession = Depends(get_db)):
+        async def endpoint(db: AsyncSession = Depends(get_db, scope="function")):
             ...
     """
     async with AsyncSessionLocal() as session:
@@ -54,6 +201,23 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency FastAPI pour les routes en lecture seule (connexion `mode=ro`).
+    Aucun commit: toute écriture tentée échoue côté SQLite.
+    
+    Usage:
+        @app.get("/...")
+        async def endpoint(db: AsyncSession = Depends(get_read_db)):
+            ...
+    """
+    async with AsyncReadSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
 async def init_db():
     """
     Initialise la base de données (crée toutes les tables).
@@ -61,7 +225,95 @@ async def init_db():
     """
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(create_missing_columns)
+        await conn.run_sync(create_missing_indexes)
+        await conn.run_sync(backfill_research_states)
+
+
+def create_missing_columns(connection):
+    """
+    Ajoute aux tables existantes les colonnes nullables déclarées absentes.
+    `create_all` ne modifie jamais une table existante: une base créée avant
+    l'ajout d'une colonne optionnelle (ex: characters.hp_updated_at) la reçoit ici.
+    """
+    inspector = inspect(connection)
+    preparer = connection.dialect.identifier_preparer
+
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing or not column.nullable:
+                continue
+            connection.execute(text(
+                f"ALTER TABLE {preparer.format_table(table)} "
+                f"ADD COLUMN {preparer.format_column(column)} "
+                f"{column.type.compile(dialect=connection.dialect)}"
+            ))
+
+
+def create_missing_indexes(connection):
+    """
+    Crée les index déclarés absents des tables existantes.
+    `create_all` ne crée les index qu'avec leur table: une base créée avant
+    l'ajout d'un index ne le recevrait jamais sans cette passe.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+
+
+def backfill_research_states(connection):
+    """
+    Recalcule l'état compact des recherches des villages où il est absent ou
+    calculé pour un autre arbre (base antérieure à la colonne, arbre modifié).
+    La production lit ce bitset sans repli sur les lignes researches: sans
+    cette passe, ces villages produiraient sans leurs bonus de recherche.
+    """
+    from backend.app.models import Research, Village
+    from backend.app.utils.research_tree import ResearchState, research_index
+
+    villages = Village.__table__
+    stale_ids = connection.execute(
+        select(villages.c.id).where(or_(
+            villages.c.research_completed_mask.is_(None),
+            villages.c.research_state_version.is_(None),
+            villages.c.research_state_version != research_index.fingerprint
+        ))
+    ).scalars().all()
+    if not stale_ids:
+        return
+
+    statuses: Dict[int, list] = {village_id: [] for village_id in stale_ids}
+    researches = Research.__table__
+    for start in range(0, len(stale_ids), 500):
+        rows = connection.execute(
+            select(researches.c.village_id, researches.c.key, researches.c.status)
+            .where(researches.c.village_id.in_(stale_ids[start:start + 500]))
+        )
+        for village_id, key, status in rows:
+            statuses[village_id].append((key, status))
 
+    params = []
+    for village_id, village_statuses in statuses.items():
+        state = ResearchState.from_statuses(village_statuses)
+        params.append({
+            "b_id": village_id,
+            "b_mask": state.completed_mask,
+            "b_in_progress": state.in_progress,
+        })
+    connection.execute(
+        update(villages)
+        .where(villages.c.id == bindparam("b_id"))
+        .values(
+            research_completed_mask=bindparam("b_mask"),
+            research_in_progress=bindparam("b_in_progress"),
+            research_state_version=research_index.fingerprint
+        ),
+        params
+    )
 
 async def close_db():
     """
@@ -69,3 +321,5 @@ async def close_db():
     À appeler à l'arrêt de l'application.
     """
     await engine.dispose()
+    await read_engine.dispose()
+    await writer_engine.dispose()
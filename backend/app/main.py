@@ -24,16 +24,20 @@ async def lifespan(app: FastAPI):
     await init_db()
     print("✅ Base de données initialisée")
     
-    # Startup: Démarrer les workers background
-    worker_manager.start()
-    print("✅ Workers background démarrés")
+    # Startup: Démarrer les workers background (sauf si processus worker séparé)
+    if settings.WORKERS_IN_PROCESS:
+        worker_manager.start()
+        print("✅ Workers background démarrés")
+    else:
+        print("ℹ️  Workers désactivés dans l'API (processus worker séparé)")
     
     yield
     
     # Shutdown: Arrêter les workers
     print("🛑 Arrêt de Loots&Live...")
-    worker_manager.stop()
-    print("✅ Workers arrêtés")
+    if settings.WORKERS_IN_PROCESS:
+        worker_manager.stop()
+        print("✅ Workers arrêtés")
     
     # Shutdown: Fermer les connexions
     await close_db()
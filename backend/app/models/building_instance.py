@@ -3,7 +3,7 @@ Modèle BuildingInstance - Instance de bâtiment placée dans un village.
 """
 
 from datetime import datetime
-from sqlalchemy import Integer, DateTime, ForeignKey, Boolean
+from sqlalchemy import Integer, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import Optional, List
 
@@ -13,6 +13,14 @@ from backend.app.database import Base
 class BuildingInstance(Base):
     """Table des instances de bâtiments (bâtiments placés dans les villages)"""
     __tablename__ = "building_instances"
+    __table_args__ = (
+        # Production (bâtiments actifs, par village)
+        Index('ix_building_instances_active_village', 'is_active', 'village_id'),
+        # Occupation d'une case de la grille
+        Index('ix_building_instances_village_grid', 'village_id', 'grid_x', 'grid_y'),
+        # Comptage des instances d'un type de bâtiment par village
+        Index('ix_building_instances_village_building', 'village_id', 'building_id'),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     village_id: Mapped[int] = mapped_column(Integer, ForeignKey("villages.id", ondelete="CASCADE"), nullable=False, index=True)
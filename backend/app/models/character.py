@@ -46,6 +46,8 @@ class Character(Base):
     current_hp: Mapped[int] = mapped_column(Integer, default=100, nullable=False)
     max_hp: Mapped[int] = mapped_column(Integer, default=100, nullable=False)
     is_on_mission: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    # Instant auquel `current_hp` est compté (régénération calculée depuis, NULL = created_at)
+    hp_updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     
     # Apparence (JSON stockant toutes les options)
     appearance: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True)
@@ -3,7 +3,7 @@ Modèle Mission - Missions d'exploration.
 """
 
 from datetime import datetime
-from sqlalchemy import Integer, String, DateTime, ForeignKey, Text, JSON
+from sqlalchemy import Integer, String, DateTime, ForeignKey, Text, JSON, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import Optional, List, Dict, Any
 
@@ -14,6 +14,10 @@ from backend.app.utils.constants import MissionType, MissionStatus
 class Mission(Base):
     """Table des missions"""
     __tablename__ = "missions"
+    __table_args__ = (
+        # Balayage des missions échues (worker missions)
+        Index('ix_missions_status_completed_at', 'status', 'completed_at'),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     village_id: Mapped[int] = mapped_column(Integer, ForeignKey("villages.id", ondelete="CASCADE"), nullable=False, index=True)
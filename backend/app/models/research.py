@@ -3,23 +3,28 @@ Modèle Research - Recherches technologiques.
 """
 
 from datetime import datetime
-from sqlalchemy import Integer, String, DateTime, ForeignKey, Text, JSON, Boolean
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import Integer, String, DateTime, ForeignKey, Text, JSON, Boolean, Index
+from sqlalchemy.orm import Mapped, mapped_column, relationship, synonym
 from typing import Optional, Dict, Any
 
 from backend.app.database import Base
-from backend.app.utils.constants import ResearchStatus
+from backend.app.utils.constants import ResearchStatus, ResearchCategory, RESEARCH_TREE
 
 
 class Research(Base):
     """Table des recherches (arbre technologique)"""
     __tablename__ = "researches"
+    __table_args__ = (
+        # Balayage des recherches échues (worker recherches)
+        Index('ix_researches_status_completed_at', 'status', 'completed_at'),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     village_id: Mapped[int] = mapped_column(Integer, ForeignKey("villages.id", ondelete="CASCADE"), nullable=False, index=True)
     
     # Informations de base
     key: Mapped[str] = mapped_column(String(50), nullable=False, index=True)  # Identifiant unique de la recherche
+    research_key: Mapped[str] = synonym("key")  # Clé dans RESEARCH_TREE (nom utilisé par l'API)
     name: Mapped[str] = mapped_column(String(100), nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=False)
     status: Mapped[str] = mapped_column(String(20), default=ResearchStatus.LOCKED.value, nullable=False)  # ResearchStatus enum
@@ -49,5 +54,11 @@ class Research(Base):
     # Relations
     village: Mapped["Village"] = relationship("Village", back_populates="researches")
 
+    @property
+    def category(self) -> Optional[ResearchCategory]:
+        """Catégorie de la recherche (définie par RESEARCH_TREE, non stockée)"""
+        data = RESEARCH_TREE.get(self.key)
+        return ResearchCategory(data["category"]) if data else None
+
     def __repr__(self) -> str:
         return f"<Research(id={self.id}, key='{self.key}', status='{self.status}', village_id={self.village_id})>"
@@ -3,7 +3,7 @@ Modèle Village - Village du joueur.
 """
 
 from datetime import datetime
-from sqlalchemy import String, Integer, DateTime, ForeignKey, Text
+from sqlalchemy import String, Integer, BigInteger, DateTime, ForeignKey, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import Optional, List
 
@@ -20,6 +20,10 @@ class Village(Base):
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     warehouse_capacity: Mapped[int] = mapped_column(Integer, default=1000, nullable=False)
     moral: Mapped[int] = mapped_column(Integer, default=70, nullable=False)
+    # État des recherches en bitset (cf. utils/research_tree.py), tenu à jour avec les lignes researches
+    research_completed_mask: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    research_in_progress: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    research_state_version: Mapped[Optional[str]] = mapped_column(String(16), nullable=True)  # research_index.fingerprint
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
 
     # Relations
@@ -40,7 +44,7 @@ class Village(Base):
         "Resource",
         back_populates="village",
         cascade="all, delete-orphan",
-        lazy="selectin"
+        lazy="select"
     )
     missions: Mapped[List["Mission"]] = relationship(
         "Mission",
@@ -2,14 +2,15 @@
 Routes d'authentification - Inscription et connexion.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.app.database import get_db
+from backend.app.database import get_db, get_read_db
 from backend.app.schemas.user import UserCreate, UserLogin, UserResponse, Token
 from backend.app.services.auth_service import AuthService
 from backend.app.services.character_service import CharacterService
-from backend.app.utils.dependencies import get_current_user
+from backend.app.utils.dependencies import get_current_user_read
+from backend.app.utils.rate_limit import login_rate_limiter
 from backend.app.models.user import User
 
 
@@ -19,7 +20,7 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(
     user_data: UserCreate,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Inscription d'un nouvel utilisateur.
@@ -37,7 +38,8 @@ async def register(
 @router.post("/login", response_model=Token)
 async def login(
     login_data: UserLogin,
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Connexion d'un utilisateur existant.
@@ -46,14 +48,21 @@ async def login(
     - **password**: Mot de passe
     
     Retourne un token JWT d'accès valide 30 jours.
+    Au-delà de RATE_LIMIT_LOGIN_ATTEMPTS tentatives par fenêtre glissante
+    (nom d'utilisateur + IP), répond 429 sans interroger la base ni bcrypt.
     """
+    client_ip = request.client.host if request.client else None
+    await login_rate_limiter.check(login_data.username, client_ip)
+    
     token = await AuthService.login(db, login_data)
+    
+    await login_rate_limiter.reset(login_data.username, client_ip)
     return token
 
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user_read)
 ):
     """
     Récupère les informations de l'utilisateur connecté.
@@ -79,8 +88,8 @@ async def logout():
 
 @router.get("/check-character", status_code=status.HTTP_200_OK)
 async def check_character_created(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Vérifie si l'utilisateur a créé son personnage joueur.
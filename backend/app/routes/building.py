@@ -5,7 +5,7 @@ Routes API pour la gestion des bâtiments.
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 
-from backend.app.database import get_db
+from backend.app.database import get_db, get_read_db
 from sqlalchemy.ext.asyncio import AsyncSession
 from backend.app.models.user import User
 from backend.app.schemas.building import (
@@ -15,7 +15,7 @@ from backend.app.schemas.building import (
     BuildingBuild
 )
 from backend.app.services.building_service import BuildingService
-from backend.app.utils.dependencies import get_current_active_user
+from backend.app.utils.dependencies import get_current_active_user, get_current_active_user_read
 
 
 router = APIRouter(prefix="/buildings", tags=["buildings"])
@@ -23,8 +23,8 @@ router = APIRouter(prefix="/buildings", tags=["buildings"])
 
 @router.get("/catalog", response_model=List[BuildingResponse])
 async def get_building_catalog(
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_active_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Récupère le catalogue complet des types de bâtiments disponibles.
@@ -46,8 +46,8 @@ async def get_building_catalog(
 @router.get("/catalog/{building_key}", response_model=BuildingResponse)
 async def get_building_details(
     building_key: str,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_active_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Récupère les détails d'un type de bâtiment spécifique.
@@ -68,8 +68,8 @@ async def get_building_details(
 
 @router.get("/", response_model=List[BuildingInstanceResponse])
 async def get_my_buildings(
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_active_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Récupère toutes les instances de bâtiments de mon village.
@@ -88,8 +88,8 @@ async def get_my_buildings(
 @router.get("/{instance_id}", response_model=BuildingInstanceResponse)
 async def get_building_instance(
     instance_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_active_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Récupère les détails d'une instance de bâtiment spécifique.
@@ -112,7 +112,7 @@ async def get_building_instance(
 async def build_building(
     build_data: BuildingBuild,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Construit un nouveau bâtiment dans le village.
@@ -138,7 +138,7 @@ async def build_building(
 async def upgrade_building(
     instance_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Améliore un bâtiment (niveau 1 à 5 max).
@@ -162,7 +162,7 @@ async def destroy_building(
     instance_id: int,
     refund_percent: int = 50,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Détruit un bâtiment et rembourse une partie des ressources.
@@ -185,7 +185,7 @@ async def destroy_building(
 async def toggle_building_active(
     instance_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Active/désactive un bâtiment.
@@ -208,8 +208,8 @@ async def toggle_building_active(
 async def get_building_production(
     instance_id: int,
     assigned_npcs: int = 0,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_active_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Calcule le taux de production actuel d'un bâtiment.
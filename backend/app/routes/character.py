@@ -5,7 +5,7 @@ Routes API pour la gestion des personnages.
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 
-from backend.app.database import get_db
+from backend.app.database import get_db, get_read_db
 from sqlalchemy.ext.asyncio import AsyncSession
 from backend.app.models.user import User
 from backend.app.schemas.character import (
@@ -17,7 +17,7 @@ from backend.app.schemas.character import (
     CharacterStats
 )
 from backend.app.services.character_service import CharacterService
-from backend.app.utils.dependencies import get_current_active_user
+from backend.app.utils.dependencies import get_current_active_user, get_current_active_user_read
 
 
 router = APIRouter(prefix="/characters", tags=["characters"])
@@ -27,7 +27,7 @@ router = APIRouter(prefix="/characters", tags=["characters"])
 async def create_player_character(
     character_data: CharacterCreate,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Crée le personnage joueur (obligatoire après inscription).
@@ -49,7 +49,7 @@ async def create_player_character(
 async def create_ai_character(
     character_data: CharacterCreateAI,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Crée un PNJ IA pour le village.
@@ -69,8 +69,8 @@ async def create_ai_character(
 
 @router.get("/me", response_model=CharacterResponse)
 async def get_my_player_character(
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_active_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Récupère le personnage joueur de l'utilisateur connecté.
@@ -89,8 +89,8 @@ async def get_my_player_character(
 
 @router.get("/", response_model=List[CharacterResponse])
 async def get_all_village_characters(
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_active_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Récupère tous les personnages du village (joueur + PNJ IA).
@@ -103,8 +103,8 @@ async def get_all_village_characters(
 
 @router.get("/ai", response_model=List[CharacterResponse])
 async def get_ai_characters_only(
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_active_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Récupère uniquement les PNJ IA du village.
@@ -117,8 +117,8 @@ async def get_ai_characters_only(
 @router.get("/{character_id}", response_model=CharacterResponse)
 async def get_character_details(
     character_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_active_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Récupère les détails d'un personnage spécifique.
@@ -139,8 +139,8 @@ async def get_character_details(
 @router.get("/{character_id}/stats", response_model=CharacterStats)
 async def get_character_full_stats(
     character_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_active_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Récupère les statistiques complètes d'un personnage.
@@ -165,7 +165,7 @@ async def update_character_info(
     character_id: int,
     character_data: CharacterUpdate,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Met à jour les informations d'un personnage (nom, bio, apparence).
@@ -181,7 +181,7 @@ async def allocate_character_stats(
     character_id: int,
     stats_data: CharacterAllocateStats,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Alloue les points de stats libres du personnage joueur.
@@ -200,7 +200,7 @@ async def heal_character(
     character_id: int,
     heal_amount: int,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Soigne un personnage (debug/admin).
@@ -226,7 +226,7 @@ async def damage_character(
     character_id: int,
     damage_amount: int,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Inflige des dégâts à un personnage (debug/admin).
@@ -252,7 +252,7 @@ async def gain_character_xp(
     character_id: int,
     xp_amount: int,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Donne de l'XP à un personnage (debug/admin).
@@ -278,7 +278,7 @@ async def gain_character_xp(
 async def delete_ai_character(
     character_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Supprime un PNJ IA.
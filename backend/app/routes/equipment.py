@@ -5,7 +5,7 @@ Routes API pour la gestion des équipements.
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 
-from backend.app.database import get_db
+from backend.app.database import get_db, get_read_db
 from sqlalchemy.ext.asyncio import AsyncSession
 from backend.app.models.user import User
 from backend.app.schemas.equipment import (
@@ -14,7 +14,7 @@ from backend.app.schemas.equipment import (
     EquipmentGenerate
 )
 from backend.app.services.equipment_service import EquipmentService
-from backend.app.utils.dependencies import get_current_active_user
+from backend.app.utils.dependencies import get_current_active_user, get_current_active_user_read
 from backend.app.utils.constants import EquipmentSlot, EquipmentRarity
 
 
@@ -26,7 +26,7 @@ async def create_equipment(
     character_id: int,
     equipment_data: EquipmentCreate,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Crée un équipement manuellement (admin/debug).
@@ -49,7 +49,7 @@ async def generate_equipment(
     rarity: EquipmentRarity = Query(..., description="Rareté de l'équipement"),
     level: int = Query(1, ge=1, le=100, description="Niveau recommandé"),
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Génère un équipement aléatoire procédural.
@@ -83,8 +83,8 @@ async def generate_equipment(
 @router.get("/character/{character_id}", response_model=List[EquipmentResponse])
 async def get_character_equipment(
     character_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_active_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Récupère tous les équipements d'un personnage.
@@ -100,8 +100,8 @@ async def get_character_equipment(
 
 @router.get("/village", response_model=List[EquipmentResponse])
 async def get_village_equipment(
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_active_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Récupère tous les équipements du village (tous personnages).
@@ -116,11 +116,34 @@ async def get_village_equipment(
     return equipment_list
 
 
+@router.get("/village/total-stats", response_model=List[dict])
+async def get_village_total_stats(
+    current_user: User = Depends(get_current_active_user_read),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Calcule les stats totales (base + équipement) de tous les personnages du village.
+    
+    Utile pour:
+    - Planification des missions
+    - Composition des escouades
+    
+    Même format que GET /character/{character_id}/total-stats, pour chaque personnage.
+    """
+    service = EquipmentService(db)
+    stats_by_character = await service.calculate_village_total_stats(current_user.id)
+    
+    return [
+        {"character_id": character_id, "total_stats": total_stats}
+        for character_id, total_stats in stats_by_character.items()
+    ]
+
+
 @router.get("/{equipment_id}", response_model=EquipmentResponse)
 async def get_equipment_details(
     equipment_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_active_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Récupère les détails d'un équipement spécifique.
@@ -144,7 +167,7 @@ async def equip_item(
     equipment_id: int,
     character_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Équipe un objet sur un personnage.
@@ -174,7 +197,7 @@ async def unequip_item(
     character_id: int,
     slot: EquipmentSlot,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Déséquipe un objet d'un slot spécifique.
@@ -200,7 +223,7 @@ async def transfer_equipment(
     from_character_id: int,
     to_character_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Transfère un équipement d'un personnage à un autre (même village).
@@ -226,7 +249,7 @@ async def transfer_equipment(
 async def delete_equipment(
     equipment_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Supprime un équipement (destruction/vente).
@@ -244,8 +267,8 @@ async def delete_equipment(
 @router.get("/character/{character_id}/total-stats", response_model=dict)
 async def get_character_total_stats(
     character_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_active_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Calcule les stats totales d'un personnage (base + équipement).
@@ -5,7 +5,7 @@ Routes API pour la gestion des missions.
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 
-from backend.app.database import get_db
+from backend.app.database import get_db, get_read_db
 from sqlalchemy.ext.asyncio import AsyncSession
 from backend.app.models.user import User
 from backend.app.schemas.mission import (
@@ -14,7 +14,7 @@ from backend.app.schemas.mission import (
     MissionComplete
 )
 from backend.app.services.mission_service import MissionService
-from backend.app.utils.dependencies import get_current_active_user
+from backend.app.utils.dependencies import get_current_active_user, get_current_active_user_read
 from backend.app.utils.constants import MissionType, MissionStatus
 
 
@@ -25,7 +25,7 @@ router = APIRouter(prefix="/missions", tags=["missions"])
 async def create_mission(
     mission_data: MissionCreate,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Crée une nouvelle mission (état: PREPARING).
@@ -55,7 +55,7 @@ async def create_mission(
 async def start_mission(
     mission_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Lance une mission (PREPARING → IN_PROGRESS).
@@ -78,7 +78,7 @@ async def start_mission(
 async def complete_mission(
     mission_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Termine une mission manuellement et calcule les résultats.
@@ -108,7 +108,7 @@ async def complete_mission(
 async def recall_mission(
     mission_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Rappelle une mission en cours (annulation).
@@ -130,8 +130,8 @@ async def recall_mission(
 @router.get("/", response_model=List[MissionResponse])
 async def get_my_missions(
     status_filter: Optional[MissionStatus] = Query(None, description="Filtrer par statut"),
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_active_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Récupère toutes les missions du village.
@@ -148,8 +148,8 @@ async def get_my_missions(
 @router.get("/{mission_id}", response_model=MissionResponse)
 async def get_mission_details(
     mission_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_active_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Récupère les détails d'une mission spécifique.
@@ -173,8 +173,8 @@ async def get_mission_details(
 @router.get("/{mission_id}/success-rate", response_model=dict)
 async def calculate_mission_success_rate(
     mission_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_active_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Calcule le taux de réussite estimé d'une mission.
@@ -216,7 +216,7 @@ async def calculate_mission_success_rate(
 async def delete_mission(
     mission_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Supprime une mission.
@@ -237,8 +237,8 @@ async def delete_mission(
 @router.get("/generate/{mission_type}", response_model=dict)
 async def generate_random_mission(
     mission_type: MissionType,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_active_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Génère une proposition de mission aléatoire.
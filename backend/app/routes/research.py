@@ -5,13 +5,10 @@ Routes API pour les recherches (arbre technologique).
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from uuid import UUID
 
-from backend.app.database import get_db
-from backend.app.utils.dependencies import get_current_active_user
-from backend.app.models.user import User
+from backend.app.database import get_db, get_read_db
+from backend.app.utils.dependencies import get_current_village_id, get_current_village_id_read
 from backend.app.services.research_service import ResearchService
-from backend.app.services.village_service import VillageService
 from backend.app.schemas.research import (
     ResearchRead,
     ResearchTree,
@@ -26,71 +23,44 @@ router = APIRouter(prefix="/researches", tags=["researches"])
 
 @router.post("/initialize", response_model=List[ResearchRead])
 async def initialize_village_researches(
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    village_id: int = Depends(get_current_village_id),
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
-    Initialise toutes les recherches pour le village de l'utilisateur.
-    À appeler après la création du village.
+    Initialise les recherches manquantes du village de l'utilisateur.
+    Déjà fait à la création du village; utile après un ajout à l'arbre.
     """
-    village_service = VillageService(db)
-    village = await village_service.get_user_village(current_user.id)
-    
-    if not village:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Aucun village trouvé pour cet utilisateur"
-        )
-    
     research_service = ResearchService(db)
-    researches = await research_service.initialize_village_researches(village.id)
+    await research_service.initialize_village_researches(village_id)
     
-    return researches
+    return await research_service.get_village_researches(village_id)
 
 
 @router.get("/tree", response_model=ResearchTree)
 async def get_tech_tree(
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    village_id: int = Depends(get_current_village_id_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Récupère l'arbre technologique complet du village.
     Organisé par catégories avec statuts et progression.
     """
-    village_service = VillageService(db)
-    village = await village_service.get_user_village(current_user.id)
-    
-    if not village:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Aucun village trouvé"
-        )
-    
     research_service = ResearchService(db)
-    tree = await research_service.get_tech_tree(village.id)
+    tree = await research_service.get_tech_tree(village_id)
     
     return tree
 
 
 @router.get("/available", response_model=List[ResearchDetails])
 async def get_available_researches(
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    village_id: int = Depends(get_current_village_id_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Récupère toutes les recherches AVAILABLE (débloquées mais pas commencées).
     """
-    village_service = VillageService(db)
-    village = await village_service.get_user_village(current_user.id)
-    
-    if not village:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Aucun village trouvé"
-        )
-    
     research_service = ResearchService(db)
-    available = await research_service.get_available_researches(village.id)
+    available = await research_service.get_available_researches(village_id)
     
     return available
 
@@ -99,24 +69,15 @@ async def get_available_researches(
 async def list_researches(
     status_filter: Optional[ResearchStatus] = None,
     category: Optional[ResearchCategory] = None,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    village_id: int = Depends(get_current_village_id_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Liste toutes les recherches du village avec filtres optionnels.
     """
-    village_service = VillageService(db)
-    village = await village_service.get_user_village(current_user.id)
-    
-    if not village:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Aucun village trouvé"
-        )
-    
     research_service = ResearchService(db)
     researches = await research_service.get_village_researches(
-        village_id=village.id,
+        village_id=village_id,
         status=status_filter,
         category=category
     )
@@ -126,9 +87,9 @@ async def list_researches(
 
 @router.get("/{research_id}", response_model=ResearchDetails)
 async def get_research_details(
-    research_id: UUID,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    research_id: int,
+    village_id: int = Depends(get_current_village_id_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Récupère les détails complets d'une recherche.
@@ -143,10 +104,7 @@ async def get_research_details(
         )
     
     # Vérifier que la recherche appartient au village de l'utilisateur
-    village_service = VillageService(db)
-    village = await village_service.get_user_village(current_user.id)
-    
-    if not village or research.village_id != village.id:
+    if research.village_id != village_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Cette recherche n'appartient pas à votre village"
@@ -157,6 +115,7 @@ async def get_research_details(
     
     return {
         "id": research.id,
+        "village_id": research.village_id,
         "research_key": research.research_key,
         "category": research.category,
         "status": research.status,
@@ -170,24 +129,15 @@ async def get_research_details(
 @router.post("/{research_key}/start", response_model=ResearchRead)
 async def start_research(
     research_key: str,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    village_id: int = Depends(get_current_village_id),
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Démarre une recherche.
     Vérifie les prérequis et consomme les ressources.
     """
-    village_service = VillageService(db)
-    village = await village_service.get_user_village(current_user.id)
-    
-    if not village:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Aucun village trouvé"
-        )
-    
     research_service = ResearchService(db)
-    research, error = await research_service.start_research(village.id, research_key)
+    research, error = await research_service.start_research(village_id, research_key)
     
     if error:
         raise HTTPException(
@@ -200,10 +150,10 @@ async def start_research(
 
 @router.post("/{research_id}/complete", response_model=ResearchRead)
 async def complete_research(
-    research_id: UUID,
+    research_id: int,
     force: bool = False,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    village_id: int = Depends(get_current_village_id),
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Complète une recherche.
@@ -220,10 +170,7 @@ async def complete_research(
         )
     
     # Vérifier que la recherche appartient au village de l'utilisateur
-    village_service = VillageService(db)
-    village = await village_service.get_user_village(current_user.id)
-    
-    if not village or research.village_id != village.id:
+    if research.village_id != village_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Cette recherche n'appartient pas à votre village"
@@ -242,9 +189,9 @@ async def complete_research(
 
 @router.post("/{research_id}/cancel", response_model=ResearchRead)
 async def cancel_research(
-    research_id: UUID,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    research_id: int,
+    village_id: int = Depends(get_current_village_id),
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Annule une recherche en cours.
@@ -260,10 +207,7 @@ async def cancel_research(
         )
     
     # Vérifier que la recherche appartient au village de l'utilisateur
-    village_service = VillageService(db)
-    village = await village_service.get_user_village(current_user.id)
-    
-    if not village or research.village_id != village.id:
+    if research.village_id != village_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Cette recherche n'appartient pas à votre village"
@@ -282,22 +226,13 @@ async def cancel_research(
 
 @router.get("/bonuses/active", response_model=ResearchBonuses)
 async def get_active_bonuses(
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    village_id: int = Depends(get_current_village_id_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Récupère tous les bonus actifs des recherches complétées.
     """
-    village_service = VillageService(db)
-    village = await village_service.get_user_village(current_user.id)
-    
-    if not village:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Aucun village trouvé"
-        )
-    
     research_service = ResearchService(db)
-    bonuses = await research_service.get_research_bonuses(village.id)
+    bonuses = await research_service.get_research_bonuses(village_id)
     
     return bonuses
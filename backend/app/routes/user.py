@@ -5,8 +5,8 @@ Routes API pour la gestion des utilisateurs.
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.app.database import get_db
-from backend.app.utils.dependencies import get_current_active_user, get_current_user
+from backend.app.database import get_db, get_read_db
+from backend.app.utils.dependencies import get_current_active_user, get_current_active_user_read, get_current_user_read
 from backend.app.models.user import User
 from backend.app.schemas.user import UserResponse, UserUpdate
 from backend.app.services.user_service import UserService
@@ -17,7 +17,7 @@ router = APIRouter(prefix="/users", tags=["Users"])
 
 @router.get("/me", response_model=UserResponse, status_code=status.HTTP_200_OK)
 async def get_current_user_profile(
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_active_user_read)
 ):
     """
     Récupère le profil de l'utilisateur connecté
@@ -32,7 +32,7 @@ async def get_current_user_profile(
 async def update_current_user_profile(
     user_update: UserUpdate,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Met à jour le profil de l'utilisateur connecté
@@ -73,7 +73,7 @@ async def update_current_user_profile(
 @router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_current_user_account(
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Supprime le compte de l'utilisateur connecté
@@ -99,8 +99,8 @@ async def delete_current_user_account(
 @router.get("/{user_id}/profile", response_model=UserResponse, status_code=status.HTTP_200_OK)
 async def get_user_public_profile(
     user_id: int,
-    db: AsyncSession = Depends(get_db),
-    _: User = Depends(get_current_user)  # Authentification requise
+    db: AsyncSession = Depends(get_read_db),
+    _: User = Depends(get_current_user_read)  # Authentification requise
 ):
     """
     Récupère le profil public d'un utilisateur
@@ -128,8 +128,8 @@ async def get_user_public_profile(
 
 @router.get("/me/stats", response_model=dict, status_code=status.HTTP_200_OK)
 async def get_current_user_stats(
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_active_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Récupère les statistiques détaillées de l'utilisateur connecté
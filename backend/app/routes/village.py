@@ -5,8 +5,8 @@ Routes API pour la gestion des villages.
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.app.database import get_db
-from backend.app.utils.dependencies import get_current_active_user
+from backend.app.database import get_db, get_read_db
+from backend.app.utils.dependencies import get_current_active_user, get_current_village_id, get_current_active_user_read
 from backend.app.models.user import User
 from backend.app.schemas.village import (
     VillageCreate, 
@@ -25,7 +25,7 @@ router = APIRouter(prefix="/villages", tags=["Villages"])
 async def create_village(
     village_data: VillageCreate,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Crée un nouveau village pour l'utilisateur connecté
@@ -59,8 +59,8 @@ async def create_village(
 
 @router.get("/me", response_model=VillageResponse, status_code=status.HTTP_200_OK)
 async def get_my_village(
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_active_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Récupère le village de l'utilisateur connecté
@@ -85,8 +85,8 @@ async def get_my_village(
 
 @router.get("/me/stats", response_model=VillageStats, status_code=status.HTTP_200_OK)
 async def get_my_village_stats(
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    village_id: int = Depends(get_current_village_id),
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Récupère les statistiques du village de l'utilisateur
@@ -98,15 +98,7 @@ async def get_my_village_stats(
         HTTPException 404: Si village non trouvé
     """
     service = VillageService(db)
-    village = await service.get_village_by_user_id(current_user.id)
-    
-    if not village:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Village non trouvé"
-        )
-    
-    stats = await service.get_village_stats(village.id)
+    stats = await service.get_village_stats(village_id)
     
     if not stats:
         raise HTTPException(
@@ -120,8 +112,8 @@ async def get_my_village_stats(
 @router.put("/me", response_model=VillageResponse, status_code=status.HTTP_200_OK)
 async def update_my_village(
     village_update: VillageUpdate,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    village_id: int = Depends(get_current_village_id),
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Met à jour le nom du village de l'utilisateur
@@ -136,16 +128,8 @@ async def update_my_village(
         HTTPException 404: Si village non trouvé
     """
     service = VillageService(db)
-    village = await service.get_village_by_user_id(current_user.id)
-    
-    if not village:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Village non trouvé"
-        )
-    
     updated_village = await service.update_village_name(
-        village_id=village.id,
+        village_id=village_id,
         new_name=village_update.name
     )
     
@@ -154,8 +138,8 @@ async def update_my_village(
 
 @router.get("/me/resources", response_model=ResourceInventory, status_code=status.HTTP_200_OK)
 async def get_my_village_resources(
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    village_id: int = Depends(get_current_village_id),
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Récupère les ressources du village de l'utilisateur
@@ -167,15 +151,7 @@ async def get_my_village_resources(
         HTTPException 404: Si village ou ressources non trouvés
     """
     service = VillageService(db)
-    village = await service.get_village_by_user_id(current_user.id)
-    
-    if not village:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Village non trouvé"
-        )
-    
-    resources = await service.get_village_resources(village.id)
+    resources = await service.get_village_resources(village_id)
     
     if not resources:
         raise HTTPException(
@@ -189,14 +165,14 @@ async def get_my_village_resources(
 @router.post("/me/resources/add", response_model=ResourceInventory, status_code=status.HTTP_200_OK)
 async def add_resources_to_my_village(
     resource_add: ResourceAdd,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    village_id: int = Depends(get_current_village_id),
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Ajoute des ressources au village (admin/debug)
     
     Args:
-        resource_add: Ressources à ajouter {resource_name: quantity}
+        resource_add: Ressource à ajouter (type et quantité)
         
     Returns:
         ResourceInventory: Ressources mises à jour
@@ -205,17 +181,9 @@ async def add_resources_to_my_village(
         HTTPException 404: Si village non trouvé
     """
     service = VillageService(db)
-    village = await service.get_village_by_user_id(current_user.id)
-    
-    if not village:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Village non trouvé"
-        )
-    
     resources = await service.update_resources(
-        village_id=village.id,
-        resource_deltas=resource_add.resources
+        village_id=village_id,
+        resource_deltas={resource_add.resource_type.value: resource_add.quantity}
     )
     
     return resources
@@ -224,14 +192,14 @@ async def add_resources_to_my_village(
 @router.post("/me/resources/remove", response_model=ResourceInventory, status_code=status.HTTP_200_OK)
 async def remove_resources_from_my_village(
     resource_remove: ResourceRemove,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    village_id: int = Depends(get_current_village_id),
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Retire des ressources du village
     
     Args:
-        resource_remove: Ressources à retirer {resource_name: quantity}
+        resource_remove: Ressource à retirer (type et quantité)
         
     Returns:
         ResourceInventory: Ressources mises à jour
@@ -241,20 +209,12 @@ async def remove_resources_from_my_village(
         HTTPException 404: Si village non trouvé
     """
     service = VillageService(db)
-    village = await service.get_village_by_user_id(current_user.id)
-    
-    if not village:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Village non trouvé"
-        )
-    
-    # Inverser les quantités pour retirer
-    resource_deltas = {k: -v for k, v in resource_remove.resources.items()}
+    # Quantité négative pour retirer
+    resource_deltas = {resource_remove.resource_type.value: -resource_remove.quantity}
     
     try:
         resources = await service.update_resources(
-            village_id=village.id,
+            village_id=village_id,
             resource_deltas=resource_deltas
         )
         return resources
@@ -267,8 +227,8 @@ async def remove_resources_from_my_village(
 
 @router.get("/me/storage", response_model=dict, status_code=status.HTTP_200_OK)
 async def check_my_village_storage(
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    village_id: int = Depends(get_current_village_id),
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     Vérifie la capacité de stockage du village
@@ -280,15 +240,7 @@ async def check_my_village_storage(
         HTTPException 404: Si village non trouvé
     """
     service = VillageService(db)
-    village = await service.get_village_by_user_id(current_user.id)
-    
-    if not village:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Village non trouvé"
-        )
-    
-    storage_info = await service.check_storage_capacity(village.id)
+    storage_info = await service.check_storage_capacity(village_id)
     
     return storage_info
 
@@ -296,8 +248,8 @@ async def check_my_village_storage(
 @router.get("/{village_id}", response_model=VillageResponse, status_code=status.HTTP_200_OK)
 async def get_village_by_id(
     village_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_active_user_read),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Récupère un village par son ID (public, pour voir les autres villages)
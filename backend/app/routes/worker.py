@@ -5,7 +5,8 @@ Routes API pour surveiller les workers background.
 from fastapi import APIRouter, Depends
 from typing import List, Dict, Any
 
-from backend.app.utils.dependencies import get_current_active_user
+from backend.app.config import settings
+from backend.app.utils.dependencies import get_current_active_user_read
 from backend.app.models.user import User
 from backend.app.workers.worker_manager import worker_manager
 
@@ -15,7 +16,7 @@ router = APIRouter(prefix="/workers", tags=["workers"])
 
 @router.get("/status")
 async def get_workers_status(
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_active_user_read)
 ):
     """
     Récupère le statut de tous les workers background.
@@ -34,6 +35,7 @@ async def get_workers_status(
     
     return {
         "is_running": worker_manager.is_running,
+        "in_process": settings.WORKERS_IN_PROCESS,
         "jobs_count": len(jobs),
         "jobs": jobs_info
     }
@@ -42,7 +44,7 @@ async def get_workers_status(
 @router.get("/job/{job_id}")
 async def get_job_status(
     job_id: str,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_active_user_read)
 ):
     """
     Récupère le statut d'un job spécifique.
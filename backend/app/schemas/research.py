@@ -5,7 +5,6 @@ Schémas Pydantic pour les recherches (arbre technologique).
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-from uuid import UUID
 
 from backend.app.utils.constants import ResearchCategory, ResearchStatus
 
@@ -22,13 +21,13 @@ class ResearchBase(BaseModel):
 
 class ResearchCreate(ResearchBase):
     """Schéma pour créer une recherche (usage interne)."""
-    village_id: UUID
+    village_id: int
 
 
 class ResearchRead(ResearchBase):
     """Schéma de lecture d'une recherche."""
-    id: UUID
-    village_id: UUID
+    id: int
+    village_id: int
     status: ResearchStatus
     progress: int = Field(..., ge=0, le=100, description="Progression en %")
     started_at: Optional[datetime] = None
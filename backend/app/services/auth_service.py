@@ -6,28 +6,22 @@ from datetime import datetime
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 
 from backend.app.models.user import User
 from backend.app.schemas.user import UserCreate, UserLogin, Token
 from backend.app.schemas.village import VillageCreate
-from backend.app.utils.auth import get_password_hash, verify_password, create_access_token
+from backend.app.utils.auth import get_password_hash_async, verify_password_async, create_access_token
 
 
 class AuthService:
     """Service pour gérer l'authentification des utilisateurs"""
     
     @staticmethod
-    async def register_user(db: AsyncSession, user_data: UserCreate) -> User:
+    async def _check_available(db: AsyncSession, user_data: UserCreate) -> None:
         """
-        Inscrit un nouvel utilisateur.
-        
-        Args:
-            db: Session de base de données
-            user_data: Données d'inscription
-        
-        Returns:
-            User: Utilisateur créé
+        Vérifie que le username et l'email (si fourni) ne sont pas déjà pris.
         
         Raises:
             HTTPException: Si le username ou email existe déjà
@@ -52,9 +46,29 @@ class AuthService:
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Cet email est déjà utilisé"
                 )
+    
+    @staticmethod
+    async def register_user(db: AsyncSession, user_data: UserCreate) -> User:
+        """
+        Inscrit un nouvel utilisateur.
+        
+        Args:
+            db: Session de base de données
+            user_data: Données d'inscription
+        
+        Returns:
+            User: Utilisateur créé
+        
+        Raises:
+            HTTPException: Si le username ou email existe déjà
+        """
+        await AuthService._check_available(db, user_data)
+        
+        # Terminer la transaction de lecture: la connexion retourne au pool pendant bcrypt
+        await db.commit()
         
         # Hasher le mot de passe
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await get_password_hash_async(user_data.password)
         
         # Créer l'utilisateur
         new_user = User(
@@ -65,8 +79,13 @@ class AuthService:
         )
         
         db.add(new_user)
-        await db.commit()
-        await db.refresh(new_user)
+        try:
+            await db.flush()
+        except IntegrityError:
+            # Inscription concurrente du même username/email pendant le hash
+            await db.rollback()
+            await AuthService._check_available(db, user_data)
+            raise
         
         # Créer automatiquement un village pour le nouvel utilisateur
         from backend.app.services.village_service import VillageService
@@ -100,13 +119,16 @@ class AuthService:
         if not user:
             return None
         
+        # Terminer la transaction de lecture: la connexion retourne au pool pendant bcrypt
+        await db.commit()
+        
         # Vérifier le mot de passe
-        if not verify_password(login_data.password, user.password_hash):
+        if not await verify_password_async(login_data.password, user.password_hash):
             return None
         
         # Mettre à jour la date de dernière connexion
         user.last_login = datetime.utcnow()
-        await db.commit()
+        await db.flush()
         
         return user
     
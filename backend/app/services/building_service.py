@@ -7,11 +7,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from fastapi import HTTPException, status
 import math
+from datetime import datetime
 
 from backend.app.models.building import Building
 from backend.app.models.building_instance import BuildingInstance
-from backend.app.models.village import Village
-from backend.app.models.resource import Resource
 from backend.app.models.character import Character
 from backend.app.schemas.building import (
     BuildingResponse,
@@ -20,6 +19,10 @@ from backend.app.schemas.building import (
     BuildingInstanceWithDetails,
     BuildingBuild
 )
+from backend.app.services.village_service import VillageService
+from backend.app.services.production_service import ProductionService
+from backend.app.services.resource_service import ResourceService
+from backend.app.utils.constants import calculate_building_production
 
 
 class BuildingService:
@@ -50,11 +53,8 @@ class BuildingService:
     async def get_village_buildings(self, user_id: int) -> List[BuildingInstance]:
         """Récupère toutes les instances de bâtiments d'un village"""
         # Récupérer le village
-        village_result = await self.db.execute(
-            select(Village).where(Village.user_id == user_id)
-        )
-        village = village_result.scalar_one_or_none()
-        if not village:
+        village_id = await VillageService(self.db).get_village_id_by_user_id(user_id)
+        if village_id is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Village non trouvé"
@@ -63,7 +63,7 @@ class BuildingService:
         # Récupérer les instances avec les détails du bâtiment
         result = await self.db.execute(
             select(BuildingInstance)
-            .where(BuildingInstance.village_id == village.id)
+            .where(BuildingInstance.village_id == village_id)
             .order_by(BuildingInstance.built_at)
         )
         return list(result.scalars().all())
@@ -78,14 +78,11 @@ class BuildingService:
         
         if user_id:
             # Vérifier que l'instance appartient au village de l'utilisateur
-            village_result = await self.db.execute(
-                select(Village).where(Village.user_id == user_id)
-            )
-            village = village_result.scalar_one_or_none()
-            if not village:
+            village_id = await VillageService(self.db).get_village_id_by_user_id(user_id)
+            if village_id is None:
                 return None
             
-            query = query.where(BuildingInstance.village_id == village.id)
+            query = query.where(BuildingInstance.village_id == village_id)
         
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
@@ -101,10 +98,7 @@ class BuildingService:
         Placement automatique si grid_x/grid_y = -1 (spirale).
         """
         # Récupérer le village
-        village_result = await self.db.execute(
-            select(Village).where(Village.user_id == user_id)
-        )
-        village = village_result.scalar_one_or_none()
+        village = await VillageService(self.db).get_village_by_user_id(user_id)
         if not village:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -171,8 +165,7 @@ class BuildingService:
         )
 
         self.db.add(new_instance)
-        await self.db.commit()
-        await self.db.refresh(new_instance)
+        await self.db.flush()
 
         return new_instance
 
@@ -219,8 +212,7 @@ class BuildingService:
         # Améliorer
         instance.level += 1
 
-        await self.db.commit()
-        await self.db.refresh(instance)
+        await self.db.flush()
 
         return instance
 
@@ -250,6 +242,9 @@ class BuildingService:
                 detail="Type de bâtiment non trouvé"
             )
 
+        # Comptabiliser la production jusqu'ici avant de détruire le bâtiment
+        await ProductionService(self.db).produce(village_id=instance.village_id)
+
         # Calculer remboursement (coût de base + améliorations × refund_percent)
         total_cost = {}
         for resource, base_cost in building.build_cost.items():
@@ -265,7 +260,7 @@ class BuildingService:
 
         # Détruire
         await self.db.delete(instance)
-        await self.db.commit()
+        await self.db.flush()
 
         return True
 
@@ -306,7 +301,9 @@ class BuildingService:
 
         # Calculer production
         base_production = building.production.get("amount_per_hour", 0)
-        final_production = int(base_production * total_multiplier)
+        final_production = calculate_building_production(
+            base_production, instance.level, assigned_npcs_count
+        )
 
         # Calculer capacité de stockage
         base_storage = building.production.get("storage_capacity", 0)
@@ -335,10 +332,15 @@ class BuildingService:
                 detail="Instance non trouvée"
             )
 
+        # Comptabiliser la production jusqu'ici avant de changer l'état
+        await ProductionService(self.db).produce(village_id=instance.village_id)
+
         instance.is_active = not instance.is_active
+        if instance.is_active:
+            # La période d'inactivité ne produit rien
+            instance.last_production_at = datetime.utcnow()
         
-        await self.db.commit()
-        await self.db.refresh(instance)
+        await self.db.flush()
 
         return instance
 
@@ -381,49 +383,12 @@ class BuildingService:
         village_id: int,
         cost: Dict[str, int]
     ):
-        """Vérifie que le village a assez de ressources et les consomme"""
-        # Récupérer toutes les ressources du village
-        result = await self.db.execute(
-            select(Resource).where(Resource.village_id == village_id)
-        )
-        resources = {r.resource_type: r for r in result.scalars().all()}
-
-        # Vérifier disponibilité
-        for resource_type, amount in cost.items():
-            if resource_type not in resources or resources[resource_type].quantity < amount:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Ressources insuffisantes: {resource_type} (besoin: {amount})"
-                )
-
-        # Consommer
-        for resource_type, amount in cost.items():
-            resources[resource_type].quantity -= amount
-
-        await self.db.commit()
+        """Vérifie que le village a assez de ressources et les consomme (UPDATE conditionnel)"""
+        await ResourceService(self.db).spend(village_id, cost)
 
     async def _add_resources(self, village_id: int, resources: Dict[str, int]):
         """Ajoute des ressources au village (pour remboursement)"""
-        # Récupérer ressources existantes
-        result = await self.db.execute(
-            select(Resource).where(Resource.village_id == village_id)
-        )
-        existing_resources = {r.resource_type: r for r in result.scalars().all()}
-
-        # Ajouter
-        for resource_type, amount in resources.items():
-            if resource_type in existing_resources:
-                existing_resources[resource_type].quantity += amount
-            else:
-                # Créer la ressource si elle n'existe pas
-                new_resource = Resource(
-                    village_id=village_id,
-                    resource_type=resource_type,
-                    quantity=amount
-                )
-                self.db.add(new_resource)
-
-        await self.db.commit()
+        await ResourceService(self.db).add(village_id, resources)
 
     async def _is_position_occupied(
         self,
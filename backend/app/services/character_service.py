@@ -2,6 +2,7 @@
 Service pour la gestion des personnages (PNJ joueur et IA).
 """
 
+from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, delete
@@ -11,7 +12,6 @@ import random
 
 from backend.app.models.character import Character
 from backend.app.models.user import User
-from backend.app.models.village import Village
 from backend.app.schemas.character import (
     CharacterCreate,
     CharacterCreateAI,
@@ -20,6 +20,7 @@ from backend.app.schemas.character import (
     CharacterAllocateStats,
     CharacterStats
 )
+from backend.app.services.village_service import VillageService
 from backend.app.utils.constants import (
     CharacterClass,
     Personality,
@@ -28,6 +29,8 @@ from backend.app.utils.constants import (
     PERSONALITY_DATA,
     FREE_STAT_POINTS_ON_CREATION,
     calculate_max_hp,
+    calculate_hp_regen_per_hour,
+    calculate_level_for_xp,
     calculate_xp_for_level
 )
 
@@ -71,10 +74,7 @@ class CharacterService:
             )
 
         # Récupérer le village de l'utilisateur
-        village_result = await self.db.execute(
-            select(Village).where(Village.user_id == user_id)
-        )
-        village = village_result.scalar_one_or_none()
+        village = await VillageService(self.db).get_village_by_user_id(user_id)
         if not village:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -145,8 +145,7 @@ class CharacterService:
         )
 
         self.db.add(new_character)
-        await self.db.commit()
-        await self.db.refresh(new_character)
+        await self.db.flush()
 
         return new_character
 
@@ -169,10 +168,7 @@ class CharacterService:
             )
 
         # Récupérer le village
-        village_result = await self.db.execute(
-            select(Village).where(Village.user_id == user_id)
-        )
-        village = village_result.scalar_one_or_none()
+        village = await VillageService(self.db).get_village_by_user_id(user_id)
         if not village:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -245,8 +241,7 @@ class CharacterService:
         )
 
         self.db.add(new_character)
-        await self.db.commit()
-        await self.db.refresh(new_character)
+        await self.db.flush()
 
         return new_character
 
@@ -262,7 +257,7 @@ class CharacterService:
             query = query.where(Character.user_id == user_id)
         
         result = await self.db.execute(query)
-        return result.scalar_one_or_none()
+        return self._with_regenerated_hp(result.scalar_one_or_none())
 
     async def get_player_character(self, user_id: int) -> Optional[Character]:
         """Récupère le PNJ joueur de l'utilisateur"""
@@ -272,16 +267,13 @@ class CharacterService:
                 Character.is_player_character == True
             )
         )
-        return result.scalar_one_or_none()
+        return self._with_regenerated_hp(result.scalar_one_or_none())
 
     async def get_all_village_characters(self, user_id: int) -> List[Character]:
         """Récupère tous les personnages du village (joueur + IA)"""
         # Récupérer le village
-        village_result = await self.db.execute(
-            select(Village).where(Village.user_id == user_id)
-        )
-        village = village_result.scalar_one_or_none()
-        if not village:
+        village_id = await VillageService(self.db).get_village_id_by_user_id(user_id)
+        if village_id is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Village non trouvé"
@@ -289,18 +281,15 @@ class CharacterService:
 
         result = await self.db.execute(
             select(Character)
-            .where(Character.village_id == village.id)
+            .where(Character.village_id == village_id)
             .order_by(Character.is_player_character.desc(), Character.name)
         )
-        return list(result.scalars().all())
+        return self._with_regenerated_hp_all(result.scalars().all())
 
     async def get_ai_characters(self, user_id: int) -> List[Character]:
         """Récupère uniquement les PNJ IA du village"""
-        village_result = await self.db.execute(
-            select(Village).where(Village.user_id == user_id)
-        )
-        village = village_result.scalar_one_or_none()
-        if not village:
+        village_id = await VillageService(self.db).get_village_id_by_user_id(user_id)
+        if village_id is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Village non trouvé"
@@ -309,12 +298,12 @@ class CharacterService:
         result = await self.db.execute(
             select(Character)
             .where(
-                Character.village_id == village.id,
+                Character.village_id == village_id,
                 Character.is_player_character == False
             )
             .order_by(Character.name)
         )
-        return list(result.scalars().all())
+        return self._with_regenerated_hp_all(result.scalars().all())
 
     async def update_character(
         self,
@@ -338,8 +327,7 @@ class CharacterService:
         if character_data.appearance is not None:
             character.appearance = character_data.appearance
 
-        await self.db.commit()
-        await self.db.refresh(character)
+        await self.db.flush()
         return character
 
     async def allocate_stats(
@@ -396,8 +384,7 @@ class CharacterService:
         character.max_hp = new_max_hp
         character.current_hp += hp_increase  # Augmenter aussi les HP actuels
 
-        await self.db.commit()
-        await self.db.refresh(character)
+        await self.db.flush()
         return character
 
     async def calculate_power_score(self, character_id: int) -> int:
@@ -515,7 +502,7 @@ class CharacterService:
             )
 
         await self.db.delete(character)
-        await self.db.commit()
+        await self.db.flush()
         return True
 
     async def gain_xp(self, character_id: int, xp_amount: int) -> Character:
@@ -530,24 +517,96 @@ class CharacterService:
                 detail="Personnage non trouvé"
             )
 
+        self.apply_xp(character, xp_amount)
+
+        await self.db.flush()
+        return character
+
+    def apply_xp(self, character: Character, xp_amount: int) -> Character:
+        """
+        Applique un gain d'XP à un personnage déjà chargé (sans requête ni commit).
+        À chaque niveau: +1 point libre (PNJ joueur), recalcul HP max.
+        Le niveau atteint est calculé directement (calculate_level_for_xp),
+        sans itérer niveau par niveau.
+        """
         character.xp += xp_amount
         
         # Vérifier montée de niveau
-        while character.xp >= calculate_xp_for_level(character.level + 1):
-            character.level += 1
-            if character.is_player_character:
-                character.free_stat_points += 1
-            
-            # Recalculer HP max et restaurer HP
-            new_max_hp = calculate_max_hp(character.level, character.endurance)
-            hp_increase = new_max_hp - character.max_hp
-            character.max_hp = new_max_hp
-            character.current_hp += hp_increase
-
-        await self.db.commit()
-        await self.db.refresh(character)
+        new_level = calculate_level_for_xp(character.xp)
+        if new_level <= character.level:
+            return character
+        
+        levels_gained = new_level - character.level
+        character.level = new_level
+        if character.is_player_character:
+            character.free_stat_points += levels_gained
+        
+        # Recalculer HP max et restaurer HP
+        new_max_hp = calculate_max_hp(character.level, character.endurance)
+        hp_increase = new_max_hp - character.max_hp
+        character.max_hp = new_max_hp
+        character.current_hp += hp_increase
+
         return character
 
+    async def grant_xp_bulk(self, characters: List[Character], xp_amount: int) -> List[Character]:
+        """
+        Applique un même gain d'XP à des personnages déjà chargés, en un seul flush.
+        Ne commit pas: l'appelant (ex: complétion de mission) valide la transaction.
+        """
+        for character in characters:
+            self.apply_xp(character, xp_amount)
+        
+        await self.db.flush()
+        return characters
+
+    def apply_hp_regeneration(self, character: Character, now: Optional[datetime] = None) -> Character:
+        """
+        Matérialise la régénération des PV depuis `hp_updated_at` (sans requête ni commit).
+        
+        Hors mission et vivant, un PNJ régénère en continu (cf. calculate_hp_regen_per_hour)
+        jusqu'à ses PV max. Seuls les PV entiers sont comptés: `hp_updated_at` n'avance que
+        du temps qu'ils ont consommé, le reliquat est conservé. En mission, mort ou au
+        maximum, rien n'est régénéré et `hp_updated_at` passe à `now`.
+        
+        À appeler après chargement (lecture) et avant toute modification des PV ou de
+        `is_on_mission`: les valeurs ne sont persistées que si la session est validée.
+        """
+        now = now or datetime.utcnow()
+        since = character.hp_updated_at or character.created_at or now
+        
+        if (
+            character.is_on_mission
+            or character.current_hp <= 0
+            or character.current_hp >= character.max_hp
+        ):
+            if since < now:
+                character.hp_updated_at = now
+            return character
+        
+        rate = calculate_hp_regen_per_hour(character.max_hp)
+        elapsed_hours = max((now - since).total_seconds(), 0) / 3600
+        amount = min(int(rate * elapsed_hours), character.max_hp - character.current_hp)
+        if amount <= 0:
+            return character
+        
+        character.current_hp += amount
+        if character.current_hp >= character.max_hp:
+            character.hp_updated_at = now
+        else:
+            character.hp_updated_at = since + timedelta(hours=amount / rate)
+        
+        return character
+
+    def _with_regenerated_hp(self, character: Optional[Character]) -> Optional[Character]:
+        if character is not None:
+            self.apply_hp_regeneration(character)
+        return character
+
+    def _with_regenerated_hp_all(self, characters) -> List[Character]:
+        now = datetime.utcnow()
+        return [self.apply_hp_regeneration(character, now) for character in characters]
+
     async def heal_character(self, character_id: int, heal_amount: int) -> Character:
         """Soigne un personnage (ne peut pas dépasser max_hp)"""
         character = await self.get_character_by_id(character_id)
@@ -559,8 +618,7 @@ class CharacterService:
 
         character.current_hp = min(character.current_hp + heal_amount, character.max_hp)
         
-        await self.db.commit()
-        await self.db.refresh(character)
+        await self.db.flush()
         return character
 
     async def damage_character(self, character_id: int, damage_amount: int) -> Character:
@@ -574,8 +632,7 @@ class CharacterService:
 
         character.current_hp = max(0, character.current_hp - damage_amount)
         
-        await self.db.commit()
-        await self.db.refresh(character)
+        await self.db.flush()
         return character
 
     def _generate_random_appearance(self, sex: Sex) -> Dict[str, Any]:
@@ -2,7 +2,7 @@
 Service pour la gestion des équipements.
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from fastapi import HTTPException, status
@@ -10,12 +10,12 @@ import random
 
 from backend.app.models.equipment import Equipment
 from backend.app.models.character import Character
-from backend.app.models.village import Village
 from backend.app.schemas.equipment import (
     EquipmentCreate,
     EquipmentResponse,
     EquipmentGenerate
 )
+from backend.app.services.village_service import VillageService
 from backend.app.utils.constants import (
     EquipmentRarity,
     EquipmentSlot,
@@ -53,8 +53,7 @@ class EquipmentService:
         )
 
         self.db.add(new_equipment)
-        await self.db.commit()
-        await self.db.refresh(new_equipment)
+        await self.db.flush()
 
         return new_equipment
 
@@ -102,8 +101,7 @@ class EquipmentService:
         )
 
         self.db.add(new_equipment)
-        await self.db.commit()
-        await self.db.refresh(new_equipment)
+        await self.db.flush()
 
         return new_equipment
 
@@ -127,13 +125,8 @@ class EquipmentService:
             if not character:
                 return None
 
-            village_result = await self.db.execute(
-                select(Village).where(
-                    Village.id == character.village_id,
-                    Village.user_id == user_id
-                )
-            )
-            if not village_result.scalar_one_or_none():
+            village_id = await VillageService(self.db).get_village_id_by_user_id(user_id)
+            if character.village_id != village_id:
                 return None
 
         return equipment
@@ -158,11 +151,8 @@ class EquipmentService:
     async def get_village_equipment(self, user_id: int) -> List[Equipment]:
         """Récupère tous les équipements du village (tous personnages)"""
         # Récupérer le village
-        village_result = await self.db.execute(
-            select(Village).where(Village.user_id == user_id)
-        )
-        village = village_result.scalar_one_or_none()
-        if not village:
+        village_id = await VillageService(self.db).get_village_id_by_user_id(user_id)
+        if village_id is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Village non trouvé"
@@ -170,7 +160,7 @@ class EquipmentService:
 
         # Récupérer tous les personnages du village
         characters_result = await self.db.execute(
-            select(Character).where(Character.village_id == village.id)
+            select(Character).where(Character.village_id == village_id)
         )
         characters = list(characters_result.scalars().all())
         character_ids = [c.id for c in characters]
@@ -218,8 +208,7 @@ class EquipmentService:
         # Équiper dans le slot
         character.equipment[equipment.slot] = equipment.id
 
-        await self.db.commit()
-        await self.db.refresh(character)
+        await self.db.flush()
 
         return character
 
@@ -243,8 +232,7 @@ class EquipmentService:
         # Déséquiper
         del character.equipment[slot.value]
 
-        await self.db.commit()
-        await self.db.refresh(character)
+        await self.db.flush()
 
         return character
 
@@ -285,8 +273,7 @@ class EquipmentService:
         # Transférer
         equipment.character_id = to_character_id
 
-        await self.db.commit()
-        await self.db.refresh(equipment)
+        await self.db.flush()
 
         return equipment
 
@@ -319,17 +306,79 @@ class EquipmentService:
 
         # Supprimer
         await self.db.delete(equipment)
-        await self.db.commit()
+        await self.db.flush()
 
         return True
 
     async def calculate_total_stats(self, character_id: int, user_id: int) -> Dict[str, int]:
         """
         Calcule les stats totales d'un personnage (base + équipement).
+        Les objets équipés sont lus en une seule requête (IN sur leurs IDs).
         """
         # Récupérer le personnage
         character = await self._get_character_with_verification(character_id, user_id)
 
+        equipped_stats = await self._get_equipped_stats(self._equipped_ids(character))
+        return self._sum_stats(character, equipped_stats)
+
+    async def calculate_village_total_stats(self, user_id: int) -> Dict[int, Dict[str, int]]:
+        """
+        Calcule les stats totales de tous les personnages du village
+        (planification de missions, écrans d'escouade).
+        
+        Deux requêtes quel que soit le nombre de personnages: les personnages
+        du village, puis tous leurs objets équipés (un seul IN), regroupés en mémoire.
+        
+        Returns:
+            {character_id: stats totales}
+        """
+        village_id = await VillageService(self.db).get_village_id_by_user_id(user_id)
+        if village_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Village non trouvé"
+            )
+
+        characters_result = await self.db.execute(
+            select(Character).where(Character.village_id == village_id)
+        )
+        characters = list(characters_result.scalars().all())
+
+        equipped_stats = await self._get_equipped_stats(
+            equipment_id
+            for character in characters
+            for equipment_id in self._equipped_ids(character)
+        )
+        return {
+            character.id: self._sum_stats(character, equipped_stats)
+            for character in characters
+        }
+
+    # ============================================================================
+    # MÉTHODES PRIVÉES - STATS
+    # ============================================================================
+
+    @staticmethod
+    def _equipped_ids(character: Character) -> List[int]:
+        """IDs des objets équipés d'un personnage (slots vides ignorés)"""
+        if not character.equipment:
+            return []
+        return [equipment_id for equipment_id in character.equipment.values() if equipment_id]
+
+    async def _get_equipped_stats(self, equipment_ids: Iterable[int]) -> Dict[int, Dict[str, int]]:
+        """Stats des objets `equipment_ids` en une seule requête: {equipment_id: stats}"""
+        equipment_ids = set(equipment_ids)
+        if not equipment_ids:
+            return {}
+
+        result = await self.db.execute(
+            select(Equipment.id, Equipment.stats).where(Equipment.id.in_(equipment_ids))
+        )
+        return dict(result.all())
+
+    @staticmethod
+    def _sum_stats(character: Character, equipped_stats: Dict[int, Dict[str, int]]) -> Dict[str, int]:
+        """Stats de base du personnage + bonus de ses objets équipés (lus dans `equipped_stats`)"""
         # Stats de base
         total_stats = {
             "strength": character.strength,
@@ -343,17 +392,10 @@ class EquipmentService:
         }
 
         # Ajouter bonus équipement
-        if character.equipment:
-            for slot, equipment_id in character.equipment.items():
-                equipment_result = await self.db.execute(
-                    select(Equipment).where(Equipment.id == equipment_id)
-                )
-                equipment = equipment_result.scalar_one_or_none()
-                
-                if equipment:
-                    for stat, value in equipment.stats.items():
-                        if stat in total_stats:
-                            total_stats[stat] += value
+        for equipment_id in EquipmentService._equipped_ids(character):
+            for stat, value in equipped_stats.get(equipment_id, {}).items():
+                if stat in total_stats:
+                    total_stats[stat] += value
 
         return total_stats
 
@@ -485,13 +527,8 @@ class EquipmentService:
             )
 
         # Vérifier appartenance au village
-        village_result = await self.db.execute(
-            select(Village).where(
-                Village.id == character.village_id,
-                Village.user_id == user_id
-            )
-        )
-        if not village_result.scalar_one_or_none():
+        village_id = await VillageService(self.db).get_village_id_by_user_id(user_id)
+        if character.village_id != village_id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Ce personnage n'appartient pas à votre village"
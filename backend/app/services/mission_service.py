@@ -5,6 +5,7 @@ Service pour la gestion des missions d'exploration.
 from typing import Optional, List, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 from fastapi import HTTPException, status
 from datetime import datetime, timedelta
 import random
@@ -13,13 +14,17 @@ from backend.app.models.mission import Mission
 from backend.app.models.mission_participant import MissionParticipant
 from backend.app.models.village import Village
 from backend.app.models.character import Character
-from backend.app.models.resource import Resource
 from backend.app.schemas.mission import (
     MissionCreate,
     MissionResponse,
     MissionComplete
 )
+from backend.app.services.character_service import CharacterService
+from backend.app.services.resource_service import ResourceService
+from backend.app.services.research_service import ResearchService
+from backend.app.services.village_service import VillageService
 from backend.app.utils.constants import MissionType, MissionStatus
+from backend.app.workers.due_scheduler import due_scheduler, MISSION
 
 
 class MissionService:
@@ -38,10 +43,7 @@ class MissionService:
         La mission n'est pas encore lancée, les PNJ sont assignés.
         """
         # Récupérer le village
-        village_result = await self.db.execute(
-            select(Village).where(Village.user_id == user_id)
-        )
-        village = village_result.scalar_one_or_none()
+        village = await VillageService(self.db).get_village_by_user_id(user_id)
         if not village:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -56,15 +58,22 @@ class MissionService:
             )
 
         # Vérifier que tous les participants existent et appartiennent au village
+        # (une seule requête IN pour toute l'équipe)
+        char_result = await self.db.execute(
+            select(Character).where(
+                Character.id.in_(mission_data.participant_ids),
+                Character.village_id == village.id
+            )
+        )
+        character_service = CharacterService(self.db)
+        characters_by_id = {
+            character.id: character_service.apply_hp_regeneration(character)
+            for character in char_result.scalars().all()
+        }
+
         participants = []
         for character_id in mission_data.participant_ids:
-            char_result = await self.db.execute(
-                select(Character).where(
-                    Character.id == character_id,
-                    Character.village_id == village.id
-                )
-            )
-            character = char_result.scalar_one_or_none()
+            character = characters_by_id.get(character_id)
             
             if not character:
                 raise HTTPException(
@@ -99,8 +108,7 @@ class MissionService:
         )
 
         self.db.add(new_mission)
-        await self.db.commit()
-        await self.db.refresh(new_mission)
+        await self.db.flush()
 
         # Ajouter les participants
         for character in participants:
@@ -110,8 +118,7 @@ class MissionService:
             )
             self.db.add(participant)
 
-        await self.db.commit()
-        await self.db.refresh(new_mission)
+        await self.db.flush()
 
         return new_mission
 
@@ -124,8 +131,8 @@ class MissionService:
         Lance une mission (passe de PREPARING à IN_PROGRESS).
         Marque les PNJ comme en mission.
         """
-        # Récupérer la mission
-        mission = await self.get_mission_by_id(mission_id, user_id)
+        # Récupérer la mission avec ses participants et leurs personnages
+        mission = await self.get_mission_by_id(mission_id, user_id, with_characters=True)
         if not mission:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -138,35 +145,37 @@ class MissionService:
                 detail="La mission n'est pas en préparation"
             )
 
-        # Marquer les participants comme en mission
-        for participant in mission.participants:
-            character_result = await self.db.execute(
-                select(Character).where(Character.id == participant.character_id)
-            )
-            character = character_result.scalar_one_or_none()
-            if character:
-                character.is_on_mission = True
+        # Marquer les participants comme en mission (PV régénérés jusqu'au départ)
+        now = datetime.utcnow()
+        self._release_or_engage(self._participant_characters(mission), True, now)
 
-        # Démarrer la mission
+        # Démarrer la mission (completed_at = échéance prévue jusqu'à la complétion)
         mission.status = MissionStatus.IN_PROGRESS.value
-        mission.started_at = datetime.utcnow()
+        mission.started_at = now
+        mission.completed_at = mission.started_at + timedelta(minutes=mission.duration_minutes)
+
+        await self.db.flush()
 
-        await self.db.commit()
-        await self.db.refresh(mission)
+        # Complétion automatique à l'échéance exacte
+        due_scheduler.schedule(MISSION, mission.id, mission.completed_at)
 
         return mission
 
     async def complete_mission(
         self,
         mission_id: int,
-        user_id: int
+        user_id: Optional[int] = None
     ) -> MissionComplete:
         """
         Termine une mission et calcule les résultats.
         Distribue récompenses, XP, gère les blessures.
+        Sans user_id (workers), pas de vérification propriétaire.
+        
+        Le graphe mission → participants → personnages est chargé une fois
+        et réutilisé pour le taux de réussite, l'XP et les blessures.
         """
-        # Récupérer la mission
-        mission = await self.get_mission_by_id(mission_id, user_id)
+        # Récupérer la mission avec ses participants et leurs personnages
+        mission = await self.get_mission_by_id(mission_id, user_id, with_characters=True)
         if not mission:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -187,20 +196,14 @@ class MissionService:
         #         raise HTTPException(...)
 
         # Calculer le taux de réussite
-        success_rate = await self.calculate_success_rate(mission_id)
+        success_rate = await self.calculate_success_rate(mission_id, mission)
         
         # Lancer le dé
         success = random.random() < success_rate
 
-        # Récupérer les participants
-        participants = []
-        for participant in mission.participants:
-            char_result = await self.db.execute(
-                select(Character).where(Character.id == participant.character_id)
-            )
-            character = char_result.scalar_one_or_none()
-            if character:
-                participants.append(character)
+        participants = self._participant_characters(mission)
+        # Retour au village: la régénération reprend à partir de maintenant
+        self._release_or_engage(participants, False)
 
         # Calculer récompenses et casualties
         rewards_obtained = {}
@@ -220,9 +223,7 @@ class MissionService:
             base_xp = mission.rewards.get("xp", 100)
             xp_gained = base_xp
             
-            for character in participants:
-                await self._grant_xp(character.id, xp_gained)
-                character.is_on_mission = False
+            await CharacterService(self.db).grant_xp_bulk(participants, xp_gained)
             
             # Chance d'équipement (TODO: quand Equipment service sera créé)
             # equipment_chance = mission.rewards.get("equipment_chance", 0)
@@ -244,11 +245,10 @@ class MissionService:
             base_xp = mission.rewards.get("xp", 100)
             xp_gained = int(base_xp * 0.3)
             
+            await CharacterService(self.db).grant_xp_bulk(participants, xp_gained)
+            
             # Casualties (30% de chance de blessure par participant)
             for character in participants:
-                await self._grant_xp(character.id, xp_gained)
-                character.is_on_mission = False
-                
                 if random.random() < 0.3:
                     # Blessure : perte de 30-50% HP
                     damage_percent = random.uniform(0.3, 0.5)
@@ -259,7 +259,9 @@ class MissionService:
         # Terminer la mission
         mission.completed_at = datetime.utcnow()
 
-        await self.db.commit()
+        await self.db.flush()
+
+        due_scheduler.cancel(MISSION, mission.id)
 
         return MissionComplete(
             mission_id=mission.id,
@@ -278,8 +280,8 @@ class MissionService:
         Rappelle une mission en cours (annulation).
         Aucune récompense, mais PNJ rentrent sans dégâts.
         """
-        # Récupérer la mission
-        mission = await self.get_mission_by_id(mission_id, user_id)
+        # Récupérer la mission avec ses participants et leurs personnages
+        mission = await self.get_mission_by_id(mission_id, user_id, with_characters=True)
         if not mission:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -293,24 +295,23 @@ class MissionService:
             )
 
         # Libérer les participants
-        for participant in mission.participants:
-            char_result = await self.db.execute(
-                select(Character).where(Character.id == participant.character_id)
-            )
-            character = char_result.scalar_one_or_none()
-            if character:
-                character.is_on_mission = False
+        self._release_or_engage(self._participant_characters(mission), False)
 
         # Marquer comme rappelée
         mission.status = MissionStatus.RECALLED.value
         mission.completed_at = datetime.utcnow()
 
-        await self.db.commit()
-        await self.db.refresh(mission)
+        await self.db.flush()
+
+        due_scheduler.cancel(MISSION, mission.id)
 
         return mission
 
-    async def calculate_success_rate(self, mission_id: int) -> float:
+    async def calculate_success_rate(
+        self,
+        mission_id: int,
+        mission: Optional[Mission] = None
+    ) -> float:
         """
         Calcule le taux de réussite d'une mission.
         
@@ -318,46 +319,42 @@ class MissionService:
         - Score équipe = Σ(puissance_PNJ) / nb_participants
         - Taux base = min(0.9, Score équipe / (difficulté × 50))
         - Bonus chef: +5% si un Leader dans l'équipe
+        - Bonus recherches: mission_success_bonus (%) du village
         - Malus moral: -10% si moral village < 50
+        
+        Args:
+            mission_id: ID de la mission
+            mission: Mission déjà chargée avec ses personnages (évite un rechargement)
         """
-        # Récupérer la mission
-        result = await self.db.execute(
-            select(Mission).where(Mission.id == mission_id)
-        )
-        mission = result.scalar_one_or_none()
+        # Récupérer la mission (si pas déjà chargée par l'appelant)
+        if mission is None:
+            mission = await self.get_mission_by_id(mission_id, with_characters=True)
         if not mission:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Mission non trouvée"
             )
 
-        # Récupérer les participants
-        participants = []
+        # Participants
+        participants = self._participant_characters(mission)
         has_leader = False
         total_power = 0
 
-        for participant in mission.participants:
-            char_result = await self.db.execute(
-                select(Character).where(Character.id == participant.character_id)
+        for character in participants:
+            # Calculer puissance du PNJ
+            power = (
+                character.strength +
+                character.dexterity +
+                character.endurance +
+                character.intelligence +
+                character.speed +
+                character.luck
             )
-            character = char_result.scalar_one_or_none()
-            if character:
-                participants.append(character)
-                
-                # Calculer puissance du PNJ
-                power = (
-                    character.strength +
-                    character.dexterity +
-                    character.endurance +
-                    character.intelligence +
-                    character.speed +
-                    character.luck
-                )
-                total_power += power
-                
-                # Vérifier si Leader
-                if character.character_class == "leader":
-                    has_leader = True
+            total_power += power
+            
+            # Vérifier si Leader
+            if character.character_class == "leader":
+                has_leader = True
 
         if not participants:
             return 0.0
@@ -372,34 +369,46 @@ class MissionService:
         # Bonus chef
         leader_bonus = 0.05 if has_leader else 0.0
 
+        # Bonus des recherches complétées (vecteur mémoïsé)
+        research_bonus = (await ResearchService(self.db).get_bonus_vector(mission.village_id)).mission_success_bonus / 100
+
         # Bonus/malus moral (TODO: récupérer moral du village)
         # village_result = await self.db.execute(...)
         # moral_bonus = -0.1 if village.moral < 50 else 0.0
         moral_bonus = 0.0  # Placeholder
 
         # Taux final (entre 0.1 et 0.95)
-        final_rate = max(0.1, min(0.95, base_rate + leader_bonus + moral_bonus))
+        final_rate = max(0.1, min(0.95, base_rate + leader_bonus + research_bonus + moral_bonus))
 
         return final_rate
 
     async def get_mission_by_id(
         self,
         mission_id: int,
-        user_id: Optional[int] = None
+        user_id: Optional[int] = None,
+        with_characters: bool = False
     ) -> Optional[Mission]:
-        """Récupère une mission par ID (avec vérification propriétaire optionnelle)"""
+        """
+        Récupère une mission par ID (avec vérification propriétaire optionnelle).
+        
+        Args:
+            mission_id: ID de la mission
+            user_id: Propriétaire attendu (jointure sur le village)
+            with_characters: Charge aussi participants → personnages
+                             (une requête pour la mission, une pour l'équipe)
+        """
         query = select(Mission).where(Mission.id == mission_id)
         
         if user_id:
             # Vérifier que la mission appartient au village de l'utilisateur
-            village_result = await self.db.execute(
-                select(Village).where(Village.user_id == user_id)
+            query = query.join(Village, Village.id == Mission.village_id).where(
+                Village.user_id == user_id
+            )
+        
+        if with_characters:
+            query = query.options(
+                selectinload(Mission.participants).joinedload(MissionParticipant.character)
             )
-            village = village_result.scalar_one_or_none()
-            if not village:
-                return None
-            
-            query = query.where(Mission.village_id == village.id)
         
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
@@ -411,18 +420,15 @@ class MissionService:
     ) -> List[Mission]:
         """Récupère toutes les missions du village (filtre optionnel par statut)"""
         # Récupérer le village
-        village_result = await self.db.execute(
-            select(Village).where(Village.user_id == user_id)
-        )
-        village = village_result.scalar_one_or_none()
-        if not village:
+        village_id = await VillageService(self.db).get_village_id_by_user_id(user_id)
+        if village_id is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Village non trouvé"
             )
 
         # Récupérer les missions
-        query = select(Mission).where(Mission.village_id == village.id)
+        query = select(Mission).where(Mission.village_id == village_id)
         
         if status_filter:
             query = query.where(Mission.status == status_filter.value)
@@ -455,7 +461,7 @@ class MissionService:
             )
 
         await self.db.delete(mission)
-        await self.db.commit()
+        await self.db.flush()
 
         return True
 
@@ -469,10 +475,7 @@ class MissionService:
         Retourne les paramètres sans créer la mission.
         """
         # Récupérer le village pour ajuster difficulté
-        village_result = await self.db.execute(
-            select(Village).where(Village.user_id == user_id)
-        )
-        village = village_result.scalar_one_or_none()
+        village = await VillageService(self.db).get_village_by_user_id(user_id)
         if not village:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -553,31 +556,29 @@ class MissionService:
         village_id: int,
         resources: Dict[str, int]
     ):
-        """Ajoute des ressources au village"""
-        # Récupérer ressources existantes
-        result = await self.db.execute(
-            select(Resource).where(Resource.village_id == village_id)
-        )
-        existing_resources = {r.resource_type: r for r in result.scalars().all()}
-
-        # Ajouter
-        for resource_type, amount in resources.items():
-            if resource_type in existing_resources:
-                existing_resources[resource_type].quantity += amount
-            else:
-                # Créer la ressource si elle n'existe pas
-                new_resource = Resource(
-                    village_id=village_id,
-                    resource_type=resource_type,
-                    quantity=amount
-                )
-                self.db.add(new_resource)
-
-        await self.db.commit()
-
-    async def _grant_xp(self, character_id: int, xp_amount: int):
-        """Donne de l'XP à un personnage"""
-        from backend.app.services.character_service import CharacterService
-        
-        char_service = CharacterService(self.db)
-        await char_service.gain_xp(character_id, xp_amount)
+        """Ajoute des ressources au village (validé par le commit de l'appelant)"""
+        await ResourceService(self.db).add(village_id, resources)
+
+    def _participant_characters(self, mission: Mission) -> List[Character]:
+        """Personnages des participants (graphe chargé par get_mission_by_id(with_characters=True))"""
+        return [
+            participant.character
+            for participant in mission.participants
+            if participant.character is not None
+        ]
+
+    def _release_or_engage(
+        self,
+        characters: List[Character],
+        on_mission: bool,
+        now: Optional[datetime] = None
+    ):
+        """
+        Change l'état `is_on_mission` des personnages après avoir matérialisé leurs PV
+        (pas de régénération pendant la mission).
+        """
+        character_service = CharacterService(self.db)
+        now = now or datetime.utcnow()
+        for character in characters:
+            character_service.apply_hp_regeneration(character, now)
+            character.is_on_mission = on_mission
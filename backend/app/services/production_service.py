@@ -0,0 +1,324 @@
+"""
+Service de production des bâtiments (moteur ensembliste, comptabilité au temps écoulé).
+
+La production n'est pas distribuée par tranches horaires fixes: chaque instance
+mémorise `last_production_at` et le stock est matérialisé à partir du temps écoulé
+× taux horaire, plafonné à la capacité de l'entrepôt. La matérialisation a lieu
+à la lecture/dépense (par village) ou lors du balayage périodique (villages inactifs).
+Avec le cache des stocks (CACHE_ENABLED), les lectures projettent la production
+en mémoire sans l'écrire (cf. project_production).
+
+Deux matérialisations concurrentes (lectures simultanées, lecture et dépense,
+balayage) lisent le même `last_production_at`: chaque instance n'est créditée
+que si son horodatage est avancé par un UPDATE conditionnel sur la valeur lue
+(compare-and-set), la seconde ne crédite donc rien.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple, Any
+from sqlalchemy import select, update, insert, bindparam, case, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.models.building import Building
+from backend.app.models.building_instance import BuildingInstance
+from backend.app.models.village import Village
+from backend.app.models.resource import Resource
+from backend.app.utils.constants import calculate_building_production
+from backend.app.utils.research_tree import persisted_completed_mask, research_bonuses
+
+
+def building_rate(production: Dict[str, Any], level: int, completed_mask: int) -> int:
+    """Taux horaire d'un bâtiment, bonus de production des recherches du village inclus"""
+    base_rate = calculate_building_production(production.get("amount_per_hour", 0), level)
+    return int(base_rate * research_bonuses(completed_mask).production_multiplier)
+
+
+def produced_units(rate: int, last_at: Optional[datetime], now: datetime) -> int:
+    """Unités entières produites au taux horaire `rate` entre `last_at` et `now`"""
+    if rate <= 0 or last_at is None or last_at >= now:
+        return 0
+    return int(rate * (now - last_at).total_seconds() / 3600)
+
+
+def project_production(
+    stock: Dict[str, int],
+    capacity: int,
+    producers: List[Tuple[str, int, datetime]],
+    now: datetime
+) -> Dict[str, int]:
+    """
+    Stocks tels que les donnerait une matérialisation à `now`, sans écrire.
+    Les matérialisations intermédiaires ne changent pas le résultat (seul le
+    temps consommé par les unités produites est avancé, le plafond est idempotent).
+    """
+    produced: Dict[str, int] = {}
+    for resource, rate, last_at in producers:
+        amount = produced_units(rate, last_at, now)
+        if amount > 0:
+            produced[resource] = produced.get(resource, 0) + amount
+
+    projected = dict(stock)
+    for resource, amount in produced.items():
+        projected[resource] = min(projected.get(resource, 0) + amount, capacity)
+    return projected
+
+
+class ProductionService:
+    """Service pour calculer et distribuer la production des bâtiments"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def produce(
+        self,
+        village_id: Optional[int] = None,
+        idle_before: Optional[datetime] = None,
+        now: Optional[datetime] = None,
+        shard: Optional[Tuple[int, int]] = None
+    ) -> Dict[int, Dict[str, int]]:
+        """
+        Matérialise la production écoulée depuis `last_production_at` (ou `built_at`).
+
+        Args:
+            village_id: Restreint à un village (lecture/dépense), tous sinon
+            idle_before: Ne traite que les instances non comptabilisées depuis cette date
+                         (balayage des villages inactifs)
+            now: Instant de référence (défaut: maintenant)
+            shard: (index, nombre de shards) pour ne traiter que `village_id % N == index`
+
+        Returns:
+            Production appliquée: {village_id: {resource: amount}}
+
+        Note:
+            Ne commit pas: l'appelant (route ou worker) valide la transaction.
+            Seules les unités entières sont produites; le reliquat de temps
+            est conservé pour la prochaine matérialisation.
+        """
+        now = now or datetime.utcnow()
+
+        claims, capacities = await self.compute_production_totals(
+            now, village_id, idle_before, shard
+        )
+        return await self.apply_production(claims, capacities)
+
+    async def compute_production_totals(
+        self,
+        now: datetime,
+        village_id: Optional[int] = None,
+        idle_before: Optional[datetime] = None,
+        shard: Optional[Tuple[int, int]] = None
+    ) -> Tuple[List[Dict[str, Any]], Dict[int, int]]:
+        """
+        Calcule la production écoulée des bâtiments actifs, par instance.
+        Une seule requête building_instances ⋈ buildings ⋈ villages.
+
+        Returns:
+            Tuple (productions, capacités):
+            - productions: par instance, quantité produite, `last_production_at`
+              lu (valeur attendue par le compare-and-set) et nouvelle valeur
+            - capacités: {village_id: warehouse_capacity}
+        """
+        last_accounted = func.coalesce(BuildingInstance.last_production_at, BuildingInstance.built_at)
+
+        query = (
+            select(
+                BuildingInstance.id,
+                BuildingInstance.village_id,
+                BuildingInstance.level,
+                BuildingInstance.last_production_at,
+                last_accounted,
+                Building.production,
+                Village.warehouse_capacity,
+                Village.research_completed_mask,
+                Village.research_state_version
+            )
+            .join(Building, Building.id == BuildingInstance.building_id)
+            .join(Village, Village.id == BuildingInstance.village_id)
+            .where(BuildingInstance.is_active == True)
+        )
+        if village_id is not None:
+            query = query.where(BuildingInstance.village_id == village_id)
+        if idle_before is not None:
+            query = query.where(last_accounted <= idle_before)
+        if shard is not None:
+            query = query.where(BuildingInstance.village_id % shard[1] == shard[0])
+
+        result = await self.db.execute(query)
+
+        claims: List[Dict[str, Any]] = []
+        capacities: Dict[int, int] = {}
+
+        for (
+            instance_id, inst_village_id, level, last_production_at, last_at, production,
+            warehouse_capacity, completed_mask, state_version
+        ) in result.all():
+            if not production or not production.get("resource"):
+                continue
+
+            rate = building_rate(production, level, persisted_completed_mask(completed_mask, state_version))
+            amount = produced_units(rate, last_at, now)
+            if amount <= 0:
+                continue
+
+            claims.append({
+                "instance_id": instance_id,
+                "village_id": inst_village_id,
+                "resource": production["resource"],
+                "amount": amount,
+                "read_at": last_production_at,
+                # Avancer uniquement du temps consommé par les unités produites
+                "advance_to": last_at + timedelta(hours=amount / rate)
+            })
+            capacities[inst_village_id] = warehouse_capacity
+
+        return claims, capacities
+
+    async def get_producers(self, village_id: int) -> List[Tuple[str, int, datetime]]:
+        """
+        Bâtiments actifs producteurs d'un village: (ressource, taux horaire, dernière comptabilisation).
+        Permet de projeter la production sans la matérialiser (cf. project_production).
+        """
+        result = await self.db.execute(
+            select(
+                BuildingInstance.level,
+                func.coalesce(BuildingInstance.last_production_at, BuildingInstance.built_at),
+                Building.production,
+                Village.research_completed_mask,
+                Village.research_state_version
+            )
+            .join(Building, Building.id == BuildingInstance.building_id)
+            .join(Village, Village.id == BuildingInstance.village_id)
+            .where(
+                BuildingInstance.village_id == village_id,
+                BuildingInstance.is_active == True
+            )
+        )
+
+        producers = []
+        for level, last_at, production, completed_mask, state_version in result.all():
+            if not production or not production.get("resource"):
+                continue
+            rate = building_rate(production, level, persisted_completed_mask(completed_mask, state_version))
+            if rate > 0:
+                producers.append((production["resource"], rate, last_at))
+        return producers
+
+    async def apply_production(
+        self,
+        claims: List[Dict[str, Any]],
+        capacities: Dict[int, int]
+    ) -> Dict[int, Dict[str, int]]:
+        """
+        Avance `last_production_at` des instances comptabilisées (compare-and-set),
+        puis ajoute la production des seules instances avancées aux stocks des
+        villages (plafonnée à la capacité de l'entrepôt).
+        Un ou deux UPDATE ... RETURNING pour les horodatages, un UPDATE groupé
+        (executemany) pour les stocks existants, un INSERT groupé pour les
+        ressources encore absentes.
+
+        Returns:
+            Production appliquée: {village_id: {resource: amount}}
+        """
+        advanced = await self._advance_instances(claims)
+
+        totals: Dict[int, Dict[str, int]] = {}
+        for claim in claims:
+            if claim["instance_id"] not in advanced:
+                continue
+            village_totals = totals.setdefault(claim["village_id"], {})
+            village_totals[claim["resource"]] = village_totals.get(claim["resource"], 0) + claim["amount"]
+
+        if not totals:
+            return totals
+
+        resource_types = {res for village_totals in totals.values() for res in village_totals}
+
+        # Stocks déjà présents pour les ressources produites
+        existing_query = select(Resource.village_id, Resource.resource_type).where(
+            Resource.resource_type.in_(resource_types)
+        )
+        if len(totals) == 1:
+            existing_query = existing_query.where(Resource.village_id == next(iter(totals)))
+        existing_result = await self.db.execute(existing_query)
+        existing = set(existing_result.all())
+
+        updates = []
+        inserts = []
+
+        for village_id, village_totals in totals.items():
+            capacity = capacities[village_id]
+            for resource_type, amount in village_totals.items():
+                if (village_id, resource_type) in existing:
+                    updates.append({
+                        "b_village_id": village_id,
+                        "b_resource_type": resource_type,
+                        "b_amount": amount,
+                        "b_capacity": capacity
+                    })
+                else:
+                    inserts.append({
+                        "village_id": village_id,
+                        "resource_type": resource_type,
+                        "quantity": min(amount, capacity)
+                    })
+
+        if updates:
+            resources = Resource.__table__
+            new_quantity = resources.c.quantity + bindparam("b_amount")
+            await self.db.execute(
+                update(resources)
+                .where(
+                    resources.c.village_id == bindparam("b_village_id"),
+                    resources.c.resource_type == bindparam("b_resource_type")
+                )
+                .values(
+                    quantity=case(
+                        (new_quantity > bindparam("b_capacity"), bindparam("b_capacity")),
+                        else_=new_quantity
+                    )
+                ),
+                updates
+            )
+
+        if inserts:
+            await self.db.execute(insert(Resource.__table__), inserts)
+
+        return totals
+
+    async def _advance_instances(self, claims: List[Dict[str, Any]]) -> set:
+        """
+        Avance `last_production_at` des instances dont la valeur n'a pas changé
+        depuis la lecture (une matérialisation concurrente l'a sinon déjà fait).
+
+        Returns:
+            IDs des instances avancées (à créditer)
+        """
+        instances = BuildingInstance.__table__
+        advanced = set()
+
+        # Jamais comptabilisées (IS NULL), puis déjà comptabilisées (= valeur lue)
+        never = [claim for claim in claims if claim["read_at"] is None]
+        already = [claim for claim in claims if claim["read_at"] is not None]
+
+        for group in (never, already):
+            if not group:
+                continue
+            if group is never:
+                expected = instances.c.last_production_at.is_(None)
+            else:
+                expected = instances.c.last_production_at == case(
+                    {claim["instance_id"]: claim["read_at"] for claim in group},
+                    value=instances.c.id
+                )
+            result = await self.db.execute(
+                update(instances)
+                .where(instances.c.id.in_([claim["instance_id"] for claim in group]), expected)
+                .values(last_production_at=case(
+                    {claim["instance_id"]: claim["advance_to"] for claim in group},
+                    value=instances.c.id
+                ))
+                .returning(instances.c.id)
+            )
+            advanced.update(result.scalars().all())
+
+        return advanced
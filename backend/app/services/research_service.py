@@ -3,19 +3,42 @@ Service de gestion des recherches (arbre technologique).
 Gère les prérequis, les coûts, les débloquages et la progression.
 """
 
-from sqlalchemy import select
+from sqlalchemy import select, update, insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import lazyload
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
-from uuid import UUID
 
 from backend.app.models.research import Research, ResearchStatus
 from backend.app.models.village import Village
-from backend.app.services.village_service import VillageService
+from backend.app.services.resource_service import ResourceService
 from backend.app.utils.constants import (
     RESEARCH_TREE,
     ResearchCategory
 )
+from backend.app.services.production_service import ProductionService
+from backend.app.utils.research_tree import (
+    research_index,
+    research_bonuses,
+    ResearchBonusVector,
+    ResearchState
+)
+from backend.app.workers.due_scheduler import due_scheduler, RESEARCH
+
+
+# Lignes researches précalculées depuis l'arbre (sans village_id ni statut)
+_RESEARCH_ROW_TEMPLATES = tuple(
+    {
+        "key": key,
+        "name": RESEARCH_TREE[key]["name"],
+        "description": RESEARCH_TREE[key]["description"],
+        "cost": RESEARCH_TREE[key].get("costs", {}),
+        "duration_minutes": RESEARCH_TREE[key].get("duration_hours", 1) * 60,
+        "bonuses": RESEARCH_TREE[key].get("effects"),
+        "progress": 0
+    }
+    for key in research_index.order
+)
 
 
 class ResearchService:
@@ -23,9 +46,8 @@ class ResearchService:
     
     def __init__(self, db: AsyncSession):
         self.db = db
-        self.village_service = VillageService(db)
     
-    async def get_research(self, research_id: UUID) -> Optional[Research]:
+    async def get_research(self, research_id: int) -> Optional[Research]:
         """Récupère une recherche par son ID."""
         result = await self.db.execute(
             select(Research).where(Research.id == research_id)
@@ -34,7 +56,7 @@ class ResearchService:
     
     async def get_village_researches(
         self,
-        village_id: UUID,
+        village_id: int,
         status: Optional[ResearchStatus] = None,
         category: Optional[ResearchCategory] = None
     ) -> List[Research]:
@@ -44,37 +66,83 @@ class ResearchService:
         if status:
             query = query.where(Research.status == status)
         if category:
-            query = query.where(Research.category == category)
+            query = query.where(Research.key.in_(research_index.by_category.get(category, ())))
         
-        query = query.order_by(Research.category, Research.research_key)
+        query = query.order_by(Research.key)
         result = await self.db.execute(query)
         return list(result.scalars().all())
     
-    async def initialize_village_researches(self, village_id: UUID) -> List[Research]:
+    async def get_research_state(self, village_id: int) -> ResearchState:
         """
-        Initialise toutes les recherches disponibles pour un nouveau village.
-        Toutes commencent LOCKED sauf celles sans prérequis (AVAILABLE).
+        État compact des recherches du village (bitset des complétées + recherche en cours).
+        Lu sur le village (souvent déjà en session); recalculé depuis les lignes
+        researches s'il est absent ou calculé pour un autre arbre, sans écriture
+        (les routes en lecture seule l'utilisent aussi).
         """
-        researches = []
-        
-        for key, data in RESEARCH_TREE.items():
-            # Déterminer le statut initial
-            status = ResearchStatus.AVAILABLE if not data.get("prerequisites") else ResearchStatus.LOCKED
-            
-            research = Research(
-                village_id=village_id,
-                research_key=key,
-                category=data["category"],
-                status=status,
-                progress=0,
-                started_at=None,
-                completed_at=None
-            )
-            self.db.add(research)
-            researches.append(research)
+        village = await self._get_village(village_id)
+        if (
+            village is not None
+            and village.research_completed_mask is not None
+            and village.research_state_version == research_index.fingerprint
+        ):
+            return ResearchState(village.research_completed_mask, village.research_in_progress)
         
-        await self.db.commit()
-        return researches
+        result = await self.db.execute(
+            select(Research.key, Research.status).where(Research.village_id == village_id)
+        )
+        return ResearchState.from_statuses(result.all())
+    
+    async def _get_village(self, village_id: int) -> Optional[Village]:
+        """Village depuis la session si déjà chargé, sinon sans ses PNJ (colonnes seules utiles)"""
+        return await self.db.get(Village, village_id, options=[lazyload(Village.characters)])
+    
+    async def _save_research_state(self, village_id: int, state: ResearchState):
+        """Persiste l'état compact sur le village (flush avec les lignes researches)"""
+        village = await self._get_village(village_id)
+        if village is None:
+            return
+        village.research_completed_mask = state.completed_mask
+        village.research_in_progress = state.in_progress
+        village.research_state_version = research_index.fingerprint
+    
+    async def initialize_village_researches(self, village_id: int):
+        """
+        Initialise toutes les recherches disponibles pour un village.
+        Une recherche créée est AVAILABLE si ses prérequis sont déjà complétés
+        (seulement les racines pour un nouveau village), LOCKED sinon.
+        
+        Un seul INSERT groupé depuis les lignes précalculées; seules les
+        recherches absentes sont créées (appel idempotent, et un arbre
+        enrichi complète les villages existants).
+        """
+        result = await self.db.execute(
+            select(Research.key).where(Research.village_id == village_id)
+        )
+        existing = set(result.scalars().all())
+        
+        # Statut initial selon les recherches déjà complétées du village
+        # (une recherche ajoutée à l'arbre peut être déjà débloquée)
+        state = await self.get_research_state(village_id) if existing else ResearchState()
+        rows = [
+            {
+                **template,
+                "village_id": village_id,
+                "status": (
+                    ResearchStatus.AVAILABLE.value
+                    if research_index.is_unlocked(template["key"], state.completed_mask)
+                    else ResearchStatus.LOCKED.value
+                )
+            }
+            for template in _RESEARCH_ROW_TEMPLATES
+            if template["key"] not in existing
+        ]
+        if not rows:
+            return
+        
+        await self.db.execute(insert(Research.__table__), rows)
+        # État réenregistré sous l'empreinte de l'arbre courant
+        await self._save_research_state(village_id, state)
+        await self.db.flush()
     
     async def get_research_details(self, research_key: str) -> Dict[str, Any]:
         """Récupère les détails complets d'une recherche depuis RESEARCH_TREE."""
@@ -84,64 +152,65 @@ class ResearchService:
         data = RESEARCH_TREE[research_key].copy()
         return data
     
-    async def get_available_researches(self, village_id: UUID) -> List[Dict[str, Any]]:
+    async def get_available_researches(self, village_id: int) -> List[Dict[str, Any]]:
         """
         Récupère toutes les recherches disponibles (AVAILABLE) pour un village.
         Retourne les détails complets avec coûts et bénéfices.
+        Les clés disponibles sont déduites de l'état compact; seules leurs
+        lignes sont lues (identifiants).
         """
-        researches = await self.get_village_researches(
-            village_id=village_id,
-            status=ResearchStatus.AVAILABLE
+        state = await self.get_research_state(village_id)
+        available = research_index.keys(state.available_mask)
+        if not available:
+            return []
+        
+        result = await self.db.execute(
+            select(Research.key, Research.id, Research.progress).where(
+                Research.village_id == village_id,
+                Research.key.in_(available)
+            )
         )
+        rows = {key: (research_id, progress) for key, research_id, progress in result.all()}
         
         detailed = []
-        for research in researches:
-            details = await self.get_research_details(research.research_key)
+        for key in available:
+            if key not in rows:
+                continue
+            research_id, progress = rows[key]
             detailed.append({
-                "id": research.id,
-                "research_key": research.research_key,
-                "category": research.category,
-                "status": research.status,
-                **details
+                "id": research_id,
+                "village_id": village_id,
+                "research_key": key,
+                "status": ResearchStatus.AVAILABLE,
+                "progress": progress,
+                **RESEARCH_TREE[key]
             })
         
         return detailed
     
     async def check_prerequisites(
         self,
-        village_id: UUID,
+        village_id: int,
         research_key: str
     ) -> tuple[bool, List[str]]:
         """
         Vérifie si tous les prérequis d'une recherche sont complétés.
         Retourne (succès, liste des prérequis manquants).
         """
-        data = RESEARCH_TREE.get(research_key)
-        if not data:
+        if research_key not in research_index:
             return False, ["Recherche introuvable"]
         
-        prerequisites = data.get("prerequisites", [])
-        if not prerequisites:
+        if not research_index.prerequisites[research_key]:
             return True, []
         
-        # Récupérer toutes les recherches complétées du village
-        completed = await self.get_village_researches(
-            village_id=village_id,
-            status=ResearchStatus.COMPLETED
-        )
-        completed_keys = [r.research_key for r in completed]
-        
-        # Vérifier chaque prérequis
-        missing = []
-        for prereq in prerequisites:
-            if prereq not in completed_keys:
-                missing.append(prereq)
+        state = await self.get_research_state(village_id)
+        missing = research_index.missing_prerequisites(research_key, state.completed_mask)
         
         return len(missing) == 0, missing
     
     async def can_afford_research(
         self,
-        village_id: UUID,
+        village_id: int,
         research_key: str
     ) -> tuple[bool, Dict[str, int]]:
         """
@@ -152,15 +221,13 @@ class ResearchService:
         if not data:
             return False, {}
         
-        village = await self.village_service.get_village(village_id)
-        if not village:
-            return False, {}
+        stock = await ResourceService(self.db).get_stock(village_id)
         
         costs = data.get("costs", {})
         missing = {}
         
         for resource, amount in costs.items():
-            current = getattr(village, resource, 0)
+            current = stock.get(resource, 0)
             if current < amount:
                 missing[resource] = amount - current
         
@@ -168,19 +235,16 @@ class ResearchService:
     
     async def start_research(
         self,
-        village_id: UUID,
+        village_id: int,
         research_key: str
     ) -> tuple[Optional[Research], Optional[str]]:
         """
         Démarre une recherche si les conditions sont remplies.
         Retourne (recherche, message d'erreur si échec).
         """
-        # Vérifier qu'il n'y a pas déjà une recherche en cours
-        in_progress = await self.get_village_researches(
-            village_id=village_id,
-            status=ResearchStatus.IN_PROGRESS
-        )
-        if in_progress:
+        # Vérifier qu'il n'y a pas déjà une recherche en cours (emplacement unique)
+        state = await self.get_research_state(village_id)
+        if state.in_progress:
             return None, "Une recherche est déjà en cours"
         
         # Récupérer la recherche
@@ -201,38 +265,37 @@ class ResearchService:
         if research.status == ResearchStatus.LOCKED:
             return None, "Recherche verrouillée (prérequis manquants)"
         
-        # Vérifier les prérequis (double check)
-        can_start, missing_prereqs = await self.check_prerequisites(village_id, research_key)
-        if not can_start:
+        # Vérifier les prérequis (double check, sur l'état déjà chargé)
+        missing_prereqs = research_index.missing_prerequisites(research_key, state.completed_mask)
+        if missing_prereqs:
             return None, f"Prérequis manquants : {', '.join(missing_prereqs)}"
         
-        # Vérifier les ressources
-        can_afford, missing_resources = await self.can_afford_research(village_id, research_key)
-        if not can_afford:
-            return None, f"Ressources insuffisantes : {missing_resources}"
-        
-        # Consommer les ressources
+        # Consommer les ressources (vérification et débit en un UPDATE conditionnel)
         data = RESEARCH_TREE[research_key]
         costs = data.get("costs", {})
-        success = await self.village_service.consume_resources(village_id, costs)
-        if not success:
-            return None, "Erreur lors de la consommation des ressources"
+        missing_resources = await ResourceService(self.db).try_spend(village_id, costs)
+        if missing_resources:
+            return None, f"Ressources insuffisantes : {missing_resources}"
         
-        # Démarrer la recherche
-        duration_hours = data.get("duration_hours", 1)
+        # Démarrer la recherche (durée réduite par les recherches de vitesse)
+        duration_hours = data.get("duration_hours", 1) / research_bonuses(state.completed_mask).research_speed
         research.status = ResearchStatus.IN_PROGRESS
         research.progress = 0
         research.started_at = datetime.utcnow()
         research.completed_at = datetime.utcnow() + timedelta(hours=duration_hours)
         
-        await self.db.commit()
-        await self.db.refresh(research)
+        state.in_progress = research_key
+        await self._save_research_state(village_id, state)
+        await self.db.flush()
+        
+        # Complétion automatique à l'échéance exacte
+        due_scheduler.schedule(RESEARCH, research.id, research.completed_at)
         
         return research, None
     
     async def complete_research(
         self,
-        research_id: UUID,
+        research_id: int,
         force: bool = False
     ) -> tuple[Optional[Research], Optional[str]]:
         """
@@ -258,32 +321,50 @@ class ResearchService:
         research.progress = 100
         research.completed_at = datetime.utcnow()
         
-        # Débloquer les recherches dépendantes
-        await self._unlock_dependent_researches(research.village_id, research.research_key)
+        # Mettre à jour l'état compact et débloquer les recherches dépendantes
+        state = await self.get_research_state(research.village_id)
+        previous_bonuses = research_bonuses(state.completed_mask)
+        state.completed_mask |= research_index.bit.get(research.research_key, 0)
+        if research_bonuses(state.completed_mask).production_multiplier != previous_bonuses.production_multiplier:
+            # Comptabiliser la production écoulée à l'ancien taux
+            await ProductionService(self.db).produce(village_id=research.village_id)
+        state.in_progress = None
+        await self._unlock_dependent_researches(research.village_id, research.research_key, state)
+        await self._save_research_state(research.village_id, state)
         
-        await self.db.commit()
-        await self.db.refresh(research)
+        await self.db.flush()
+        
+        due_scheduler.cancel(RESEARCH, research.id)
         
         return research, None
     
-    async def _unlock_dependent_researches(self, village_id: UUID, completed_key: str):
+    async def _unlock_dependent_researches(
+        self,
+        village_id: int,
+        completed_key: str,
+        state: ResearchState
+    ):
         """
-        Débloque les recherches qui dépendaient de celle-ci.
-        Vérifie tous les prérequis de chaque recherche LOCKED.
+        Débloque les recherches qui dépendaient de celle-ci (statut des lignes).
+        Seuls ses dépendants directs (research_index) sont examinés, contre
+        le bitset des recherches complétées (incluant `completed_key`);
+        un seul UPDATE pour les débloquer.
         """
-        locked = await self.get_village_researches(
-            village_id=village_id,
-            status=ResearchStatus.LOCKED
-        )
+        unlocked = research_index.newly_unlocked(completed_key, state.completed_mask)
+        if not unlocked:
+            return
         
-        for research in locked:
-            can_unlock, _ = await self.check_prerequisites(village_id, research.research_key)
-            if can_unlock:
-                research.status = ResearchStatus.AVAILABLE
-        
-        await self.db.commit()
+        await self.db.execute(
+            update(Research)
+            .where(
+                Research.village_id == village_id,
+                Research.key.in_(unlocked),
+                Research.status == ResearchStatus.LOCKED
+            )
+            .values(status=ResearchStatus.AVAILABLE.value)
+        )
     
-    async def cancel_research(self, research_id: UUID) -> tuple[Optional[Research], Optional[str]]:
+    async def cancel_research(self, research_id: int) -> tuple[Optional[Research], Optional[str]]:
         """
         Annule une recherche en cours.
         Ne rembourse PAS les ressources (coût de l'annulation).
@@ -301,84 +382,69 @@ class ResearchService:
         research.started_at = None
         research.completed_at = None
         
-        await self.db.commit()
-        await self.db.refresh(research)
+        state = await self.get_research_state(research.village_id)
+        state.in_progress = None
+        await self._save_research_state(research.village_id, state)
+        
+        await self.db.flush()
+        
+        due_scheduler.cancel(RESEARCH, research.id)
         
         return research, None
     
-    async def get_tech_tree(self, village_id: UUID) -> Dict[str, Any]:
+    async def get_tech_tree(self, village_id: int) -> Dict[str, Any]:
         """
         Récupère l'arbre technologique complet du village.
         Structure : {category: [researches avec détails + statut]}
+        Statuts déduits de l'état compact, détails et regroupement de l'index
+        statique; seules les colonnes propres à chaque ligne sont lues.
         """
-        researches = await self.get_village_researches(village_id)
-        
-        # Organiser par catégorie
-        tree = {
-            ResearchCategory.AGRICULTURE: [],
-            ResearchCategory.MILITARY: [],
-            ResearchCategory.ECONOMY: [],
-            ResearchCategory.SCIENCE: []
-        }
+        state = await self.get_research_state(village_id)
         
-        for research in researches:
-            details = await self.get_research_details(research.research_key)
-            tree[research.category].append({
-                "id": research.id,
-                "research_key": research.research_key,
-                "status": research.status,
-                "progress": research.progress,
-                "started_at": research.started_at,
-                "completed_at": research.completed_at,
-                **details
-            })
+        result = await self.db.execute(
+            select(
+                Research.key,
+                Research.id,
+                Research.progress,
+                Research.started_at,
+                Research.completed_at
+            ).where(Research.village_id == village_id)
+        )
+        rows = {row.key: row for row in result.all()}
+        
+        # Organiser par catégorie (clés = noms des champs de ResearchTree)
+        tree = {category.value: [] for category in ResearchCategory}
+        
+        for category, keys in research_index.by_category.items():
+            for key in keys:
+                row = rows.get(key)
+                if row is None:
+                    continue
+                tree[category.value].append({
+                    "id": row.id,
+                    "village_id": village_id,
+                    "research_key": key,
+                    "status": state.status(key),
+                    "progress": row.progress,
+                    "started_at": row.started_at,
+                    "completed_at": row.completed_at,
+                    **RESEARCH_TREE[key]
+                })
         
         return tree
     
-    async def get_research_bonuses(self, village_id: UUID) -> Dict[str, Any]:
+    async def get_research_bonuses(self, village_id: int) -> Dict[str, Any]:
         """
-        Calcule tous les bonus actifs des recherches complétées.
+        Récupère tous les bonus actifs des recherches complétées.
         Retourne un dict avec tous les bonus cumulés.
         """
-        completed = await self.get_village_researches(
-            village_id=village_id,
-            status=ResearchStatus.COMPLETED
-        )
-        
-        bonuses = {
-            "production_multiplier": 1.0,  # Multiplicateur de production
-            "mission_success_bonus": 0,     # Bonus % taux de succès missions
-            "construction_speed": 1.0,      # Vitesse de construction
-            "research_speed": 1.0,          # Vitesse de recherche
-            "unlocked_buildings": [],       # Bâtiments débloqués
-            "unlocked_equipment": [],       # Équipements débloqués
-            "special_abilities": []         # Capacités spéciales
+        bonuses = await self.get_bonus_vector(village_id)
+        return {
+            field: list(value) if isinstance(value, tuple) else value
+            for field, value in bonuses._asdict().items()
         }
-        
-        for research in completed:
-            data = RESEARCH_TREE.get(research.research_key, {})
-            effects = data.get("effects", {})
-            
-            # Appliquer les effets
-            if "production_bonus" in effects:
-                bonuses["production_multiplier"] += effects["production_bonus"] / 100
-            
-            if "mission_success_bonus" in effects:
-                bonuses["mission_success_bonus"] += effects["mission_success_bonus"]
-            
-            if "construction_speed_bonus" in effects:
-                bonuses["construction_speed"] += effects["construction_speed_bonus"] / 100
-            
-            if "research_speed_bonus" in effects:
-                bonuses["research_speed"] += effects["research_speed_bonus"] / 100
-            
-            if "unlocks_buildings" in effects:
-                bonuses["unlocked_buildings"].extend(effects["unlocks_buildings"])
-            
-            if "unlocks_equipment" in effects:
-                bonuses["unlocked_equipment"].extend(effects["unlocks_equipment"])
-            
-            if "special_ability" in effects:
-                bonuses["special_abilities"].append(effects["special_ability"])
-        
-        return bonuses
+    
+    async def get_bonus_vector(self, village_id: int) -> ResearchBonusVector:
+        """Vecteur de bonus du village (mémoïsé par bitset des recherches complétées)."""
+        state = await self.get_research_state(village_id)
+        return research_bonuses(state.completed_mask)
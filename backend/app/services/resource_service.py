@@ -0,0 +1,294 @@
+"""
+Service du registre des ressources (une ligne par village et type de ressource).
+
+Les stocks ne sont modifiés que par des UPDATE relatifs (`quantity = quantity ± n`)
+exécutés par la base: une dépense est un seul UPDATE conditionnel
+(`WHERE quantity >= n`) couvrant tous les types du coût, sans lecture préalable.
+Deux requêtes ou workers concurrents ne peuvent donc ni écraser leurs écritures
+ni faire passer un stock sous zéro.
+
+Si CACHE_ENABLED, les lectures sont servies par un instantané en mémoire par
+village (stocks, capacité, bâtiments producteurs): la production écoulée y est
+projetée sans requête ni écriture, sa matérialisation en base restant différée
+à la prochaine dépense ou au balayage périodique. L'instantané d'un village est
+invalidé au commit de toute transaction ayant modifié ses stocks, ses bâtiments
+ou son entrepôt; dans cette transaction, les lectures contournent le cache.
+"""
+
+from datetime import datetime
+from itertools import chain
+from typing import Dict, Optional, Tuple
+from sqlalchemy import select, update, insert, case, event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+
+from backend.app.config import settings
+from backend.app.models.building_instance import BuildingInstance
+from backend.app.models.resource import Resource
+from backend.app.models.village import Village
+from backend.app.schemas.resource import ResourceInventory
+from backend.app.services.production_service import ProductionService, project_production
+from backend.app.utils.cache import TTLCache
+from backend.app.utils.constants import ResourceType, STARTING_RESOURCES
+
+
+# Instantanés village_id → (stocks, capacité, producteurs), actif si CACHE_ENABLED
+_stock_cache = TTLCache(ttl_seconds=settings.CACHE_TTL)
+_WRITTEN_KEY = "resource_villages_written"
+
+
+def invalidate_resource_cache(village_id: int):
+    """Oublie l'instantané des stocks d'un village."""
+    _stock_cache.invalidate(village_id)
+
+
+def _mark_written(session: Session, village_id: int):
+    """Note un village modifié par la transaction (cache contourné puis invalidé au commit)"""
+    session.info.setdefault(_WRITTEN_KEY, set()).add(village_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_village_changes(session: Session, flush_context):
+    """Les bâtiments et l'entrepôt déterminent la production projetée"""
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, BuildingInstance) and obj.village_id is not None:
+            _mark_written(session, obj.village_id)
+        elif isinstance(obj, Village) and obj.id is not None:
+            _mark_written(session, obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session):
+    for village_id in session.info.pop(_WRITTEN_KEY, ()):
+        invalidate_resource_cache(village_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _invalidate_rolled_back(session: Session):
+    for village_id in session.info.get(_WRITTEN_KEY, ()):
+        invalidate_resource_cache(village_id)
+
+
+def _positive_amounts(amounts: Dict[str, int]) -> Dict[str, int]:
+    """Quantités strictement positives, indexées par la valeur du type (ResourceType ou str)"""
+    return {
+        getattr(resource_type, "value", resource_type): amount
+        for resource_type, amount in amounts.items()
+        if amount > 0
+    }
+
+
+class ResourceService:
+    """Service pour lire et modifier les stocks de ressources d'un village"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def initialize_village_resources(self, village_id: int):
+        """Crée les lignes de stock d'un nouveau village (tous les types, un seul INSERT)"""
+        await self.db.execute(insert(Resource.__table__), [
+            {
+                "village_id": village_id,
+                "resource_type": resource_type.value,
+                "quantity": STARTING_RESOURCES.get(resource_type, 0)
+            }
+            for resource_type in ResourceType
+        ])
+
+    async def get_stock(self, village_id: int, materialize: bool = True) -> Dict[str, int]:
+        """
+        Récupère les stocks d'un village: {resource_type: quantity}
+
+        Args:
+            village_id: Identifiant du village
+            materialize: Inclure la production écoulée (matérialisée, ou projetée
+                         depuis le cache si CACHE_ENABLED)
+        """
+        if materialize and self._cache_usable(village_id):
+            snapshot = await self._get_snapshot(village_id)
+            return snapshot[0] if snapshot else {}
+
+        if materialize:
+            await ProductionService(self.db).produce(village_id=village_id)
+
+        return await self._read_stock(village_id)
+
+    async def get_inventory(self, village_id: int) -> Optional[ResourceInventory]:
+        """
+        Récupère l'inventaire complet d'un village (stocks et occupation de l'entrepôt)
+
+        Returns:
+            ResourceInventory si le village existe, None sinon
+        """
+        if self._cache_usable(village_id):
+            snapshot = await self._get_snapshot(village_id)
+            if snapshot is None:
+                return None
+            stock, capacity = snapshot
+        else:
+            stock = await self.get_stock(village_id)
+            capacity = await self._read_capacity(village_id)
+            if capacity is None:
+                return None
+
+        used = sum(stock.values())
+        return ResourceInventory(
+            resources=stock,
+            warehouse_capacity=capacity,
+            warehouse_used=used,
+            warehouse_available=max(capacity - used, 0)
+        )
+
+    async def try_spend(self, village_id: int, cost: Dict[str, int]) -> Dict[str, int]:
+        """
+        Dépense un coût en ressources, entièrement ou pas du tout.
+
+        Un seul UPDATE ... SET quantity = quantity - n WHERE quantity >= n
+        pour tous les types du coût; si un type manque, les types déjà débités
+        sont recrédités (aucune écriture partielle ne subsiste).
+
+        Returns:
+            Ressources manquantes {resource_type: quantité manquante}, vide si dépensé
+        """
+        cost = _positive_amounts(cost)
+        if not cost:
+            return {}
+
+        # Matérialiser la production écoulée avant de dépenser
+        await ProductionService(self.db).produce(village_id=village_id)
+
+        resources = Resource.__table__
+        amount = case(cost, value=resources.c.resource_type)
+        result = await self.db.execute(
+            update(resources)
+            .where(
+                resources.c.village_id == village_id,
+                resources.c.resource_type.in_(cost),
+                resources.c.quantity >= amount
+            )
+            .values(quantity=resources.c.quantity - amount)
+            .returning(resources.c.resource_type)
+        )
+        _mark_written(self.db.sync_session, village_id)
+        debited = set(result.scalars().all())
+        if len(debited) == len(cost):
+            return {}
+
+        # Coût incomplet: annuler les débits (lignes déjà verrouillées par cette transaction)
+        if debited:
+            refund = {resource_type: cost[resource_type] for resource_type in debited}
+            await self.db.execute(
+                update(resources)
+                .where(
+                    resources.c.village_id == village_id,
+                    resources.c.resource_type.in_(refund)
+                )
+                .values(quantity=resources.c.quantity + case(refund, value=resources.c.resource_type))
+            )
+
+        stock = await self._read_stock(village_id)
+        return {
+            resource_type: amount - stock.get(resource_type, 0)
+            for resource_type, amount in cost.items()
+            if resource_type not in debited
+        }
+
+    async def spend(self, village_id: int, cost: Dict[str, int]):
+        """
+        Dépense un coût en ressources (voir try_spend)
+
+        Raises:
+            HTTPException: 400 si une ressource est insuffisante
+        """
+        cost = _positive_amounts(cost)
+        missing = await self.try_spend(village_id, cost)
+        if missing:
+            resource_type = next(iter(missing))
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Ressources insuffisantes: {resource_type} (besoin: {cost[resource_type]})"
+            )
+
+    async def add(self, village_id: int, amounts: Dict[str, int]):
+        """
+        Ajoute des ressources au village, plafonnées à la capacité de l'entrepôt.
+        Un seul UPDATE relatif; les lignes absentes (types inconnus à la création)
+        sont insérées.
+        """
+        amounts = _positive_amounts(amounts)
+        if not amounts:
+            return
+
+        resources = Resource.__table__
+        capacity = (
+            select(Village.warehouse_capacity)
+            .where(Village.id == village_id)
+            .scalar_subquery()
+        )
+        new_quantity = resources.c.quantity + case(amounts, value=resources.c.resource_type)
+        result = await self.db.execute(
+            update(resources)
+            .where(
+                resources.c.village_id == village_id,
+                resources.c.resource_type.in_(amounts)
+            )
+            .values(quantity=case((new_quantity > capacity, capacity), else_=new_quantity))
+            .returning(resources.c.resource_type)
+        )
+        _mark_written(self.db.sync_session, village_id)
+        credited = set(result.scalars().all())
+
+        missing = {r: amount for r, amount in amounts.items() if r not in credited}
+        if missing:
+            warehouse_capacity = await self._read_capacity(village_id)
+            await self.db.execute(insert(resources), [
+                {
+                    "village_id": village_id,
+                    "resource_type": resource_type,
+                    "quantity": min(amount, warehouse_capacity)
+                }
+                for resource_type, amount in missing.items()
+            ])
+
+    # ============================================================================
+    # MÉTHODES PRIVÉES
+    # ============================================================================
+
+    def _cache_usable(self, village_id: int) -> bool:
+        """Cache actif et stocks non modifiés par la transaction en cours"""
+        return settings.CACHE_ENABLED and village_id not in self.db.info.get(_WRITTEN_KEY, ())
+
+    async def _get_snapshot(self, village_id: int) -> Optional[Tuple[Dict[str, int], int]]:
+        """
+        Stocks projetés à maintenant et capacité, depuis l'instantané en cache
+        (chargé en trois lectures, sans matérialisation, s'il est absent)
+
+        Returns:
+            (stocks, capacité), None si le village n'existe pas
+        """
+        snapshot = _stock_cache.get(village_id)
+        if snapshot is None:
+            capacity = await self._read_capacity(village_id)
+            if capacity is None:
+                return None
+            stock = await self._read_stock(village_id)
+            producers = await ProductionService(self.db).get_producers(village_id)
+            snapshot = (stock, capacity, producers)
+            _stock_cache.set(village_id, snapshot)
+
+        stock, capacity, producers = snapshot
+        return project_production(stock, capacity, producers, datetime.utcnow()), capacity
+
+    async def _read_stock(self, village_id: int) -> Dict[str, int]:
+        result = await self.db.execute(
+            select(Resource.resource_type, Resource.quantity)
+            .where(Resource.village_id == village_id)
+        )
+        return dict(result.all())
+
+    async def _read_capacity(self, village_id: int) -> Optional[int]:
+        result = await self.db.execute(
+            select(Village.warehouse_capacity).where(Village.id == village_id)
+        )
+        return result.scalar_one_or_none()
@@ -3,14 +3,63 @@ Service métier pour la gestion des utilisateurs.
 Gère les opérations CRUD et la logique métier liée aux comptes utilisateurs.
 """
 
+from itertools import chain
 from typing import Optional
 from datetime import datetime
-from sqlalchemy import select
+from sqlalchemy import select, event
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, lazyload, make_transient_to_detached
 
+from backend.app.config import settings
 from backend.app.models.user import User
 from backend.app.schemas.user import UserUpdate, UserResponse
-from backend.app.utils.auth import get_password_hash
+from backend.app.utils.auth import get_password_hash_async
+from backend.app.utils.cache import TTLCache
+from backend.app.services.village_service import invalidate_village_cache
+
+
+# Colonnes des utilisateurs authentifiés, par user_id (inter-requêtes, si CACHE_ENABLED)
+_user_cache = TTLCache(ttl_seconds=settings.CACHE_TTL)
+_USER_COLUMNS = tuple(column.key for column in User.__mapper__.column_attrs)
+
+
+_WRITTEN_KEY = "users_written"
+_DELETED_KEY = "users_deleted"
+
+
+def invalidate_user_cache(user_id: int):
+    """Oublie l'utilisateur en cache."""
+    _user_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_user_changes(session: Session, flush_context):
+    """
+    Note les comptes modifiés par la transaction: leur cache n'est invalidé
+    qu'au commit (une lecture concurrente avant le commit rechargerait sinon
+    l'ancienne ligne pour CACHE_TTL).
+    """
+    for obj in chain(session.dirty, session.deleted):
+        if isinstance(obj, User) and obj.id is not None:
+            session.info.setdefault(_WRITTEN_KEY, set()).add(obj.id)
+    # Compte supprimé: son village (supprimé en cascade) est aussi oublié
+    for obj in session.deleted:
+        if isinstance(obj, User) and obj.id is not None:
+            session.info.setdefault(_DELETED_KEY, set()).add(obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session):
+    for user_id in session.info.pop(_WRITTEN_KEY, ()):
+        invalidate_user_cache(user_id)
+    for user_id in session.info.pop(_DELETED_KEY, ()):
+        invalidate_village_cache(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _invalidate_rolled_back(session: Session):
+    for user_id in session.info.get(_WRITTEN_KEY, ()):
+        invalidate_user_cache(user_id)
 
 
 class UserService:
@@ -40,6 +89,39 @@ class UserService:
         )
         return result.scalar_one_or_none()
     
+    async def get_authenticated_user(self, user_id: int) -> Optional[User]:
+        """
+        Récupère l'utilisateur d'une requête authentifiée.
+        
+        Seules les colonnes sont chargées (les relations le seront à la demande
+        par les services). Avec CACHE_ENABLED, elles sont servies depuis le
+        cache mémoire et l'instance est rattachée à la session sans requête.
+        
+        Args:
+            user_id: Identifiant issu du token
+            
+        Returns:
+            User si trouvé, None sinon
+        """
+        if settings.CACHE_ENABLED:
+            columns = _user_cache.get(user_id)
+            if columns is not None:
+                user = User(**columns)
+                make_transient_to_detached(user)
+                return await self.db.merge(user, load=False)
+        
+        result = await self.db.execute(
+            select(User)
+            .where(User.id == user_id)
+            .options(lazyload(User.villages), lazyload(User.characters))
+        )
+        user = result.scalar_one_or_none()
+        
+        if user and settings.CACHE_ENABLED:
+            _user_cache.set(user_id, {key: getattr(user, key) for key in _USER_COLUMNS})
+        
+        return user
+    
     async def get_user_by_username(self, username: str) -> Optional[User]:
         """
         Récupère un utilisateur par son nom d'utilisateur
@@ -86,20 +168,13 @@ class UserService:
             User mis à jour si trouvé, None sinon
             
         Raises:
-            ValueError: Si le nouveau username/email est déjà utilisé
+            ValueError: Si le nouvel email est déjà utilisé
         """
         # Récupérer l'utilisateur
         user = await self.get_user_by_id(user_id)
         if not user:
             return None
         
-        # Vérifier l'unicité du username si modification
-        if user_update.username and user_update.username != user.username:
-            existing = await self.get_user_by_username(user_update.username)
-            if existing:
-                raise ValueError(f"Le nom d'utilisateur '{user_update.username}' est déjà utilisé")
-            user.username = user_update.username
-        
         # Vérifier l'unicité de l'email si modification
         if user_update.email and user_update.email != user.email:
             existing = await self.get_user_by_email(user_update.email)
@@ -109,11 +184,10 @@ class UserService:
         
         # Mettre à jour le mot de passe si fourni
         if user_update.password:
-            user.hashed_password = get_password_hash(user_update.password)
+            user.password_hash = await get_password_hash_async(user_update.password)
         
         # Sauvegarder
-        await self.db.commit()
-        await self.db.refresh(user)
+        await self.db.flush()
         
         return user
     
@@ -127,7 +201,7 @@ class UserService:
         user = await self.get_user_by_id(user_id)
         if user:
             user.last_login = datetime.utcnow()
-            await self.db.commit()
+            await self.db.flush()
     
     async def delete_user(self, user_id: int) -> bool:
         """
@@ -147,7 +221,7 @@ class UserService:
             return False
         
         await self.db.delete(user)
-        await self.db.commit()
+        await self.db.flush()
         
         return True
     
@@ -166,8 +240,7 @@ class UserService:
             return None
         
         user.is_active = False
-        await self.db.commit()
-        await self.db.refresh(user)
+        await self.db.flush()
         
         return user
     
@@ -186,8 +259,7 @@ class UserService:
             return None
         
         user.is_active = True
-        await self.db.commit()
-        await self.db.refresh(user)
+        await self.db.flush()
         
         return user
     
@@ -5,14 +5,31 @@ Gère la création, les ressources, la production et les statistiques des villag
 
 from typing import Optional, Dict, Any
 from datetime import datetime
-from sqlalchemy import select
+from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.app.config import settings
 from backend.app.models.village import Village
-from backend.app.models.resource import Resource
 from backend.app.models.building_instance import BuildingInstance
 from backend.app.models.character import Character
+from backend.app.models.mission import Mission
 from backend.app.schemas.village import VillageCreate, VillageStats
+from backend.app.schemas.resource import ResourceInventory
+from backend.app.services.resource_service import ResourceService
+from backend.app.services.research_service import ResearchService
+from backend.app.utils.cache import TTLCache
+from backend.app.utils.constants import ResourceType
+
+
+# Cache user_id → village_id (l'ID du village d'un utilisateur ne change pas),
+# actif si CACHE_ENABLED. Complété par un mémo par session (une résolution par requête).
+_village_id_cache = TTLCache(ttl_seconds=settings.CACHE_TTL)
+_SESSION_MEMO_KEY = "village_ids_by_user"
+
+
+def invalidate_village_cache(user_id: int):
+    """Oublie le village en cache d'un utilisateur (suppression du compte/village)."""
+    _village_id_cache.invalidate(user_id)
 
 
 class VillageService:
@@ -40,58 +57,24 @@ class VillageService:
             village_data: Données de création du village
             
         Returns:
-            Village créé avec ressources de départ
+            Village créé avec ressources de départ et arbre de recherches
             
         Note:
-            - Création automatique des ressources de départ
-            - Capacité stockage initiale : 1000 par ressource
-            - Ressources de départ : 200 Eau, 150 Bois, 100 Pierre, 50 Nourriture
+            - Une ligne de stock par type de ressource (STARTING_RESOURCES, 0 sinon)
+            - Une ligne par recherche de RESEARCH_TREE (INSERT groupé)
+            - Capacité de l'entrepôt initiale : 1000
         """
-        # Créer le village
         village = Village(
             user_id=user_id,
             name=village_data.name,
-            level=1,
-            prestige_cycle=0
+            description=village_data.description
         )
         
         self.db.add(village)
         await self.db.flush()  # Pour obtenir l'ID du village
         
-        # Ressources de départ (conformément au projet)
-        initial_resources = {
-            "water": 200,      # Eau
-            "wood": 150,       # Bois
-            "stone": 100,      # Pierre
-            "food": 50,        # Nourriture
-            "wheat": 0,
-            "meat": 0,
-            "fabric": 0,
-            "leather": 0,
-            "herbs": 0,
-            "books": 0,
-            "money": 100,      # Argent de départ
-            "seeds": 20,
-            "tools": 5,
-            "cotton": 0,
-            "linen": 0,
-            "paper": 0,
-            "ink": 0,
-            "rare_ore": 0,
-            "knowledge_points": 0,
-            "survival_kits": 0
-        }
-        
-        # Créer l'entrée Resource
-        resource = Resource(
-            village_id=village.id,
-            **initial_resources,
-            max_capacity=1000  # Capacité de base sans Entrepôt
-        )
-        
-        self.db.add(resource)
-        await self.db.commit()
-        await self.db.refresh(village)
+        await ResourceService(self.db).initialize_village_resources(village.id)
+        await ResearchService(self.db).initialize_village_researches(village.id)
         
         return village
     
@@ -119,72 +102,110 @@ class VillageService:
             
         Returns:
             Village si trouvé, None sinon
+            
+        Note:
+            Résolu une fois par session: les appels suivants (autres services
+            de la même requête) lisent la carte d'identité sans requête SQL.
         """
+        village_id = self._known_village_id(user_id)
+        if village_id is not None:
+            village = await self.db.get(Village, village_id)
+            if village is not None:
+                return village
+            invalidate_village_cache(user_id)
+        
         result = await self.db.execute(
             select(Village).where(Village.user_id == user_id)
         )
-        return result.scalar_one_or_none()
+        village = result.scalar_one_or_none()
+        if village is not None:
+            self._remember_village_id(user_id, village.id)
+        return village
     
-    async def get_village_resources(self, village_id: int) -> Optional[Resource]:
+    async def get_village_id_by_user_id(self, user_id: int) -> Optional[int]:
         """
-        Récupère les ressources d'un village
+        Récupère uniquement l'ID du village d'un utilisateur (filtres des autres services)
         
         Args:
-            village_id: Identifiant du village
+            user_id: Identifiant de l'utilisateur
             
         Returns:
-            Resource si trouvé, None sinon
+            ID du village si trouvé, None sinon (aucune requête si déjà résolu)
         """
+        village_id = self._known_village_id(user_id)
+        if village_id is not None:
+            return village_id
+        
         result = await self.db.execute(
-            select(Resource).where(Resource.village_id == village_id)
+            select(Village.id).where(Village.user_id == user_id)
         )
-        return result.scalar_one_or_none()
+        village_id = result.scalar_one_or_none()
+        if village_id is not None:
+            self._remember_village_id(user_id, village_id)
+        return village_id
+    
+    def _known_village_id(self, user_id: int) -> Optional[int]:
+        """ID du village déjà résolu (mémo de session, puis cache TTL)"""
+        village_id = self.db.info.get(_SESSION_MEMO_KEY, {}).get(user_id)
+        if village_id is None and settings.CACHE_ENABLED:
+            village_id = _village_id_cache.get(user_id)
+        return village_id
+    
+    def _remember_village_id(self, user_id: int, village_id: int):
+        """Mémorise l'ID du village pour la session (et le cache TTL si activé)"""
+        self.db.info.setdefault(_SESSION_MEMO_KEY, {})[user_id] = village_id
+        if settings.CACHE_ENABLED:
+            _village_id_cache.set(user_id, village_id)
+    
+    async def get_village_resources(self, village_id: int) -> Optional[ResourceInventory]:
+        """
+        Récupère l'inventaire des ressources d'un village
+        
+        Args:
+            village_id: Identifiant du village
+            
+        Returns:
+            ResourceInventory si trouvé, None sinon
+            
+        Note:
+            La production écoulée depuis la dernière comptabilisation
+            est matérialisée avant lecture
+        """
+        return await ResourceService(self.db).get_inventory(village_id)
     
     async def update_resources(
         self, 
         village_id: int, 
         resource_deltas: Dict[str, int]
-    ) -> Optional[Resource]:
+    ) -> Optional[ResourceInventory]:
         """
         Met à jour les ressources d'un village (ajout/retrait)
         
         Args:
             village_id: Identifiant du village
-            resource_deltas: Dictionnaire {resource_name: delta_quantity}
-                            delta positif = ajout, négatif = retrait
+            resource_deltas: Dictionnaire {resource_type: delta_quantity}
+                            delta positif = ajout (plafonné à l'entrepôt), négatif = retrait
             
         Returns:
-            Resource mis à jour, None si village non trouvé
+            ResourceInventory mis à jour, None si village non trouvé
             
         Raises:
-            ValueError: Si ressource insuffisante pour un retrait
+            ValueError: Si ressource insuffisante pour un retrait (rien n'est retiré)
         """
-        resource = await self.get_village_resources(village_id)
-        if not resource:
-            return None
+        ledger = ResourceService(self.db)
         
-        # Appliquer les deltas
-        for resource_name, delta in resource_deltas.items():
-            current_value = getattr(resource, resource_name, 0)
-            new_value = current_value + delta
-            
-            # Vérifier qu'on ne descend pas en négatif
-            if new_value < 0:
-                raise ValueError(
-                    f"Ressource insuffisante: {resource_name} "
-                    f"(actuel: {current_value}, requis: {abs(delta)})"
-                )
-            
-            # Appliquer le cap de stockage
-            if new_value > resource.max_capacity:
-                new_value = resource.max_capacity
-            
-            setattr(resource, resource_name, new_value)
+        missing = await ledger.try_spend(
+            village_id, {r: -delta for r, delta in resource_deltas.items() if delta < 0}
+        )
+        if missing:
+            raise ValueError(
+                "Ressource insuffisante: "
+                + ", ".join(f"{r} (manque: {amount})" for r, amount in missing.items())
+            )
         
-        await self.db.commit()
-        await self.db.refresh(resource)
+        await ledger.add(village_id, {r: delta for r, delta in resource_deltas.items() if delta > 0})
         
-        return resource
+        return await ledger.get_inventory(village_id)
     
     async def calculate_production(self, village_id: int) -> Dict[str, int]:
         """
@@ -233,49 +254,32 @@ class VillageService:
         if not village:
             return None
         
-        # Compter les bâtiments
-        buildings_result = await self.db.execute(
-            select(BuildingInstance).where(BuildingInstance.village_id == village_id)
-        )
-        buildings_count = len(buildings_result.scalars().all())
-        
-        # Compter les PNJ
-        characters_result = await self.db.execute(
-            select(Character).where(Character.village_id == village_id)
+        counts = await self.db.execute(
+            select(
+                select(func.count(BuildingInstance.id))
+                .where(BuildingInstance.village_id == village_id)
+                .scalar_subquery(),
+                select(func.count(Character.id))
+                .where(Character.village_id == village_id)
+                .scalar_subquery(),
+                select(func.count(Mission.id))
+                .where(Mission.village_id == village_id)
+                .scalar_subquery()
+            )
         )
-        npcs = characters_result.scalars().all()
-        npcs_count = len(npcs)
-        
-        # Calculer population max (2 PNJ par niveau de Maison)
-        # TODO: Calculer depuis les bâtiments Maison réels
-        max_population = 10  # Par défaut
-        
-        # Récupérer les ressources
-        resources = await self.get_village_resources(village_id)
-        
-        # Calculer production
-        production_rates = await self.calculate_production(village_id)
-        
-        stats = VillageStats(
-            village_id=village.id,
-            name=village.name,
-            level=village.level,
-            prestige_cycle=village.prestige_cycle,
-            population=npcs_count,
-            max_population=max_population,
-            buildings_count=buildings_count,
-            resources={
-                "water": resources.water if resources else 0,
-                "wood": resources.wood if resources else 0,
-                "stone": resources.stone if resources else 0,
-                "food": resources.food if resources else 0,
-                "money": resources.money if resources else 0,
-            },
-            production_rates=production_rates,
-            created_at=village.created_at
+        buildings_count, characters_count, missions_count = counts.one()
+        
+        inventory = await ResourceService(self.db).get_inventory(village_id)
+        
+        return VillageStats(
+            total_characters=characters_count,
+            total_buildings=buildings_count,
+            total_missions=missions_count,
+            total_resources=inventory.warehouse_used,
+            moral=village.moral,
+            warehouse_capacity=inventory.warehouse_capacity,
+            warehouse_used=inventory.warehouse_used
         )
-        
-        return stats
     
     async def update_village_name(
         self, 
@@ -297,8 +301,7 @@ class VillageService:
             return None
         
         village.name = new_name
-        await self.db.commit()
-        await self.db.refresh(village)
+        await self.db.flush()
         
         return village
     
@@ -315,29 +318,30 @@ class VillageService:
             - resources_at_capacity: liste des ressources au max
             - resources_critical: liste des ressources < 20%
         """
-        resources = await self.get_village_resources(village_id)
-        if not resources:
+        inventory = await self.get_village_resources(village_id)
+        if not inventory:
             return {}
         
         at_capacity = []
         critical = []
         
-        resource_fields = [
-            "water", "wood", "stone", "food", "wheat", "meat",
-            "fabric", "leather", "herbs", "books", "money"
+        resource_types = [
+            ResourceType.WATER, ResourceType.WOOD, ResourceType.STONE, ResourceType.FOOD,
+            ResourceType.WHEAT, ResourceType.MEAT, ResourceType.CLOTH, ResourceType.LEATHER,
+            ResourceType.HERB, ResourceType.BOOK, ResourceType.GOLD
         ]
         
-        for field in resource_fields:
-            value = getattr(resources, field, 0)
-            percentage = (value / resources.max_capacity) * 100
+        for resource_type in resource_types:
+            value = inventory.resources.get(resource_type.value, 0)
+            percentage = (value / inventory.warehouse_capacity) * 100
             
             if percentage >= 100:
-                at_capacity.append(field)
+                at_capacity.append(resource_type.value)
             elif percentage < 20:
-                critical.append(field)
+                critical.append(resource_type.value)
         
         return {
-            "max_capacity": resources.max_capacity,
+            "max_capacity": inventory.warehouse_capacity,
             "resources_at_capacity": at_capacity,
             "resources_critical": critical
         }
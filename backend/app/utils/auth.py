@@ -2,6 +2,8 @@
 Utilitaires pour l'authentification JWT et gestion des mots de passe.
 """
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
@@ -11,7 +13,18 @@ from backend.app.config import settings
 
 
 # Configuration du hashage de mots de passe
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
+
+# bcrypt coûte ~250 ms de CPU (12 rounds) et libère le GIL: exécuté dans un pool
+# borné pour ne pas bloquer la boucle asyncio (requêtes et workers)
+_hash_executor = (
+    ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+    if settings.PASSWORD_HASH_WORKERS > 0 else None
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -41,13 +54,47 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def _run_hash(func, *args):
+    """Exécute une opération bcrypt dans le pool dédié (ou directement si désactivé)."""
+    if _hash_executor is None:
+        return func(*args)
+    return await asyncio.get_running_loop().run_in_executor(_hash_executor, func, *args)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Version non bloquante de `verify_password` (pool PASSWORD_HASH_WORKERS).
+    
+    Args:
+        plain_password: Mot de passe en clair
+        hashed_password: Hash du mot de passe
+    
+    Returns:
+        True si le mot de passe correspond, False sinon
+    """
+    return await _run_hash(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Version non bloquante de `get_password_hash` (pool PASSWORD_HASH_WORKERS).
+    
+    Args:
+        password: Mot de passe en clair
+    
+    Returns:
+        Hash du mot de passe
+    """
+    return await _run_hash(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Crée un token JWT.
     
     Args:
         data: Données à encoder dans le token (user_id, username, etc.)
-        expires_delta: Durée de validité du token (défaut: 30 jours)
+        expires_delta: Durée de validité du token (défaut: JWT_EXPIRATION_HOURS)
     
     Returns:
         Token JWT signé
@@ -57,10 +104,10 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(days=settings.ACCESS_TOKEN_EXPIRE_DAYS)
+        expire = datetime.utcnow() + timedelta(hours=settings.JWT_EXPIRATION_HOURS)
     
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
     
     return encoded_jwt
 
@@ -76,7 +123,7 @@ def decode_access_token(token: str) -> Optional[dict]:
         Données contenues dans le token, ou None si invalide
     """
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
         return payload
     except JWTError:
         return None
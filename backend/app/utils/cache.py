@@ -0,0 +1,54 @@
+"""
+Cache mémoire LRU avec expiration (TTL), local au processus.
+Utilisé pour les résolutions fréquentes et peu changeantes (ex: village d'un utilisateur).
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """Cache clé → valeur borné en taille (LRU) dont les entrées expirent après `ttl_seconds`."""
+
+    def __init__(self, ttl_seconds: float, max_size: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Retourne la valeur en cache, ou None si absente ou expirée."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None):
+        """
+        Ajoute (ou remplace) une entrée, en évinçant la moins récemment utilisée si plein.
+        `ttl_seconds` permet une durée de vie plus courte que celle du cache.
+        """
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        """Supprime une entrée (sans effet si absente)."""
+        self._entries.pop(key, None)
+
+    def clear(self):
+        """Vide le cache."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
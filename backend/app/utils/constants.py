@@ -3,6 +3,7 @@ Constantes du jeu Loots&Live.
 Toutes les données statiques, énumérations et configurations de gameplay.
 """
 
+import math
 from enum import Enum
 
 
@@ -385,16 +386,41 @@ RESOURCE_WEIGHTS = {
     ResourceType.ANCIENT_RELIC: 1,
 }
 
+# Ressources de départ d'un nouveau village (les autres types commencent à 0)
+STARTING_RESOURCES = {
+    ResourceType.WATER: 200,
+    ResourceType.WOOD: 150,
+    ResourceType.STONE: 100,
+    ResourceType.FOOD: 50,
+    ResourceType.GOLD: 100,
+    ResourceType.SEEDS: 20,
+    ResourceType.TOOLS: 5,
+}
+
 # Formule XP par niveau
 def calculate_xp_for_level(level: int) -> int:
     """Calcule l'XP requise pour atteindre un niveau (formule exponentielle)"""
     return 100 * (level ** 2)
 
+def calculate_level_for_xp(xp: int) -> int:
+    """Calcule le niveau le plus haut atteint avec `xp` (inverse de calculate_xp_for_level)"""
+    return math.isqrt(max(xp, 0) // 100)
+
 # PV maximum par niveau
 def calculate_max_hp(level: int, endurance: int) -> int:
     """Calcule les PV max d'un PNJ"""
     return 100 + (endurance * 10)
 
+# Régénération des PV hors mission: 1% des PV max (minimum 1) toutes les 10 minutes, en continu
+def calculate_hp_regen_per_hour(max_hp: int) -> int:
+    """Calcule les PV régénérés par heure d'un PNJ vivant hors mission"""
+    return 6 * max(1, int(max_hp * 0.01))
+
+# Production horaire d'un bâtiment
+def calculate_building_production(base_amount: int, level: int, assigned_npcs: int = 0) -> int:
+    """Calcule la production horaire d'un bâtiment (base × niveau × (1 + 0.1 × nb_PNJ))"""
+    return int(base_amount * level * (1 + 0.1 * assigned_npcs))
+
 # Slots d'équipement disponibles
 DEFAULT_EQUIPMENT_SLOTS = [
     EquipmentSlot.HEAD,
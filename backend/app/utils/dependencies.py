@@ -2,42 +2,56 @@
 Dépendances FastAPI pour l'authentification et les sessions.
 """
 
+import time
 from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
-from backend.app.database import get_db
+from backend.app.config import settings
+from backend.app.database import get_db, get_read_db
 from backend.app.models.user import User
+from backend.app.services.user_service import UserService
+from backend.app.services.village_service import VillageService
 from backend.app.utils.auth import verify_token
+from backend.app.utils.cache import TTLCache
 
 
 # Schéma de sécurité Bearer Token
 security = HTTPBearer()
 
+# Tokens déjà vérifiés → payload (si CACHE_ENABLED), jusqu'à leur expiration au plus tard
+_token_cache = TTLCache(ttl_seconds=settings.CACHE_TTL)
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db)
-) -> User:
+
+def _verify_token_cached(token: str) -> Optional[dict]:
+    """Vérifie le token JWT, en réutilisant le résultat d'une vérification récente."""
+    if not settings.CACHE_ENABLED:
+        return verify_token(token)
+
+    payload = _token_cache.get(token)
+    if payload is not None:
+        return payload
+
+    payload = verify_token(token)
+    if payload is not None:
+        remaining = payload.get("exp", time.time() + settings.CACHE_TTL) - time.time()
+        _token_cache.set(token, payload, ttl_seconds=remaining)
+
+    return payload
+
+
+async def _authenticate(credentials: HTTPAuthorizationCredentials, db: AsyncSession) -> User:
     """
-    Dépendance FastAPI pour obtenir l'utilisateur courant depuis le token JWT.
-    
-    Args:
-        credentials: Token d'authentification (Bearer)
-        db: Session de base de données
-    
-    Returns:
-        User: Utilisateur authentifié
+    Résout l'utilisateur authentifié par le token JWT via la session `db`.
     
     Raises:
         HTTPException: Si le token est invalide ou l'utilisateur n'existe pas
     """
     token = credentials.credentials
     
-    # Vérifier et décoder le token
-    payload = verify_token(token)
+    # Vérifier et décoder le token (résultat mis en cache jusqu'à son expiration)
+    payload = _verify_token_cached(token)
     
     if payload is None:
         raise HTTPException(
@@ -55,9 +69,8 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Récupérer l'utilisateur depuis la base de données
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    # Récupérer l'utilisateur (cache mémoire ou base de données)
+    user = await UserService(db).get_authenticated_user(user_id)
     
     if user is None:
         raise HTTPException(
@@ -69,6 +82,38 @@ async def get_current_user(
     return user
 
 
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db, scope="function")
+) -> User:
+    """
+    Dépendance FastAPI pour obtenir l'utilisateur courant depuis le token JWT.
+    À utiliser sur les routes qui écrivent (même session que le handler).
+    
+    Args:
+        credentials: Token d'authentification (Bearer)
+        db: Session de base de données
+    
+    Returns:
+        User: Utilisateur authentifié
+    
+    Raises:
+        HTTPException: Si le token est invalide ou l'utilisateur n'existe pas
+    """
+    return await _authenticate(credentials, db)
+
+
+async def get_current_user_read(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_read_db)
+) -> User:
+    """
+    Variante de get_current_user pour les routes en lecture seule:
+    l'utilisateur est résolu via la session `mode=ro` (get_read_db).
+    """
+    return await _authenticate(credentials, db)
+
+
 async def get_current_active_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
@@ -87,9 +132,56 @@ async def get_current_active_user(
     return current_user
 
 
+async def get_current_active_user_read(
+    current_user: User = Depends(get_current_user_read)
+) -> User:
+    """Variante de get_current_active_user pour les routes en lecture seule."""
+    return current_user
+
+
+async def _resolve_village_id(current_user: User, db: AsyncSession) -> int:
+    """ID du village de `current_user` (404 s'il n'en a pas)."""
+    village_id = await VillageService(db).get_village_id_by_user_id(current_user.id)
+    
+    if village_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Village non trouvé"
+        )
+    
+    return village_id
+
+
+async def get_current_village_id(
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db, scope="function")
+) -> int:
+    """
+    Dépendance FastAPI: ID du village de l'utilisateur courant.
+    Résolu une seule fois par requête (FastAPI réutilise le résultat pour
+    toutes les dépendances qui le demandent), via le mémo de session et le
+    cache TTL de VillageService.
+    
+    Returns:
+        int: ID du village
+    
+    Raises:
+        HTTPException: 404 si l'utilisateur n'a pas de village
+    """
+    return await _resolve_village_id(current_user, db)
+
+
+async def get_current_village_id_read(
+    current_user: User = Depends(get_current_active_user_read),
+    db: AsyncSession = Depends(get_read_db)
+) -> int:
+    """Variante de get_current_village_id pour les routes en lecture seule."""
+    return await _resolve_village_id(current_user, db)
+
+
 async def get_optional_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Optional[User]:
     """
     Dépendance pour obtenir l'utilisateur courant si authentifié, None sinon.
@@ -106,6 +198,6 @@ async def get_optional_user(
         return None
     
     try:
-        return await get_current_user(credentials, db)
+        return await _authenticate(credentials, db)
     except HTTPException:
         return None
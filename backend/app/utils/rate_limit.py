@@ -0,0 +1,123 @@
+"""
+Limitation de débit (fenêtre glissante) pour les tentatives de connexion.
+
+Le compteur est une fenêtre glissante approchée: seuls le compte de la
+fenêtre fixe courante et celui de la précédente sont conservés (mémoire O(1)
+par clé), le précédent étant pondéré par sa part encore couverte par la
+fenêtre glissante.
+
+Le stockage est délégué à un backend (`RateLimitBackend`): le backend mémoire
+suffit pour un processus unique; un store partagé (Redis...) peut être branché
+via `login_rate_limiter.backend` pour limiter sur plusieurs processus.
+"""
+
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from backend.app.config import settings
+
+
+class RateLimitBackend(ABC):
+    """Interface de stockage des compteurs de débit."""
+
+    @abstractmethod
+    async def hit(self, key: str, limit: int, window_seconds: float) -> Tuple[bool, float]:
+        """
+        Comptabilise une tentative pour `key` si la limite n'est pas atteinte.
+
+        Returns:
+            (autorisée, secondes avant la prochaine tentative autorisée)
+        """
+
+    @abstractmethod
+    async def reset(self, key: str):
+        """Remet le compteur de `key` à zéro."""
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """Compteurs en mémoire du processus, évincés par ancienneté d'utilisation (LRU)."""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        # clé → [début de la fenêtre courante, compte courant, compte précédent]
+        self._windows: "OrderedDict[str, list]" = OrderedDict()
+
+    async def hit(self, key: str, limit: int, window_seconds: float) -> Tuple[bool, float]:
+        now = time.monotonic()
+        window_start = math.floor(now / window_seconds) * window_seconds
+
+        window = self._windows.get(key)
+        if window is None:
+            window = [window_start, 0, 0]
+            self._windows[key] = window
+        elif window[0] != window_start:
+            # Fenêtre suivante: le compte courant devient le précédent (ou expire)
+            previous = window[1] if window[0] == window_start - window_seconds else 0
+            window[:] = [window_start, 0, previous]
+        self._windows.move_to_end(key)
+
+        while len(self._windows) > self.max_keys:
+            self._windows.popitem(last=False)
+
+        _, current, previous = window
+        elapsed_ratio = (now - window_start) / window_seconds
+        if previous * (1 - elapsed_ratio) + current < limit:
+            window[1] += 1
+            return True, 0.0
+
+        # Instant où la part restante de la fenêtre précédente repasse sous la limite
+        if current >= limit or previous == 0:
+            retry_at = window_start + window_seconds
+        else:
+            retry_at = window_start + window_seconds * (1 - (limit - current) / previous)
+        return False, max(retry_at - now, 0.0)
+
+    async def reset(self, key: str):
+        self._windows.pop(key, None)
+
+
+class LoginRateLimiter:
+    """Limite les tentatives de connexion par couple (nom d'utilisateur, IP)."""
+
+    def __init__(self, backend: RateLimitBackend, attempts: int, window_minutes: int):
+        self.backend = backend
+        self.attempts = attempts
+        self.window_seconds = window_minutes * 60
+
+    @staticmethod
+    def _key(username: str, client_ip: Optional[str]) -> str:
+        return f"login:{username.lower()}:{client_ip or 'unknown'}"
+
+    async def check(self, username: str, client_ip: Optional[str]):
+        """
+        Comptabilise une tentative de connexion.
+
+        Raises:
+            HTTPException: 429 si la limite est atteinte (en-tête Retry-After)
+        """
+        allowed, retry_after = await self.backend.hit(
+            self._key(username, client_ip), self.attempts, self.window_seconds
+        )
+        if not allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Trop de tentatives de connexion, réessayez plus tard",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+    async def reset(self, username: str, client_ip: Optional[str]):
+        """Oublie les tentatives après une connexion réussie."""
+        await self.backend.reset(self._key(username, client_ip))
+
+
+# Instance globale du limiteur de connexion
+login_rate_limiter = LoginRateLimiter(
+    MemoryRateLimitBackend(),
+    attempts=settings.RATE_LIMIT_LOGIN_ATTEMPTS,
+    window_minutes=settings.RATE_LIMIT_LOGIN_WINDOW_MINUTES
+)
@@ -0,0 +1,234 @@
+"""
+Index précompilé de l'arbre technologique (RESEARCH_TREE), construit au démarrage.
+
+- ordre topologique des recherches (prérequis avant dépendants); une clé de
+  prérequis inconnue ou un cycle lève une ValueError à l'import
+- un bit par recherche (son rang dans l'ordre topologique) et, pour chacune,
+  le masque de ses prérequis: une vérification est une opération sur entiers
+- liste d'adjacence inverse: compléter une recherche n'examine que ses
+  dépendants directs
+
+`ResearchState` est l'état compact des recherches d'un village exprimé sur
+ces bits (persisté sur le village, cf. ResearchService.get_research_state).
+`research_bonuses` agrège les effets des recherches complétées, mémoïsé par
+bitset: le vecteur d'un village ne change que lorsque complete_research
+modifie son bitset, sans invalidation à gérer.
+"""
+
+import hashlib
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+from backend.app.utils.constants import RESEARCH_TREE, ResearchCategory, ResearchStatus
+
+
+class ResearchTreeIndex:
+    """Graphe orienté acyclique des prérequis de recherches, en bitsets."""
+
+    def __init__(self, tree: Dict[str, Dict[str, Any]]):
+        self.prerequisites: Dict[str, FrozenSet[str]] = {
+            key: frozenset(data.get("prerequisites", []))
+            for key, data in tree.items()
+        }
+
+        dependents: Dict[str, List[str]] = {key: [] for key in tree}
+        for key, prerequisites in self.prerequisites.items():
+            for prerequisite in prerequisites:
+                if prerequisite not in tree:
+                    raise ValueError(f"Prérequis inconnu '{prerequisite}' pour la recherche '{key}'")
+                dependents[prerequisite].append(key)
+        self.dependents: Dict[str, Tuple[str, ...]] = {
+            key: tuple(children) for key, children in dependents.items()
+        }
+
+        self.order: Tuple[str, ...] = self._topological_order()
+        self.bit: Dict[str, int] = {key: 1 << rank for rank, key in enumerate(self.order)}
+        self.prerequisite_mask: Dict[str, int] = {
+            key: self.mask(prerequisites) for key, prerequisites in self.prerequisites.items()
+        }
+        self.roots: Tuple[str, ...] = tuple(key for key in self.order if not self.prerequisites[key])
+        # Empreinte de la numérotation des bits: un bitset persisté sous une autre
+        # empreinte (arbre modifié) est recalculé depuis les lignes researches
+        self.fingerprint: str = hashlib.sha1(",".join(self.order).encode()).hexdigest()[:16]
+
+        by_category: Dict[ResearchCategory, List[str]] = {}
+        for key in self.order:
+            by_category.setdefault(ResearchCategory(tree[key]["category"]), []).append(key)
+        self.by_category: Dict[ResearchCategory, Tuple[str, ...]] = {
+            category: tuple(keys) for category, keys in by_category.items()
+        }
+
+    def _topological_order(self) -> Tuple[str, ...]:
+        """Algorithme de Kahn, stable selon l'ordre de déclaration de l'arbre"""
+        remaining = {key: len(prerequisites) for key, prerequisites in self.prerequisites.items()}
+        ready = [key for key, count in remaining.items() if count == 0]
+        order = []
+
+        while ready:
+            key = ready.pop(0)
+            order.append(key)
+            for child in self.dependents[key]:
+                remaining[child] -= 1
+                if remaining[child] == 0:
+                    ready.append(child)
+
+        if len(order) != len(self.prerequisites):
+            cycle = sorted(key for key, count in remaining.items() if count > 0)
+            raise ValueError(f"Cycle dans l'arbre technologique: {', '.join(cycle)}")
+        return tuple(order)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.bit
+
+    def mask(self, keys: Iterable[str]) -> int:
+        """Bitset des recherches `keys` (clés inconnues ignorées)"""
+        mask = 0
+        for key in keys:
+            mask |= self.bit.get(key, 0)
+        return mask
+
+    def keys(self, mask: int) -> List[str]:
+        """Clés des recherches présentes dans `mask`, dans l'ordre topologique"""
+        return [key for key in self.order if mask & self.bit[key]]
+
+    def is_unlocked(self, key: str, completed_mask: int) -> bool:
+        """Tous les prérequis de `key` sont-ils dans `completed_mask` ?"""
+        return self.prerequisite_mask[key] & ~completed_mask == 0
+
+    def missing_prerequisites(self, key: str, completed_mask: int) -> List[str]:
+        """Prérequis de `key` absents de `completed_mask`"""
+        return self.keys(self.prerequisite_mask[key] & ~completed_mask)
+
+    def available_mask(self, completed_mask: int) -> int:
+        """Recherches non complétées dont tous les prérequis sont dans `completed_mask`"""
+        mask = 0
+        for key in self.order:
+            bit = self.bit[key]
+            if not completed_mask & bit and self.prerequisite_mask[key] & ~completed_mask == 0:
+                mask |= bit
+        return mask
+
+    def newly_unlocked(self, completed_key: str, completed_mask: int) -> List[str]:
+        """
+        Dépendants directs de `completed_key` dont tous les prérequis sont complétés
+        (`completed_mask` inclut `completed_key`)
+        """
+        return [
+            child for child in self.dependents.get(completed_key, ())
+            if self.is_unlocked(child, completed_mask)
+        ]
+
+
+# Index global, compilé à l'import
+research_index = ResearchTreeIndex(RESEARCH_TREE)
+
+# Les bitsets sont persistés en BIGINT signé
+if len(research_index.order) > 63:
+    raise ValueError("RESEARCH_TREE dépasse 63 recherches: bitset persistant trop petit")
+
+
+class ResearchState:
+    """
+    État des recherches d'un village: bitset des recherches complétées et
+    emplacement unique de la recherche en cours. Les recherches disponibles
+    s'en déduisent (prérequis complétés, ni complétées ni en cours).
+    """
+
+    __slots__ = ("completed_mask", "in_progress")
+
+    def __init__(self, completed_mask: int = 0, in_progress: Optional[str] = None):
+        self.completed_mask = completed_mask
+        self.in_progress = in_progress
+
+    @classmethod
+    def from_statuses(cls, statuses: Iterable[Tuple[str, str]]) -> "ResearchState":
+        """Reconstruit l'état depuis des couples (clé, statut) des lignes researches"""
+        state = cls()
+        for key, status in statuses:
+            if status == ResearchStatus.COMPLETED:
+                state.completed_mask |= research_index.bit.get(key, 0)
+            elif status == ResearchStatus.IN_PROGRESS:
+                state.in_progress = key
+        return state
+
+    @property
+    def available_mask(self) -> int:
+        mask = research_index.available_mask(self.completed_mask)
+        if self.in_progress:
+            mask &= ~research_index.bit.get(self.in_progress, 0)
+        return mask
+
+    def is_completed(self, key: str) -> bool:
+        return bool(self.completed_mask & research_index.bit.get(key, 0))
+
+    def status(self, key: str) -> ResearchStatus:
+        """Statut d'une recherche, sans lecture de sa ligne"""
+        if self.is_completed(key):
+            return ResearchStatus.COMPLETED
+        if key == self.in_progress:
+            return ResearchStatus.IN_PROGRESS
+        if research_index.is_unlocked(key, self.completed_mask):
+            return ResearchStatus.AVAILABLE
+        return ResearchStatus.LOCKED
+
+
+def persisted_completed_mask(mask: Optional[int], version: Optional[str]) -> int:
+    """Bitset persisté sur un village, 0 s'il est absent ou calculé pour un autre arbre"""
+    return mask if mask is not None and version == research_index.fingerprint else 0
+
+
+class ResearchBonusVector(NamedTuple):
+    """Bonus cumulés des recherches complétées (immuable: partagé par le cache)"""
+    production_multiplier: float = 1.0   # Multiplicateur de production
+    mission_success_bonus: int = 0       # Bonus % taux de succès missions
+    construction_speed: float = 1.0      # Vitesse de construction
+    research_speed: float = 1.0          # Vitesse de recherche
+    unlocked_buildings: Tuple[str, ...] = ()
+    unlocked_equipment: Tuple[str, ...] = ()
+    special_abilities: Tuple[str, ...] = ()
+
+
+@lru_cache(maxsize=4096)
+def research_bonuses(completed_mask: int) -> ResearchBonusVector:
+    """Agrège les effets des recherches de `completed_mask` (dans l'ordre topologique)"""
+    production_multiplier = 1.0
+    mission_success_bonus = 0
+    construction_speed = 1.0
+    research_speed = 1.0
+    unlocked_buildings: List[str] = []
+    unlocked_equipment: List[str] = []
+    special_abilities: List[str] = []
+
+    for key in research_index.keys(completed_mask):
+        effects = RESEARCH_TREE[key].get("effects", {})
+
+        if "production_bonus" in effects:
+            production_multiplier += effects["production_bonus"] / 100
+
+        if "mission_success_bonus" in effects:
+            mission_success_bonus += effects["mission_success_bonus"]
+
+        if "construction_speed_bonus" in effects:
+            construction_speed += effects["construction_speed_bonus"] / 100
+
+        if "research_speed_bonus" in effects:
+            research_speed += effects["research_speed_bonus"] / 100
+
+        if "unlocks_buildings" in effects:
+            unlocked_buildings.extend(effects["unlocks_buildings"])
+
+        if "unlocks_equipment" in effects:
+            unlocked_equipment.extend(effects["unlocks_equipment"])
+
+        if "special_ability" in effects:
+            special_abilities.append(effects["special_ability"])
+
+    return ResearchBonusVector(
+        production_multiplier=production_multiplier,
+        mission_success_bonus=mission_success_bonus,
+        construction_speed=construction_speed,
+        research_speed=research_speed,
+        unlocked_buildings=tuple(unlocked_buildings),
+        unlocked_equipment=tuple(unlocked_equipment),
+        special_abilities=tuple(special_abilities)
+    )
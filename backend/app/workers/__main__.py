@@ -0,0 +1,54 @@
+"""
+Processus worker autonome pour Loots&Live.
+Exécute le scheduler des jobs background hors du processus web uvicorn,
+pour isoler la latence des routes de la charge des ticks.
+
+Usage:
+    python -m backend.app.workers
+
+Côté API, définir WORKERS_IN_PROCESS=False pour qu'un seul processus exécute les jobs.
+"""
+
+import asyncio
+import logging
+import signal
+
+from backend.app.database import init_db, close_db
+from backend.app.workers.worker_manager import worker_manager
+
+logger = logging.getLogger(__name__)
+
+
+async def run_worker():
+    """Démarre le scheduler et attend un signal d'arrêt (SIGINT/SIGTERM)."""
+    await init_db()
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except NotImplementedError:
+            # Windows: CTRL+C lève KeyboardInterrupt dans asyncio.run
+            pass
+
+    worker_manager.start()
+    logger.info("👷 Processus worker démarré (CTRL+C pour arrêter)")
+
+    try:
+        await stop_event.wait()
+    finally:
+        worker_manager.stop()
+        await close_db()
+        logger.info("✅ Processus worker arrêté")
+
+
+def main():
+    try:
+        asyncio.run(run_worker())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Scheduler à échéance pour les missions et les recherches.
+File de priorité (tas) en mémoire: chaque complétion est déclenchée à son
+heure exacte au lieu d'être découverte par un balayage minute par minute.
+
+- Amorcé au démarrage (et à chaque réconciliation) depuis les lignes IN_PROGRESS
+- Alimenté par MissionService.start_mission / ResearchService.start_research
+  lorsque le scheduler tourne dans le même processus que l'API
+- Sinon (WORKERS_IN_PROCESS=False), le processus worker relit toutes les
+  WORKER_DUE_POLL_SECONDS les échéances proches (`reload(horizon)`)
+- Le balayage périodique des workers reste en filet de sécurité
+"""
+
+import asyncio
+import heapq
+import logging
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Types d'échéances gérées
+MISSION = "mission"
+RESEARCH = "research"
+
+Handler = Callable[[int], Awaitable[None]]
+Loader = Callable[[Optional[datetime]], Awaitable[List[Tuple[int, datetime]]]]
+
+
+class DueTimeScheduler:
+    """Tas d'échéances (due_at, type, id) consommé par une tâche asyncio."""
+
+    def __init__(self):
+        self._heap: List[Tuple[datetime, str, int]] = []
+        self._due: Dict[Tuple[str, int], datetime] = {}
+        self._handlers: Dict[str, Handler] = {}
+        self._loaders: Dict[str, Loader] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def register(self, kind: str, handler: Handler, loader: Loader):
+        """
+        Enregistre un type d'échéance.
+
+        Args:
+            kind: Type d'échéance (MISSION, RESEARCH)
+            handler: Coroutine appelée avec l'ID à échéance
+            loader: Coroutine retournant les (id, due_at) en cours, échus avant
+                    la date passée en argument (None: toutes les échéances)
+        """
+        self._handlers[kind] = handler
+        self._loaders[kind] = loader
+
+    def schedule(self, kind: str, entity_id: int, due_at: Optional[datetime]):
+        """
+        Programme (ou reprogramme) une échéance.
+        Sans effet si le scheduler ne tourne pas dans ce processus:
+        l'échéance sera alors reprise par la relecture des échéances proches
+        du processus worker.
+        """
+        if not self.is_running or due_at is None:
+            return
+
+        key = (kind, entity_id)
+        if self._due.get(key) == due_at:
+            return
+
+        self._due[key] = due_at
+        heapq.heappush(self._heap, (due_at, kind, entity_id))
+
+        # Réveiller la boucle si cette échéance devient la plus proche
+        if self._heap[0] == (due_at, kind, entity_id):
+            self._wakeup.set()
+
+    def cancel(self, kind: str, entity_id: int):
+        """Annule une échéance (suppression paresseuse dans le tas)."""
+        self._due.pop((kind, entity_id), None)
+
+    def pending_count(self) -> int:
+        """Nombre d'échéances en attente."""
+        return len(self._due)
+
+    async def reload(self, horizon: Optional[timedelta] = None):
+        """
+        (Ré)amorce le tas depuis la base (lignes IN_PROGRESS).
+
+        Args:
+            horizon: Ne relire que les échéances antérieures à maintenant + horizon
+                     (relecture fréquente et légère); None: toutes les échéances
+        """
+        due_before = datetime.utcnow() + horizon if horizon is not None else None
+        for kind, loader in self._loaders.items():
+            try:
+                for entity_id, due_at in await loader(due_before):
+                    self.schedule(kind, entity_id, due_at)
+            except Exception as e:
+                logger.error(f"Erreur amorçage échéances {kind}: {e}")
+
+        logger.debug(f"⏱️ {self.pending_count()} échéance(s) en attente")
+
+    def start(self):
+        """Démarre la boucle de déclenchement (nécessite une boucle asyncio active)."""
+        if self.is_running:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self):
+        """Arrête la boucle et vide le tas."""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        self._heap.clear()
+        self._due.clear()
+
+    async def _run(self):
+        await self.reload()
+
+        while True:
+            self._wakeup.clear()
+
+            timeout = None
+            if self._heap:
+                timeout = max(0.0, (self._heap[0][0] - datetime.utcnow()).total_seconds())
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+            await self._dispatch_due()
+
+    async def _dispatch_due(self):
+        """Déclenche toutes les échéances atteintes."""
+        now = datetime.utcnow()
+
+        while self._heap and self._heap[0][0] <= now:
+            due_at, kind, entity_id = heapq.heappop(self._heap)
+
+            # Entrée périmée (annulée ou reprogrammée)
+            if self._due.get((kind, entity_id)) != due_at:
+                continue
+            del self._due[(kind, entity_id)]
+
+            try:
+                await self._handlers[kind](entity_id)
+            except Exception as e:
+                logger.error(f"Erreur échéance {kind} {entity_id}: {e}")
+
+
+# Instance globale du scheduler à échéance
+due_scheduler = DueTimeScheduler()
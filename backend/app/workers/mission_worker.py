@@ -1,70 +1,114 @@
 """
 Worker pour l'auto-complétion des missions.
-Vérifie toutes les minutes si des missions sont terminées et les complète automatiquement.
+Les missions sont complétées à leur échéance exacte par le scheduler à échéance;
+le balayage périodique rattrape les missions échues manquées (filet de sécurité).
 """
 
+import asyncio
 import logging
 from datetime import datetime
+from typing import List, Optional, Tuple
+from fastapi import HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.app.database import AsyncSessionLocal
 from backend.app.models.mission import Mission, MissionStatus
 from backend.app.services.mission_service import MissionService
+from backend.app.workers.sharding import Shard, shard_filter, shard_label
+from backend.app.write_queue import write_queue
 
 logger = logging.getLogger(__name__)
 
 
-async def auto_complete_missions():
+def _complete_mission_job(mission_id: int):
+    """Job d'écriture complétant une mission (validé par le commit de la file)."""
+    async def complete(db: AsyncSession):
+        # Pas de vérification propriétaire (worker)
+        return await MissionService(db).complete_mission(mission_id=mission_id)
+    return complete
+
+
+async def auto_complete_missions(shard: Optional[Shard] = None):
     """
     Worker qui vérifie toutes les missions IN_PROGRESS.
     Si la durée est écoulée (completed_at passé), complète automatiquement la mission.
+    Les complétions sont soumises ensemble à la file d'écriture (un commit groupé,
+    un SAVEPOINT par mission).
+    
+    Args:
+        shard: (index, nombre de shards) pour ne traiter qu'une partition des villages
     """
-    async with AsyncSessionLocal() as db:
-        try:
+    try:
+        async with AsyncSessionLocal() as db:
             # Récupérer toutes les missions en cours
-            result = await db.execute(
-                select(Mission).where(
-                    Mission.status == MissionStatus.IN_PROGRESS,
-                    Mission.completed_at <= datetime.utcnow()
-                )
+            query = select(Mission.id, Mission.name).where(
+                Mission.status == MissionStatus.IN_PROGRESS,
+                Mission.completed_at <= datetime.utcnow()
             )
-            missions_to_complete = list(result.scalars().all())
-            
-            if not missions_to_complete:
-                logger.debug("Aucune mission à compléter automatiquement")
-                return
-            
-            logger.info(f"🎯 {len(missions_to_complete)} mission(s) à compléter automatiquement")
+            if shard:
+                query = query.where(shard_filter(Mission.village_id, shard))
             
-            # Compléter chaque mission
-            mission_service = MissionService(db)
-            completed_count = 0
-            failed_count = 0
-            
-            for mission in missions_to_complete:
-                try:
-                    # Force completion (pas de vérification durée car déjà vérifié)
-                    completed_mission, error = await mission_service.complete_mission(
-                        mission_id=mission.id,
-                        force=True
-                    )
-                    
-                    if error:
-                        logger.error(f"Erreur complétion mission {mission.id}: {error}")
-                        failed_count += 1
-                    else:
-                        logger.info(f"✅ Mission '{mission.name}' complétée automatiquement")
-                        completed_count += 1
-                
-                except Exception as e:
-                    logger.error(f"Exception complétion mission {mission.id}: {e}")
-                    failed_count += 1
-            
-            logger.info(
-                f"📊 Résumé: {completed_count} complétées, {failed_count} échecs"
-            )
+            result = await db.execute(query)
+            missions_to_complete = result.all()
+        
+        if not missions_to_complete:
+            logger.debug("Aucune mission à compléter automatiquement")
+            return
+        
+        logger.info(f"🎯 {len(missions_to_complete)} mission(s) à compléter automatiquement{shard_label(shard)}")
         
-        except Exception as e:
-            logger.error(f"Erreur worker auto_complete_missions: {e}")
-            raise
+        # Compléter chaque mission
+        results = await asyncio.gather(
+            *(write_queue.submit(_complete_mission_job(mission_id)) for mission_id, _ in missions_to_complete),
+            return_exceptions=True
+        )
+        completed_count = 0
+        failed_count = 0
+        
+        for (mission_id, name), outcome in zip(missions_to_complete, results):
+            if isinstance(outcome, HTTPException):
+                logger.error(f"Erreur complétion mission {mission_id}: {outcome.detail}")
+                failed_count += 1
+            elif isinstance(outcome, Exception):
+                logger.error(f"Exception complétion mission {mission_id}: {outcome}")
+                failed_count += 1
+            else:
+                logger.info(f"✅ Mission '{name}' complétée automatiquement")
+                completed_count += 1
+        
+        logger.info(
+            f"📊 Résumé: {completed_count} complétées, {failed_count} échecs"
+        )
+    
+    except Exception as e:
+        logger.error(f"Erreur worker auto_complete_missions: {e}")
+        raise
+
+
+async def complete_due_mission(mission_id: int):
+    """
+    Complète une mission arrivée à échéance (appelé par le scheduler à échéance).
+    
+    Args:
+        mission_id: ID de la mission échue
+    """
+    try:
+        await write_queue.submit(_complete_mission_job(mission_id))
+        logger.info(f"✅ Mission {mission_id} complétée à échéance")
+    except HTTPException as e:
+        # Mission rappelée ou déjà complétée entre-temps
+        logger.debug(f"Mission {mission_id} non complétée: {e.detail}")
+
+
+async def load_due_missions(due_before: Optional[datetime] = None) -> List[Tuple[int, datetime]]:
+    """Récupère les échéances (id, completed_at) des missions en cours (échues avant `due_before`)."""
+    async with AsyncSessionLocal() as db:
+        query = select(Mission.id, Mission.completed_at).where(
+            Mission.status == MissionStatus.IN_PROGRESS,
+            Mission.completed_at.is_not(None)
+        )
+        if due_before is not None:
+            query = query.where(Mission.completed_at <= due_before)
+        result = await db.execute(query)
+        return [(mission_id, due_at) for mission_id, due_at in result.all()]
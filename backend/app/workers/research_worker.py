@@ -1,10 +1,13 @@
 """
 Worker pour l'auto-complétion des recherches.
-Vérifie toutes les minutes si des recherches sont terminées et les complète automatiquement.
+Les recherches sont complétées à leur échéance exacte par le scheduler à échéance;
+le balayage périodique rattrape les recherches échues manquées (filet de sécurité).
 """
 
+import asyncio
 import logging
 from datetime import datetime
+from typing import List, Optional, Tuple
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -12,60 +15,101 @@ from backend.app.database import AsyncSessionLocal
 from backend.app.models.research import Research
 from backend.app.utils.constants import ResearchStatus
 from backend.app.services.research_service import ResearchService
+from backend.app.workers.sharding import Shard, shard_filter, shard_label
+from backend.app.write_queue import write_queue
 
 logger = logging.getLogger(__name__)
 
 
-async def auto_complete_researches():
+def _complete_research_job(research_id):
+    """Job d'écriture complétant une recherche (validé par le commit de la file)."""
+    async def complete(db: AsyncSession):
+        # Force completion (pas de vérification durée car déjà vérifié)
+        return await ResearchService(db).complete_research(research_id=research_id, force=True)
+    return complete
+
+
+async def auto_complete_researches(shard: Optional[Shard] = None):
     """
     Worker qui vérifie toutes les recherches IN_PROGRESS.
     Si la durée est écoulée (completed_at passé), complète automatiquement la recherche.
+    Les complétions sont soumises ensemble à la file d'écriture (un commit groupé,
+    un SAVEPOINT par recherche).
+    
+    Args:
+        shard: (index, nombre de shards) pour ne traiter qu'une partition des villages
     """
-    async with AsyncSessionLocal() as db:
-        try:
+    try:
+        async with AsyncSessionLocal() as db:
             # Récupérer toutes les recherches en cours
-            result = await db.execute(
-                select(Research).where(
-                    Research.status == ResearchStatus.IN_PROGRESS,
-                    Research.completed_at <= datetime.utcnow()
-                )
+            query = select(Research.id, Research.research_key).where(
+                Research.status == ResearchStatus.IN_PROGRESS,
+                Research.completed_at <= datetime.utcnow()
             )
-            researches_to_complete = list(result.scalars().all())
-            
-            if not researches_to_complete:
-                logger.debug("Aucune recherche à compléter automatiquement")
-                return
-            
-            logger.info(f"🔬 {len(researches_to_complete)} recherche(s) à compléter automatiquement")
+            if shard:
+                query = query.where(shard_filter(Research.village_id, shard))
             
-            # Compléter chaque recherche
-            research_service = ResearchService(db)
-            completed_count = 0
-            failed_count = 0
-            
-            for research in researches_to_complete:
-                try:
-                    # Force completion (pas de vérification durée car déjà vérifié)
-                    completed_research, error = await research_service.complete_research(
-                        research_id=research.id,
-                        force=True
-                    )
-                    
-                    if error:
-                        logger.error(f"Erreur complétion recherche {research.id}: {error}")
-                        failed_count += 1
-                    else:
-                        logger.info(f"✅ Recherche '{research.research_key}' complétée automatiquement")
-                        completed_count += 1
-                
-                except Exception as e:
-                    logger.error(f"Exception complétion recherche {research.id}: {e}")
-                    failed_count += 1
-            
-            logger.info(
-                f"📊 Résumé: {completed_count} complétées, {failed_count} échecs"
-            )
+            result = await db.execute(query)
+            researches_to_complete = result.all()
+        
+        if not researches_to_complete:
+            logger.debug("Aucune recherche à compléter automatiquement")
+            return
+        
+        logger.info(f"🔬 {len(researches_to_complete)} recherche(s) à compléter automatiquement{shard_label(shard)}")
         
-        except Exception as e:
-            logger.error(f"Erreur worker auto_complete_researches: {e}")
-            raise
+        # Compléter chaque recherche
+        results = await asyncio.gather(
+            *(write_queue.submit(_complete_research_job(research_id)) for research_id, _ in researches_to_complete),
+            return_exceptions=True
+        )
+        completed_count = 0
+        failed_count = 0
+        
+        for (research_id, research_key), outcome in zip(researches_to_complete, results):
+            if isinstance(outcome, Exception):
+                logger.error(f"Exception complétion recherche {research_id}: {outcome}")
+                failed_count += 1
+            elif outcome[1]:
+                logger.error(f"Erreur complétion recherche {research_id}: {outcome[1]}")
+                failed_count += 1
+            else:
+                logger.info(f"✅ Recherche '{research_key}' complétée automatiquement")
+                completed_count += 1
+        
+        logger.info(
+            f"📊 Résumé: {completed_count} complétées, {failed_count} échecs"
+        )
+    
+    except Exception as e:
+        logger.error(f"Erreur worker auto_complete_researches: {e}")
+        raise
+
+
+async def complete_due_research(research_id: int):
+    """
+    Complète une recherche arrivée à échéance (appelé par le scheduler à échéance).
+    
+    Args:
+        research_id: ID de la recherche échue
+    """
+    completed_research, error = await write_queue.submit(_complete_research_job(research_id))
+    
+    if error:
+        # Recherche annulée ou déjà complétée entre-temps
+        logger.debug(f"Recherche {research_id} non complétée: {error}")
+    else:
+        logger.info(f"✅ Recherche '{completed_research.research_key}' complétée à échéance")
+
+
+async def load_due_researches(due_before: Optional[datetime] = None) -> List[Tuple[int, datetime]]:
+    """Récupère les échéances (id, completed_at) des recherches en cours (échues avant `due_before`)."""
+    async with AsyncSessionLocal() as db:
+        query = select(Research.id, Research.completed_at).where(
+            Research.status == ResearchStatus.IN_PROGRESS,
+            Research.completed_at.is_not(None)
+        )
+        if due_before is not None:
+            query = query.where(Research.completed_at <= due_before)
+        result = await db.execute(query)
+        return [(research_id, due_at) for research_id, due_at in result.all()]
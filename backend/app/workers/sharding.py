@@ -0,0 +1,77 @@
+"""
+Exécution partitionnée des workers background.
+Les jobs sont découpés par `village_id % N` en shards exécutés en parallèle
+(parallélisme borné): chacun lit sa partition dans sa propre session.
+
+Leurs écritures passent par la file d'écriture (backend.app.write_queue):
+les shards arrivés ensemble sont validés par un même commit groupé, chacun
+dans son SAVEPOINT. L'échec d'un shard n'annule que ses propres écritures,
+mais les shards ne sont plus validés indépendamment les uns des autres.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (index du shard, nombre total de shards)
+Shard = Tuple[int, int]
+
+
+def shard_filter(village_id_column, shard: Shard):
+    """
+    Construit la clause SQL sélectionnant les lignes d'un shard.
+
+    Args:
+        village_id_column: Colonne village_id de la table filtrée
+        shard: (index, nombre de shards)
+    """
+    index, count = shard
+    return village_id_column % count == index
+
+
+def sharded(
+    job: Callable[..., Awaitable[None]],
+    shards: int,
+    max_concurrency: int
+) -> Callable[[], Awaitable[None]]:
+    """
+    Enveloppe un job pour l'exécuter sur `shards` partitions concurrentes.
+
+    Args:
+        job: Coroutine worker acceptant un argument `shard`
+        shards: Nombre de partitions (village_id % shards)
+        max_concurrency: Nombre maximum de shards exécutés simultanément
+
+    Returns:
+        Coroutine sans argument planifiable par APScheduler
+
+    Note:
+        L'échec d'un shard est journalisé sans interrompre les autres.
+    """
+    async def run_shards():
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run_shard(index: int):
+            async with semaphore:
+                await job(shard=(index, shards))
+
+        results = await asyncio.gather(
+            *(run_shard(index) for index in range(shards)),
+            return_exceptions=True
+        )
+
+        for index, result in enumerate(results):
+            if isinstance(result, Exception):
+                logger.error(f"Erreur shard {index}/{shards} du job {job.__name__}: {result}")
+
+    run_shards.__name__ = job.__name__
+    return run_shards
+
+
+def shard_label(shard: Optional[Shard]) -> str:
+    """Libellé de shard pour les logs (vide en mode non partitionné)"""
+    if shard is None:
+        return ""
+    return f" [shard {shard[0]}/{shard[1]}]"
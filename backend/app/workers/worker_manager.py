@@ -3,24 +3,35 @@ Gestionnaire de workers background pour Loots&Live.
 Utilise APScheduler pour exécuter des tâches périodiques.
 
 Jobs automatisés:
-- Auto-complétion missions (toutes les minutes)
+- Complétion missions/recherches à échéance exacte (scheduler à échéance)
+- Relecture des échéances proches (toutes les 30 secondes, si WORKERS_IN_PROCESS=False)
+- Réconciliation missions/recherches échues (toutes les 5 minutes, filet de sécurité)
 - Production bâtiments (toutes les heures)
-- Régénération HP PNJ (toutes les 10 minutes)
-- Complétion recherches (toutes les minutes)
 - Événements aléatoires (toutes les 30 minutes)
 """
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
-from datetime import datetime
+from datetime import datetime, timedelta
 import logging
 
+from backend.app.config import settings
 from backend.app.database import AsyncSessionLocal
-from backend.app.workers.mission_worker import auto_complete_missions
+from backend.app.workers.mission_worker import (
+    auto_complete_missions,
+    complete_due_mission,
+    load_due_missions
+)
 from backend.app.workers.building_worker import process_building_production
-from backend.app.workers.character_worker import regenerate_hp
-from backend.app.workers.research_worker import auto_complete_researches
+from backend.app.workers.research_worker import (
+    auto_complete_researches,
+    complete_due_research,
+    load_due_researches
+)
+from backend.app.workers.due_scheduler import due_scheduler, MISSION, RESEARCH
+from backend.app.workers.sharding import sharded
+from backend.app.write_queue import write_queue
 
 # Configuration du logger
 logging.basicConfig(
@@ -37,6 +48,15 @@ class WorkerManager:
         self.scheduler = AsyncIOScheduler()
         self.is_running = False
     
+    def _partitioned(self, job):
+        """
+        Retourne le job en mode partitionné (village_id % WORKER_SHARDS)
+        si plusieurs shards sont configurés, le job tel quel sinon.
+        """
+        if settings.WORKER_SHARDS <= 1:
+            return job
+        return sharded(job, settings.WORKER_SHARDS, settings.WORKER_MAX_CONCURRENCY)
+    
     def start(self):
         """Démarre tous les workers background."""
         if self.is_running:
@@ -45,47 +65,72 @@ class WorkerManager:
         
         logger.info("🔧 Configuration des workers background...")
         
-        # Job 1: Auto-complétion missions (toutes les minutes)
+        reconcile_minutes = settings.WORKER_RECONCILE_INTERVAL_MINUTES
+        
+        # Écrivain unique pour les écritures des workers (commits groupés)
+        write_queue.start()
+        
+        # Complétion à échéance exacte (amorcée depuis les lignes IN_PROGRESS)
+        due_scheduler.register(MISSION, complete_due_mission, load_due_missions)
+        due_scheduler.register(RESEARCH, complete_due_research, load_due_researches)
+        due_scheduler.start()
+        
+        # Réamorçage périodique (échéances créées par un autre processus)
         self.scheduler.add_job(
-            auto_complete_missions,
-            trigger=IntervalTrigger(minutes=1),
+            due_scheduler.reload,
+            trigger=IntervalTrigger(minutes=reconcile_minutes),
+            id="due_scheduler_reload",
+            name="Réamorçage échéances",
+            replace_existing=True
+        )
+        
+        # Processus worker séparé: les start_mission/start_research de l'API ne
+        # peuvent pas alimenter ce tas, relire souvent les échéances proches
+        if not settings.WORKERS_IN_PROCESS:
+            poll_seconds = settings.WORKER_DUE_POLL_SECONDS
+            self.scheduler.add_job(
+                due_scheduler.reload,
+                trigger=IntervalTrigger(seconds=poll_seconds),
+                kwargs={"horizon": timedelta(seconds=2 * poll_seconds)},
+                id="due_scheduler_poll",
+                name="Relecture échéances proches",
+                replace_existing=True
+            )
+            logger.info(f"✅ Relecture des échéances proches configurée ({poll_seconds} secondes)")
+        logger.info("✅ Scheduler à échéance missions/recherches démarré")
+        
+        # Job 1: Réconciliation missions échues (filet de sécurité)
+        self.scheduler.add_job(
+            self._partitioned(auto_complete_missions),
+            trigger=IntervalTrigger(minutes=reconcile_minutes),
             id="auto_complete_missions",
             name="Auto-complétion missions",
             replace_existing=True
         )
-        logger.info("✅ Worker missions configuré (1 minute)")
+        logger.info(f"✅ Worker missions configuré ({reconcile_minutes} minutes)")
         
-        # Job 2: Production bâtiments (toutes les heures)
+        # Job 2: Rattrapage production des villages inactifs (toutes les heures)
+        # La production des villages actifs est matérialisée à la lecture/dépense
         self.scheduler.add_job(
-            process_building_production,
-            trigger=IntervalTrigger(hours=1),
+            self._partitioned(process_building_production),
+            trigger=IntervalTrigger(hours=settings.WORKER_PRODUCTION_INTERVAL),
             id="building_production",
             name="Production bâtiments",
             replace_existing=True
         )
         logger.info("✅ Worker production configuré (1 heure)")
         
-        # Job 3: Régénération HP (toutes les 10 minutes)
-        self.scheduler.add_job(
-            regenerate_hp,
-            trigger=IntervalTrigger(minutes=10),
-            id="hp_regeneration",
-            name="Régénération HP",
-            replace_existing=True
-        )
-        logger.info("✅ Worker HP configuré (10 minutes)")
-        
-        # Job 4: Complétion recherches (toutes les minutes)
+        # Job 3: Réconciliation recherches échues (filet de sécurité)
         self.scheduler.add_job(
-            auto_complete_researches,
-            trigger=IntervalTrigger(minutes=1),
+            self._partitioned(auto_complete_researches),
+            trigger=IntervalTrigger(minutes=reconcile_minutes),
             id="auto_complete_researches",
             name="Auto-complétion recherches",
             replace_existing=True
         )
-        logger.info("✅ Worker recherches configuré (1 minute)")
+        logger.info(f"✅ Worker recherches configuré ({reconcile_minutes} minutes)")
         
-        # Job 5: Événements aléatoires (toutes les 30 minutes)
+        # Job 4: Événements aléatoires (toutes les 30 minutes)
         # TODO: Implémenter quand event_service sera créé
         # self.scheduler.add_job(
         #     generate_random_events,
@@ -101,10 +146,13 @@ class WorkerManager:
         self.is_running = True
         
         logger.info("🚀 Tous les workers sont démarrés !")
-        logger.info(f"   - Missions: check toutes les 1 minute")
+        logger.info(f"   - Missions/Recherches: à échéance (réconciliation toutes les {reconcile_minutes} minutes)")
         logger.info(f"   - Production: toutes les 1 heure")
-        logger.info(f"   - HP: toutes les 10 minutes")
-        logger.info(f"   - Recherches: toutes les 1 minute")
+        if settings.WORKER_SHARDS > 1:
+            logger.info(
+                f"   - Mode partitionné: {settings.WORKER_SHARDS} shards, "
+                f"{settings.WORKER_MAX_CONCURRENCY} en parallèle"
+            )
     
     def stop(self):
         """Arrête tous les workers background."""
@@ -112,7 +160,9 @@ class WorkerManager:
             return
         
         logger.info("🛑 Arrêt des workers background...")
+        due_scheduler.stop()
         self.scheduler.shutdown(wait=False)
+        write_queue.stop()
         self.is_running = False
         logger.info("✅ Workers arrêtés")
     
@@ -0,0 +1,159 @@
+"""
+File d'écriture à écrivain unique (group commit).
+
+SQLite n'accepte qu'un écrivain à la fois: plutôt que de laisser les workers
+se disputer le verrou du fichier, leurs écritures sont soumises à une file
+asyncio consommée par une seule connexion (writer_engine). Les jobs arrivés
+ensemble sont exécutés dans une même transaction, chacun dans son SAVEPOINT,
+puis validés par un unique commit (un seul fsync pour tout le lot).
+
+Portée: seuls les jobs des workers passent par la file, dans le processus
+qui exécute les workers (l'API si WORKERS_IN_PROCESS, sinon
+`python -m backend.app.workers`). Les écritures des routes restent dans la
+session de leur requête (get_db, engine poolé): les faire passer par la
+connexion unique la monopoliserait pendant toute la requête. Elles partagent
+donc toujours le verrou du fichier SQLite avec l'écrivain des workers
+(attente bornée par SQLITE_BUSY_TIMEOUT_MS).
+
+Usage:
+    async def job(db: AsyncSession):
+        ...  # écritures, sans commit
+        return resultat
+
+    resultat = await write_queue.submit(job)
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.config import settings
+from backend.app.database import AsyncWriterSessionLocal
+
+logger = logging.getLogger(__name__)
+
+WriteJob = Callable[[AsyncSession], Awaitable[Any]]
+
+
+class WriteQueue:
+    """File de jobs d'écriture consommée par une connexion unique."""
+
+    def __init__(self, session_factory=AsyncWriterSessionLocal, max_batch: int = 64, max_delay_ms: int = 5):
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def submit(self, job: WriteJob) -> Any:
+        """
+        Soumet un job d'écriture et attend son commit.
+
+        Args:
+            job: Coroutine recevant la session d'écriture (ne doit pas commit)
+
+        Returns:
+            Valeur retournée par le job, une fois la transaction du lot validée
+
+        Note:
+            Si la file n'est pas démarrée (scripts, tests), le job est exécuté
+            immédiatement dans sa propre transaction.
+        """
+        if not self.is_running:
+            async with self.session_factory() as db:
+                try:
+                    result = await job(db)
+                    await db.commit()
+                    return result
+                except Exception:
+                    await db.rollback()
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((job, future))
+        return await future
+
+    def start(self):
+        """Démarre l'écrivain (nécessite une boucle asyncio active)."""
+        if self.is_running:
+            return
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self):
+        """Arrête l'écrivain; les jobs encore en file sont annulés."""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+        while self._queue and not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.cancel()
+
+    async def _run(self):
+        while True:
+            batch = await self._collect_batch()
+            await self._commit_batch(batch)
+
+    async def _collect_batch(self) -> List[Tuple[WriteJob, asyncio.Future]]:
+        """Attend un job puis regroupe ceux arrivés dans la fenêtre `max_delay`."""
+        batch = [await self._queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.max_delay
+
+        while len(batch) < self.max_batch:
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _commit_batch(self, batch: List[Tuple[WriteJob, asyncio.Future]]):
+        """Exécute le lot dans une transaction (un SAVEPOINT par job) et commit une fois."""
+        results = []
+
+        async with self.session_factory() as db:
+            try:
+                for job, future in batch:
+                    try:
+                        async with db.begin_nested():
+                            results.append((future, await job(db), None))
+                    except Exception as e:
+                        # Seul ce job est annulé (rollback du SAVEPOINT)
+                        results.append((future, None, e))
+
+                await db.commit()
+
+            except Exception as e:
+                logger.error(f"Erreur commit groupé ({len(batch)} écriture(s)): {e}")
+                await db.rollback()
+                results = [(future, None, error or e) for future, _, error in results]
+                results += [(future, None, e) for _, future in batch[len(results):]]
+
+        for future, result, error in results:
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+        if len(batch) > 1:
+            logger.debug(f"💾 Commit groupé: {len(batch)} écriture(s)")
+
+
+# Instance globale de la file d'écriture
+write_queue = WriteQueue(
+    max_batch=settings.WRITE_QUEUE_MAX_BATCH,
+    max_delay_ms=settings.WRITE_QUEUE_MAX_DELAY_MS
+)
@@ -0,0 +1,160 @@
+"""
+Benchmark de la latence des routes pendant une rafale de connexions.
+Des clients enchaînent des /auth/login (bcrypt) pendant que d'autres
+interrogent des routes sans rapport; on compare la latence p50/p99 de ces
+dernières avec bcrypt exécuté sur la boucle asyncio (PASSWORD_HASH_WORKERS=0)
+puis dans le pool dédié.
+
+Chaque configuration est mesurée dans un sous-processus (le pool est créé à
+l'import depuis les settings), sur une base SQLite temporaire, via l'app ASGI
+en mémoire.
+
+Usage:
+    python backend/scripts/bench_auth.py [duree_secondes] [nb_workers_bcrypt]
+"""
+
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ajouter le dossier racine au path pour les imports
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+
+DEFAULT_DURATION = 5
+NB_USERS = 20
+LOGIN_CONCURRENCY = 16
+PROBE_CONCURRENCY = 4
+PASSWORD = "bench-password"
+PROBE_ROUTES = ["/health", "/buildings/catalog"]
+
+
+async def seed():
+    """Crée le schéma et les comptes de test (un seul hash bcrypt partagé)"""
+    from sqlalchemy import insert
+    from backend.app.database import engine, AsyncSessionLocal, Base
+    from backend.app.models import User, Building
+    from backend.app.utils.auth import get_password_hash
+    from backend.app.utils.seed_data import BUILDINGS_DATA
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    password_hash = get_password_hash(PASSWORD)
+    async with AsyncSessionLocal() as db:
+        await db.execute(insert(Building.__table__), BUILDINGS_DATA)
+        await db.execute(insert(User.__table__), [
+            {"id": i, "username": f"bench_{i}", "password_hash": password_hash}
+            for i in range(1, NB_USERS + 1)
+        ])
+        await db.commit()
+
+
+def percentile(values: list, p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+async def measure(duration: float) -> dict:
+    """Latences (ms) des routes sondées, au repos puis pendant la rafale de connexions"""
+    import httpx
+    import logging
+    from backend.app.database import close_db
+    from backend.app.main import app
+    from backend.app.utils.auth import create_access_token
+
+    await seed()
+    token = create_access_token({"user_id": 1, "username": "bench_1"})
+    headers = {"Authorization": f"Bearer {token}"}
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def probe(stop_at: float, latencies: list):
+            i = 0
+            while time.perf_counter() < stop_at:
+                start = time.perf_counter()
+                await client.get(PROBE_ROUTES[i % len(PROBE_ROUTES)], headers=headers)
+                latencies.append((time.perf_counter() - start) * 1000)
+                i += 1
+
+        async def login(stop_at: float, counter: list):
+            i = 0
+            while time.perf_counter() < stop_at:
+                i += 1
+                response = await client.post("/auth/login", json={
+                    "username": f"bench_{i % NB_USERS + 1}", "password": PASSWORD
+                })
+                response.raise_for_status()
+                counter.append(1)
+
+        async def run(with_storm: bool) -> dict:
+            latencies, logins = [], []
+            stop_at = time.perf_counter() + duration
+            tasks = [probe(stop_at, latencies) for _ in range(PROBE_CONCURRENCY)]
+            if with_storm:
+                tasks += [login(stop_at, logins) for _ in range(LOGIN_CONCURRENCY)]
+            await asyncio.gather(*tasks)
+            return {
+                "p50": statistics.median(latencies),
+                "p99": percentile(latencies, 0.99),
+                "probes": len(latencies),
+                "logins_per_s": len(logins) / duration,
+            }
+
+        results = {"repos": await run(False), "rafale": await run(True)}
+
+    await close_db()
+    return results
+
+
+def run_config(workers: int, duration: float) -> dict:
+    """Lance la mesure dans un sous-processus avec PASSWORD_HASH_WORKERS=`workers`"""
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(
+            os.environ,
+            DATABASE_URL=f"sqlite+aiosqlite:///{tmp}/bench.db",
+            PASSWORD_HASH_WORKERS=str(workers),
+            CACHE_ENABLED="False",
+            DEBUG="False"
+        )
+        env.setdefault("SECRET_KEY", "bench-secret-key")
+        output = subprocess.run(
+            [sys.executable, __file__, "--measure", str(duration)],
+            env=env, stdout=subprocess.PIPE, text=True, check=True
+        ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    if sys.argv[1:2] == ["--measure"]:
+        print(json.dumps(asyncio.run(measure(float(sys.argv[2])))))
+        return
+
+    from backend.app.config import settings
+
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_DURATION
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else max(settings.PASSWORD_HASH_WORKERS, 1)
+
+    print(f"🔐 Benchmark connexions ({LOGIN_CONCURRENCY} clients login, "
+          f"{PROBE_CONCURRENCY} clients {', '.join(PROBE_ROUTES)}, {duration:.0f}s)\n")
+    header = f"{'bcrypt':<14} | {'phase':<7} | {'p50 (ms)':>9} | {'p99 (ms)':>9} | {'logins/s':>9}"
+    print(header)
+    print("-" * len(header))
+
+    for label, nb_workers in (("boucle", 0), (f"pool ({workers})", workers)):
+        results = run_config(nb_workers, duration)
+        for phase, r in results.items():
+            print(f"{label:<14} | {phase:<7} | {r['p50']:>9.1f} | {r['p99']:>9.1f} | {r['logins_per_s']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
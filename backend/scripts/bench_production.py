@@ -0,0 +1,142 @@
+"""
+Benchmark du tick de production des bâtiments.
+Compare l'ancien calcul bâtiment par bâtiment (2N+1 requêtes) au moteur
+ensembliste de ProductionService, pour un nombre croissant d'instances.
+
+Usage:
+    python backend/scripts/bench_production.py [nb_instances ...]
+"""
+
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Ajouter le dossier racine au path pour les imports
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import select, insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+
+from backend.app.database import Base
+from backend.app.models import User, Village, Building, BuildingInstance, Resource
+from backend.app.services.building_service import BuildingService
+from backend.app.services.production_service import ProductionService
+from backend.app.utils.seed_data import BUILDINGS_DATA
+
+
+DEFAULT_SIZES = [1_000, 5_000, 20_000]
+INSTANCES_PER_VILLAGE = 10
+
+
+async def seed(session_factory, nb_instances: int):
+    """Crée les villages, stocks et instances de bâtiments de test"""
+    nb_villages = max(1, nb_instances // INSTANCES_PER_VILLAGE)
+    built_at = datetime.utcnow() - timedelta(hours=1)
+
+    async with session_factory() as db:
+        await db.execute(insert(Building.__table__), BUILDINGS_DATA)
+        await db.execute(insert(User.__table__), [
+            {"id": i, "username": f"bench_{i}", "password_hash": "x"}
+            for i in range(1, nb_villages + 1)
+        ])
+        await db.execute(insert(Village.__table__), [
+            {"id": i, "user_id": i, "name": f"Village {i}", "warehouse_capacity": 10**9}
+            for i in range(1, nb_villages + 1)
+        ])
+
+        result = await db.execute(select(Building.id, Building.production))
+        producers = [b_id for b_id, production in result.all() if production]
+        resource_types = sorted({b["production"]["resource"] for b in BUILDINGS_DATA if b["production"]})
+
+        await db.execute(insert(Resource.__table__), [
+            {"village_id": v, "resource_type": r, "quantity": 0}
+            for v in range(1, nb_villages + 1)
+            for r in resource_types
+        ])
+        await db.execute(insert(BuildingInstance.__table__), [
+            {
+                "village_id": (i % nb_villages) + 1,
+                "building_id": random.choice(producers),
+                "grid_x": i % 100,
+                "grid_y": i // 100 % 100,
+                "level": random.randint(1, 5),
+                "is_active": True,
+                "built_at": built_at
+            }
+            for i in range(nb_instances)
+        ])
+        await db.commit()
+
+
+async def legacy_tick(db: AsyncSession):
+    """Ancien tick: calcul par bâtiment puis lecture/écriture des stocks par village"""
+    result = await db.execute(
+        select(BuildingInstance).where(BuildingInstance.is_active == True)
+    )
+    buildings = list(result.scalars().all())
+    building_service = BuildingService(db)
+
+    village_productions = {}
+    for building in buildings:
+        production = await building_service.calculate_production_rate(building.id)
+        if not production["resource"]:
+            continue
+        village_totals = village_productions.setdefault(building.village_id, {})
+        village_totals[production["resource"]] = (
+            village_totals.get(production["resource"], 0) + production["amount_per_hour"]
+        )
+
+    for village_id, totals in village_productions.items():
+        result = await db.execute(select(Resource).where(Resource.village_id == village_id))
+        stocks = {r.resource_type: r for r in result.scalars().all()}
+        for resource_type, amount in totals.items():
+            stocks[resource_type].quantity += amount
+
+    await db.commit()
+
+
+async def batched_tick(db: AsyncSession):
+    """Nouveau tick: moteur ensembliste de ProductionService (1h écoulée)"""
+    await ProductionService(db).produce()
+    await db.commit()
+
+
+async def run(nb_instances: int) -> tuple[float, float]:
+    """Mesure un tick de chaque implémentation sur une base fraîche"""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp}/bench.db")
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        await seed(session_factory, nb_instances)
+
+        timings = []
+        for tick in (legacy_tick, batched_tick):
+            async with session_factory() as db:
+                start = time.perf_counter()
+                await tick(db)
+                timings.append(time.perf_counter() - start)
+
+        await engine.dispose()
+        return timings[0], timings[1]
+
+
+async def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+
+    print("🏭 Benchmark tick de production\n")
+    print(f"{'instances':>10} | {'ancien (s)':>11} | {'batch (s)':>10} | {'gain':>7}")
+    print("-" * 48)
+    for nb_instances in sizes:
+        legacy, batched = await run(nb_instances)
+        print(f"{nb_instances:>10} | {legacy:>11.3f} | {batched:>10.3f} | {legacy / batched:>6.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,156 @@
+"""
+Benchmark du débit d'inscription: utilisateur + village + stocks de
+ressources + lignes de recherches.
+
+Deux mesures par base:
+- "complet": POST /auth/register via l'app ASGI en mémoire (bcrypt inclus)
+- "base": la même création (utilisateur, puis VillageService.create_village)
+  avec un hash bcrypt précalculé, pour isoler le coût des écritures; on
+  compte aussi les requêtes SQL par inscription
+
+Chaque base est mesurée dans un sous-processus (settings lus à l'import),
+une base SQLite temporaire par défaut; une URL PostgreSQL vierge peut être
+ajoutée en argument (le schéma y est créé puis supprimé).
+
+Usage:
+    python backend/scripts/bench_register.py [nb_inscriptions] [database_url]
+"""
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ajouter le dossier racine au path pour les imports
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+
+DEFAULT_COUNT = 200
+CONCURRENCY = 8
+PASSWORD = "bench-password"
+
+
+async def measure(count: int) -> dict:
+    """Inscriptions par seconde (route complète, puis écritures seules)"""
+    import httpx
+    import logging
+    from sqlalchemy import event, func, insert, select
+    from backend.app.database import engine, AsyncSessionLocal, Base, close_db
+    from backend.app.main import app
+    from backend.app.models import User, Building, Research
+    from backend.app.schemas.village import VillageCreate
+    from backend.app.services.village_service import VillageService
+    from backend.app.utils.auth import get_password_hash
+    from backend.app.utils.seed_data import BUILDINGS_DATA
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSessionLocal() as db:
+        await db.execute(insert(Building.__table__), BUILDINGS_DATA)
+        await db.commit()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    async def run(register, prefix: str) -> float:
+        """Débit de `count` inscriptions réparties sur CONCURRENCY clients"""
+        queue = iter(range(count))
+
+        async def client_loop():
+            for i in queue:
+                await register(f"{prefix}_{i}")
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client_loop() for _ in range(CONCURRENCY)))
+        return count / (time.perf_counter() - start)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def register_route(username: str):
+            response = await client.post("/auth/register", json={
+                "username": username, "password": PASSWORD
+            })
+            response.raise_for_status()
+
+        full_per_s = await run(register_route, "full")
+
+    password_hash = get_password_hash(PASSWORD)
+
+    async def register_db(username: str):
+        async with AsyncSessionLocal() as db:
+            user = User(username=username, password_hash=password_hash)
+            db.add(user)
+            await db.flush()
+            await VillageService(db).create_village(
+                user_id=user.id,
+                village_data=VillageCreate(name=f"Village de {username}")
+            )
+            await db.commit()
+
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(1)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+    db_per_s = await run(register_db, "db")
+    event.remove(engine.sync_engine, "before_cursor_execute", count_statement)
+
+    async with AsyncSessionLocal() as db:
+        research_rows = await db.scalar(select(func.count(Research.id)))
+        users = await db.scalar(select(func.count(User.id)))
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await close_db()
+
+    return {
+        "full_per_s": full_per_s,
+        "db_per_s": db_per_s,
+        "statements": len(statements) / count,
+        "research_rows": research_rows / users,
+    }
+
+
+def run_backend(database_url: str, count: int) -> dict:
+    """Lance la mesure dans un sous-processus sur `database_url`"""
+    env = dict(os.environ, DATABASE_URL=database_url, CACHE_ENABLED="False", DEBUG="False")
+    env.setdefault("SECRET_KEY", "bench-secret-key")
+    output = subprocess.run(
+        [sys.executable, __file__, "--measure", str(count)],
+        env=env, stdout=subprocess.PIPE, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    if sys.argv[1:2] == ["--measure"]:
+        print(json.dumps(asyncio.run(measure(int(sys.argv[2])))))
+        return
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT
+
+    print(f"🏘️ Benchmark inscriptions ({count} inscriptions, {CONCURRENCY} clients)\n")
+    header = (f"{'base':<10} | {'complet/s':>10} | {'base/s':>10} | "
+              f"{'requêtes/inscr.':>15} | {'recherches/village':>18}")
+    print(header)
+    print("-" * len(header))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = [("sqlite", f"sqlite+aiosqlite:///{tmp}/bench.db")]
+        if len(sys.argv) > 2:
+            backends.append((sys.argv[2].split("+")[0].split(":")[0], sys.argv[2]))
+
+        for label, database_url in backends:
+            r = run_backend(database_url, count)
+            print(f"{label:<10} | {r['full_per_s']:>10.1f} | {r['db_per_s']:>10.1f} | "
+                  f"{r['statements']:>15.1f} | {r['research_rows']:>18.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Benchmark du débit des routes principales sur SQLite et PostgreSQL.
+Chaque backend est mesuré dans un sous-processus (les engines sont créés à
+l'import depuis DATABASE_URL), sur une base fraîchement peuplée, via l'app
+ASGI en mémoire (sans serveur HTTP ni workers background).
+
+Usage:
+    python backend/scripts/bench_routes.py [postgres_url] [nb_requetes_par_route]
+
+Exemple:
+    python backend/scripts/bench_routes.py postgresql+asyncpg://postgres@localhost/lootsandlive_bench
+
+Attention: les tables de la base PostgreSQL indiquée sont supprimées puis recréées.
+"""
+
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Ajouter le dossier racine au path pour les imports
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+
+DEFAULT_REQUESTS = 500
+CONCURRENCY = 20
+NB_USERS = 50
+INSTANCES_PER_VILLAGE = 10
+CHARACTERS_PER_VILLAGE = 5
+ROUTES = [
+    "/villages/me",
+    "/characters/me",
+    "/characters/",
+    "/buildings/",
+    "/buildings/catalog",
+    "/missions/",
+]
+
+
+async def seed():
+    """Recrée le schéma et peuple les villages de test, retourne les (id, username)"""
+    from sqlalchemy import select, insert
+    from backend.app.database import engine, AsyncSessionLocal, Base
+    from backend.app.models import User, Village, Building, BuildingInstance, Resource, Character
+    from backend.app.utils.seed_data import BUILDINGS_DATA
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    built_at = datetime.utcnow() - timedelta(hours=1)
+
+    async with AsyncSessionLocal() as db:
+        await db.execute(insert(Building.__table__), BUILDINGS_DATA)
+        await db.execute(insert(User.__table__), [
+            {"username": f"bench_{i}", "password_hash": "x"} for i in range(NB_USERS)
+        ])
+        users = (await db.execute(select(User.id, User.username).order_by(User.id))).all()
+
+        await db.execute(insert(Village.__table__), [
+            {"user_id": user_id, "name": f"Village {username}"} for user_id, username in users
+        ])
+        villages = (await db.execute(select(Village.id, Village.user_id))).all()
+
+        result = await db.execute(select(Building.id, Building.production))
+        producers = [b_id for b_id, production in result.all() if production]
+        resource_types = sorted({b["production"]["resource"] for b in BUILDINGS_DATA if b["production"]})
+
+        await db.execute(insert(Resource.__table__), [
+            {"village_id": village_id, "resource_type": r, "quantity": 100}
+            for village_id, _ in villages
+            for r in resource_types
+        ])
+        await db.execute(insert(BuildingInstance.__table__), [
+            {
+                "village_id": village_id,
+                "building_id": random.choice(producers),
+                "grid_x": i,
+                "grid_y": 0,
+                "built_at": built_at
+            }
+            for village_id, _ in villages
+            for i in range(INSTANCES_PER_VILLAGE)
+        ])
+        await db.execute(insert(Character.__table__), [
+            {
+                "user_id": user_id,
+                "village_id": village_id,
+                "name": f"PNJ {i}",
+                "character_class": "warrior",
+                "sex": "male",
+                "is_player_character": i == 0
+            }
+            for village_id, user_id in villages
+            for i in range(CHARACTERS_PER_VILLAGE)
+        ])
+        await db.commit()
+
+    return users
+
+
+async def measure(nb_requests: int) -> dict:
+    """Mesure le débit de chaque route (requêtes/s) sur le backend de DATABASE_URL"""
+    import httpx
+    import logging
+    from backend.app.database import close_db
+    from backend.app.main import app
+    from backend.app.utils.auth import create_access_token
+
+    users = await seed()
+    tokens = [
+        create_access_token({"user_id": user_id, "username": username})
+        for user_id, username in users
+    ]
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    results = {}
+    # Les erreurs applicatives sont comptées (réponse 500) sans interrompre la mesure
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for route in ROUTES:
+            semaphore = asyncio.Semaphore(CONCURRENCY)
+            errors = 0
+
+            async def call():
+                nonlocal errors
+                async with semaphore:
+                    response = await client.get(
+                        route, headers={"Authorization": f"Bearer {random.choice(tokens)}"}
+                    )
+                    if response.status_code != 200:
+                        errors += 1
+
+            start = time.perf_counter()
+            await asyncio.gather(*(call() for _ in range(nb_requests)))
+            elapsed = time.perf_counter() - start
+            results[route] = {"rps": nb_requests / elapsed, "errors": errors}
+
+    await close_db()
+    return results
+
+
+def run_backend(database_url: str, nb_requests: int) -> dict:
+    """Lance la mesure dans un sous-processus configuré pour `database_url`"""
+    env = dict(os.environ, DATABASE_URL=database_url, DEBUG="False")
+    env.setdefault("SECRET_KEY", "bench-secret-key")
+    output = subprocess.run(
+        [sys.executable, __file__, "--measure", str(nb_requests)],
+        env=env, stdout=subprocess.PIPE, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    if sys.argv[1:2] == ["--measure"]:
+        print(json.dumps(asyncio.run(measure(int(sys.argv[2])))))
+        return
+
+    postgres_url = next((arg for arg in sys.argv[1:] if "://" in arg), None)
+    nb_requests = next((int(arg) for arg in sys.argv[1:] if arg.isdigit()), DEFAULT_REQUESTS)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = {"SQLite": run_backend(f"sqlite+aiosqlite:///{tmp}/bench.db", nb_requests)}
+    if postgres_url:
+        backends["PostgreSQL"] = run_backend(postgres_url, nb_requests)
+
+    print(f"🌐 Benchmark routes ({nb_requests} requêtes/route, {CONCURRENCY} concurrentes)\n")
+    header = f"{'route':<24}" + "".join(f" | {name + ' (req/s)':>18}" for name in backends)
+    print(header)
+    print("-" * len(header))
+    for route in ROUTES:
+        cells = ""
+        for results in backends.values():
+            cell = f"{results[route]['rps']:.0f}"
+            if results[route]["errors"]:
+                cell += f" ({results[route]['errors']} err)"
+            cells += f" | {cell:>18}"
+        print(f"{route:<24}{cells}")
+
+
+if __name__ == "__main__":
+    main()
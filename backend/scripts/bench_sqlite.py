@@ -0,0 +1,133 @@
+"""
+Benchmark du débit d'écriture SQLite avec et sans les PRAGMA de performance.
+Plusieurs écrivains concurrents (API + workers simulés) enchaînent de petites
+transactions sur les stocks de ressources, pendant que des lecteurs lisent.
+
+Usage:
+    python backend/scripts/bench_sqlite.py [nb_transactions_par_ecrivain] [nb_ecrivains]
+"""
+
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ajouter le dossier racine au path pour les imports
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import select, insert, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+
+from backend.app.database import Base, enable_sqlite_tuning, sqlite_pragmas
+from backend.app.models import User, Village, Resource
+
+
+DEFAULT_TRANSACTIONS = 200
+DEFAULT_WRITERS = 8
+NB_READERS = 4
+NB_VILLAGES = 100
+RESOURCE_TYPES = ["wood", "stone", "food", "water"]
+
+
+async def seed(session_factory):
+    """Crée les villages et leurs stocks"""
+    async with session_factory() as db:
+        await db.execute(insert(User.__table__), [
+            {"id": i, "username": f"bench_{i}", "password_hash": "x"}
+            for i in range(1, NB_VILLAGES + 1)
+        ])
+        await db.execute(insert(Village.__table__), [
+            {"id": i, "user_id": i, "name": f"Village {i}"}
+            for i in range(1, NB_VILLAGES + 1)
+        ])
+        await db.execute(insert(Resource.__table__), [
+            {"village_id": v, "resource_type": r, "quantity": 0}
+            for v in range(1, NB_VILLAGES + 1)
+            for r in RESOURCE_TYPES
+        ])
+        await db.commit()
+
+
+async def writer(session_factory, nb_transactions: int) -> int:
+    """Enchaîne des transactions courtes, retourne le nombre d'erreurs de verrou"""
+    errors = 0
+    for _ in range(nb_transactions):
+        async with session_factory() as db:
+            try:
+                await db.execute(
+                    update(Resource)
+                    .where(
+                        Resource.village_id == random.randint(1, NB_VILLAGES),
+                        Resource.resource_type == random.choice(RESOURCE_TYPES)
+                    )
+                    .values(quantity=Resource.quantity + 1)
+                )
+                await db.commit()
+            except OperationalError:
+                await db.rollback()
+                errors += 1
+    return errors
+
+
+async def reader(session_factory, stop: asyncio.Event):
+    """Lit les stocks d'un village en boucle jusqu'à la fin des écritures"""
+    while not stop.is_set():
+        async with session_factory() as db:
+            await db.execute(
+                select(Resource).where(Resource.village_id == random.randint(1, NB_VILLAGES))
+            )
+
+
+async def run(tuned: bool, nb_transactions: int, nb_writers: int) -> tuple[float, int]:
+    """Mesure le débit (transactions/s) et les erreurs de verrou sur une base fraîche"""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp}/bench.db")
+        if tuned:
+            enable_sqlite_tuning(engine, sqlite_pragmas())
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        await seed(session_factory)
+
+        stop = asyncio.Event()
+        readers = [asyncio.create_task(reader(session_factory, stop)) for _ in range(NB_READERS)]
+
+        start = time.perf_counter()
+        errors = await asyncio.gather(
+            *(writer(session_factory, nb_transactions) for _ in range(nb_writers))
+        )
+        elapsed = time.perf_counter() - start
+
+        stop.set()
+        await asyncio.gather(*readers)
+        await engine.dispose()
+
+        return nb_transactions * nb_writers / elapsed, sum(errors)
+
+
+async def main():
+    nb_transactions = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TRANSACTIONS
+    nb_writers = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_WRITERS
+
+    print("💾 Benchmark écritures SQLite")
+    print(f"   {nb_writers} écrivains × {nb_transactions} transactions, {NB_READERS} lecteurs\n")
+    print(f"{'profil':>8} | {'tx/s':>9} | {'verrous':>8}")
+    print("-" * 32)
+
+    results = {}
+    for tuned in (False, True):
+        label = "PRAGMA" if tuned else "défaut"
+        throughput, errors = await run(tuned, nb_transactions, nb_writers)
+        results[tuned] = throughput
+        print(f"{label:>8} | {throughput:>9.0f} | {errors:>8}")
+
+    print(f"\n⚡ Gain: {results[True] / results[False]:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
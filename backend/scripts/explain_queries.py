@@ -0,0 +1,159 @@
+"""
+Audit des plans d'exécution des requêtes chaudes (workers et services).
+Exécute EXPLAIN QUERY PLAN (SQLite) sur chaque requête et signale les
+parcours complets de table (SCAN sans index).
+
+Usage:
+    python backend/scripts/explain_queries.py [database_url]
+
+Sans argument, le schéma est créé dans une base temporaire (plans fondés sur
+les index déclarés). Passer l'URL de la base réelle (ex: settings.DATABASE_URL)
+pour tenir compte de ses statistiques (ANALYZE).
+Code de sortie 1 si une table non référentielle est parcourue entièrement.
+"""
+
+import asyncio
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Ajouter le dossier racine au path pour les imports
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from backend.app.database import Base, create_missing_indexes
+from backend.app.models import (
+    Mission, Research, Building, BuildingInstance, Village, Resource
+)
+from backend.app.utils.constants import MissionStatus, ResearchStatus
+from backend.app.workers.sharding import shard_filter
+
+
+# Tables de référence (quelques dizaines de lignes): un parcours complet est acceptable
+REFERENCE_TABLES = {"buildings"}
+
+
+def hot_queries():
+    """Requêtes auditées: (libellé, requête SQLAlchemy)"""
+    now = datetime.utcnow()
+    last_accounted = func.coalesce(BuildingInstance.last_production_at, BuildingInstance.built_at)
+    production = (
+        select(
+            BuildingInstance.id,
+            BuildingInstance.village_id,
+            BuildingInstance.level,
+            last_accounted,
+            Building.production,
+            Village.warehouse_capacity
+        )
+        .join(Building, Building.id == BuildingInstance.building_id)
+        .join(Village, Village.id == BuildingInstance.village_id)
+        .where(BuildingInstance.is_active == True)
+    )
+
+    return [
+        ("missions échues (worker)", select(Mission).where(
+            Mission.status == MissionStatus.IN_PROGRESS,
+            Mission.completed_at <= now
+        )),
+        ("missions échues (worker, shard)", select(Mission).where(
+            Mission.status == MissionStatus.IN_PROGRESS,
+            Mission.completed_at <= now,
+            shard_filter(Mission.village_id, (0, 4))
+        )),
+        ("échéances missions (amorçage)", select(Mission.id, Mission.completed_at).where(
+            Mission.status == MissionStatus.IN_PROGRESS,
+            Mission.completed_at.is_not(None)
+        )),
+        ("recherches échues (worker)", select(Research).where(
+            Research.status == ResearchStatus.IN_PROGRESS,
+            Research.completed_at <= now
+        )),
+        ("échéances recherches (amorçage)", select(Research.id, Research.completed_at).where(
+            Research.status == ResearchStatus.IN_PROGRESS,
+            Research.completed_at.is_not(None)
+        )),
+        ("production village (lecture/dépense)", production.where(
+            BuildingInstance.village_id == 1
+        )),
+        ("production villages inactifs (worker)", production.where(
+            last_accounted <= now - timedelta(hours=1)
+        )),
+        ("case occupée (construction)", select(BuildingInstance).where(
+            BuildingInstance.village_id == 1,
+            BuildingInstance.grid_x == 50,
+            BuildingInstance.grid_y == 50
+        )),
+        ("instances d'un bâtiment (construction)", select(BuildingInstance).where(
+            BuildingInstance.village_id == 1,
+            BuildingInstance.building_id == 1
+        )),
+        ("stocks village", select(Resource).where(Resource.village_id == 1)),
+    ]
+
+
+def full_scans(plan_rows) -> list:
+    """Tables parcourues entièrement (SCAN sans index) hors tables de référence"""
+    scans = []
+    for row in plan_rows:
+        detail = row[-1]
+        if not detail.startswith("SCAN ") or "INDEX" in detail:
+            continue
+        table = detail.split()[1]
+        if table not in REFERENCE_TABLES:
+            scans.append(table)
+    return scans
+
+
+async def explain(database_url: str) -> int:
+    """Affiche le plan de chaque requête, retourne le nombre de parcours complets"""
+    engine = create_async_engine(database_url)
+    if engine.dialect.name != "sqlite":
+        print(f"❌ EXPLAIN QUERY PLAN est propre à SQLite (dialecte: {engine.dialect.name})")
+        await engine.dispose()
+        return 1
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(create_missing_indexes)
+
+    problems = 0
+    async with engine.connect() as conn:
+        for label, query in hot_queries():
+            compiled = query.compile(dialect=engine.dialect)
+            params = compiled.construct_params()
+            result = await conn.exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {compiled}",
+                tuple(params[name] for name in compiled.positiontup)
+            )
+            plan = result.all()
+            scans = full_scans(plan)
+            problems += len(scans)
+
+            print(f"{'❌' if scans else '✅'} {label}")
+            for row in plan:
+                print(f"     {row[-1]}")
+
+    await engine.dispose()
+    return problems
+
+
+async def main():
+    if len(sys.argv) > 1:
+        problems = await explain(sys.argv[1])
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            problems = await explain(f"sqlite+aiosqlite:///{tmp}/explain.db")
+
+    if problems:
+        print(f"\n⚠️  {problems} parcours complet(s) de table détecté(s)")
+        sys.exit(1)
+    print("\n✅ Aucune requête auditée ne parcourt entièrement une table")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
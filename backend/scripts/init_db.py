@@ -13,7 +13,9 @@ sys.path.insert(0, str(project_root))
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from backend.app.database import engine, Base, AsyncSessionLocal
+from backend.app.database import (
+    engine, Base, AsyncSessionLocal, create_missing_columns, create_missing_indexes
+)
 from backend.app.models import Building
 from backend.app.utils.seed_data import BUILDINGS_DATA
 
@@ -23,6 +25,8 @@ async def create_tables():
     print("🔨 Création des tables...")
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(create_missing_columns)
+        await conn.run_sync(create_missing_indexes)
     print("✅ Tables créées avec succès!")
 
 
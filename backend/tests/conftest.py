@@ -0,0 +1,17 @@
+"""
+Configuration commune des tests: settings de test avant tout import de l'app.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Ajouter le dossier racine au path pour les imports
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+_tmp = tempfile.mkdtemp(prefix="lootsandlive-tests-")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{_tmp}/test.db")
+os.environ.setdefault("DEBUG", "False")
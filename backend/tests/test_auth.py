@@ -0,0 +1,47 @@
+"""
+Tests de l'inscription (services/auth_service).
+"""
+
+import asyncio
+
+from fastapi import HTTPException
+from sqlalchemy import delete, func, select
+
+from backend.app.database import AsyncSessionLocal, Base, engine
+from backend.app.models import Research, Resource, User, Village
+from backend.app.schemas.user import UserCreate
+from backend.app.services.auth_service import AuthService
+
+
+def test_concurrent_duplicate_registration_is_rejected():
+    async def scenario():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSessionLocal() as db:
+            for model in (Research, Resource, Village, User):
+                await db.execute(delete(model))
+            await db.commit()
+
+        async def register():
+            # Les deux inscriptions passent la vérification avant que l'une n'écrive
+            async with AsyncSessionLocal() as db:
+                try:
+                    await AuthService.register_user(
+                        db, UserCreate(username="twin", password="password1")
+                    )
+                    await db.commit()
+                    return 201
+                except HTTPException as exc:
+                    return exc.status_code
+
+        codes = await asyncio.gather(register(), register())
+
+        async with AsyncSessionLocal() as db:
+            users = await db.scalar(select(func.count(User.id)).where(User.username == "twin"))
+        await engine.dispose()
+        return sorted(codes), users
+
+    codes, users = asyncio.run(scenario())
+
+    assert codes == [201, 400]
+    assert users == 1
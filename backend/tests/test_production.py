@@ -0,0 +1,130 @@
+"""
+Tests de la matérialisation de la production (services/production_service).
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, insert, select
+
+from backend.app.database import AsyncSessionLocal, Base, engine, init_db
+from backend.app.models import Building, BuildingInstance, Research, Resource, User, Village
+from backend.app.services.production_service import ProductionService
+from backend.app.utils.seed_data import BUILDINGS_DATA
+
+
+async def _create_village_with_well(hours_ago: float) -> int:
+    """Village avec 200 d'eau et un puits (20/h) non comptabilisé depuis `hours_ago`"""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSessionLocal() as db:
+        for model in (Research, BuildingInstance, Resource, Village, User, Building):
+            await db.execute(delete(model))
+        await db.execute(insert(Building.__table__), BUILDINGS_DATA)
+        well_id = await db.scalar(select(Building.id).where(Building.key == "well"))
+
+        user = User(username="producer", password_hash="x")
+        db.add(user)
+        await db.flush()
+        village = Village(user_id=user.id, name="Village test")
+        db.add(village)
+        await db.flush()
+
+        db.add(Resource(village_id=village.id, resource_type="water", quantity=200))
+        db.add(BuildingInstance(
+            village_id=village.id,
+            building_id=well_id,
+            grid_x=0,
+            grid_y=0,
+            built_at=datetime.utcnow() - timedelta(hours=hours_ago)
+        ))
+        await db.commit()
+        return village.id
+
+
+async def _water(village_id: int) -> int:
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(
+            select(Resource.quantity).where(
+                Resource.village_id == village_id,
+                Resource.resource_type == "water"
+            )
+        )
+
+
+def test_interleaved_materializations_credit_once():
+    async def scenario():
+        village_id = await _create_village_with_well(hours_ago=3)
+        now = datetime.utcnow()
+
+        async with AsyncSessionLocal() as first, AsyncSessionLocal() as second:
+            # Les deux lisent le même last_production_at avant toute écriture
+            first_service, second_service = ProductionService(first), ProductionService(second)
+            first_claims = await first_service.compute_production_totals(now, village_id)
+            second_claims = await second_service.compute_production_totals(now, village_id)
+
+            first_totals = await first_service.apply_production(*first_claims)
+            await first.commit()
+            second_totals = await second_service.apply_production(*second_claims)
+            await second.commit()
+
+        water = await _water(village_id)
+        await engine.dispose()
+        return village_id, first_totals, second_totals, water
+
+    village_id, first_totals, second_totals, water = asyncio.run(scenario())
+
+    assert first_totals == {village_id: {"water": 60}}
+    assert second_totals == {}
+    assert water == 260
+
+
+def test_successive_materializations_keep_remainder():
+    async def scenario():
+        village_id = await _create_village_with_well(hours_ago=1.5)
+        async with AsyncSessionLocal() as db:
+            first = await ProductionService(db).produce(village_id=village_id)
+            second = await ProductionService(db).produce(village_id=village_id)
+            await db.commit()
+
+        water = await _water(village_id)
+        await engine.dispose()
+        return village_id, first, second, water
+
+    village_id, first, second, water = asyncio.run(scenario())
+
+    assert first == {village_id: {"water": 30}}
+    assert second == {}
+    assert water == 230
+
+
+def test_startup_backfills_research_mask_for_production():
+    async def scenario():
+        village_id = await _create_village_with_well(hours_ago=3)
+        # Recherche complétée sans bitset persisté (base antérieure à la colonne)
+        async with AsyncSessionLocal() as db:
+            db.add(Research(
+                village_id=village_id,
+                key="agriculture_1",
+                name="Agriculture de base",
+                description="",
+                status="completed",
+                cost={},
+                duration_minutes=60
+            ))
+            await db.commit()
+
+        await init_db()
+
+        async with AsyncSessionLocal() as db:
+            produced = await ProductionService(db).produce(village_id=village_id)
+            await db.commit()
+
+        await engine.dispose()
+        return village_id, produced
+
+    village_id, produced = asyncio.run(scenario())
+
+    # Puits 20/h +10% (agriculture_1) pendant 3h
+    assert produced == {village_id: {"water": 66}}
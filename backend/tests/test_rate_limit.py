@@ -0,0 +1,98 @@
+"""
+Tests de la limitation de débit à fenêtre glissante (utils/rate_limit).
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from backend.app.utils import rate_limit
+from backend.app.utils.rate_limit import LoginRateLimiter, MemoryRateLimitBackend, RateLimitBackend
+
+LIMIT = 3
+WINDOW = 60.0
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Horloge monotone contrôlée par le test (module rate_limit uniquement)"""
+    now = SimpleNamespace(value=0.0)
+    monkeypatch.setattr(rate_limit, "time", SimpleNamespace(monotonic=lambda: now.value))
+    return now
+
+
+def hit(backend: MemoryRateLimitBackend, key: str = "k"):
+    return asyncio.run(backend.hit(key, LIMIT, WINDOW))
+
+
+def test_backend_interface_is_abstract():
+    with pytest.raises(TypeError):
+        RateLimitBackend()
+
+
+def test_limit_within_window(clock):
+    backend = MemoryRateLimitBackend()
+    clock.value = 10.0
+
+    assert [hit(backend)[0] for _ in range(LIMIT)] == [True] * LIMIT
+    # Fenêtre courante pleine: nouvelle tentative à son terme
+    assert hit(backend) == (False, pytest.approx(50.0))
+
+
+def test_previous_window_weighted_after_rollover(clock):
+    backend = MemoryRateLimitBackend()
+    for _ in range(LIMIT):
+        hit(backend)
+
+    # 15s dans la fenêtre suivante: 3 × 0.75 = 2.25 < 3
+    clock.value = WINDOW + 15
+    assert hit(backend) == (True, 0.0)
+
+    # 2.25 + 1 ≥ 3; 3 × (1 - r) + 1 < 3 dès r > 1/3, soit à 60 + 20s
+    allowed, retry_after = hit(backend)
+    assert not allowed
+    assert retry_after == pytest.approx(5.0)
+
+    clock.value = WINDOW + 20.5
+    assert hit(backend)[0]
+
+
+def test_counts_expire_after_two_windows(clock):
+    backend = MemoryRateLimitBackend()
+    for _ in range(LIMIT):
+        hit(backend)
+
+    # La fenêtre précédente n'est plus celle des tentatives: compteur vierge
+    clock.value = 2 * WINDOW + 1
+    assert [hit(backend)[0] for _ in range(LIMIT)] == [True] * LIMIT
+
+
+def test_least_recently_used_key_is_evicted(clock):
+    backend = MemoryRateLimitBackend(max_keys=2)
+    for key in ("a", "b"):
+        for _ in range(LIMIT):
+            hit(backend, key)
+
+    hit(backend, "a")   # "a" redevient la plus récente
+    hit(backend, "c")   # dépasse max_keys: "b" est évincée
+
+    assert not hit(backend, "a")[0]
+    assert hit(backend, "b")[0]
+
+
+def test_login_limiter_sets_retry_after(clock):
+    limiter = LoginRateLimiter(MemoryRateLimitBackend(), attempts=1, window_minutes=1)
+    clock.value = 0.5
+
+    asyncio.run(limiter.check("Alice", "127.0.0.1"))
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(limiter.check("alice", "127.0.0.1"))
+
+    assert exc.value.status_code == 429
+    assert exc.value.headers["Retry-After"] == "60"
+
+    # Une connexion réussie oublie les tentatives
+    asyncio.run(limiter.reset("alice", "127.0.0.1"))
+    asyncio.run(limiter.check("alice", "127.0.0.1"))
@@ -0,0 +1,75 @@
+"""
+Tests du cache de vérification des tokens JWT (utils/dependencies).
+"""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from backend.app.config import settings
+from backend.app.utils import dependencies
+from backend.app.utils.auth import create_access_token, verify_token
+
+
+@pytest.fixture
+def counted_verify(monkeypatch):
+    """Cache activé et vide; compte les vérifications JWT réellement effectuées"""
+    calls = []
+
+    def verify(token):
+        calls.append(token)
+        return verify_token(token)
+
+    monkeypatch.setattr(settings, "CACHE_ENABLED", True)
+    monkeypatch.setattr(dependencies, "verify_token", verify)
+    dependencies._token_cache.clear()
+    yield calls
+    dependencies._token_cache.clear()
+
+
+def test_cache_miss_verifies_and_stores(counted_verify):
+    token = create_access_token({"user_id": 1, "username": "alice"})
+
+    payload = dependencies._verify_token_cached(token)
+
+    assert payload["user_id"] == 1
+    assert counted_verify == [token]
+    assert dependencies._token_cache.get(token) == payload
+
+
+def test_cache_hit_skips_verification(counted_verify):
+    token = create_access_token({"user_id": 1, "username": "alice"})
+    first = dependencies._verify_token_cached(token)
+
+    second = dependencies._verify_token_cached(token)
+
+    assert second == first
+    assert counted_verify == [token]
+
+
+def test_invalid_token_is_not_cached(counted_verify):
+    assert dependencies._verify_token_cached("not-a-token") is None
+    assert dependencies._verify_token_cached("not-a-token") is None
+    assert counted_verify == ["not-a-token", "not-a-token"]
+
+
+def test_get_current_user_uses_token_cache(counted_verify, monkeypatch):
+    token = create_access_token({"user_id": 7, "username": "alice"})
+    seen = []
+
+    async def get_authenticated_user(self, user_id):
+        seen.append(user_id)
+        return None
+
+    monkeypatch.setattr(dependencies.UserService, "get_authenticated_user", get_authenticated_user)
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    for _ in range(2):
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(dependencies.get_current_user(credentials, db=None))
+        assert exc_info.value.status_code == 401
+
+    assert seen == [7, 7]
+    assert counted_verify == [token]
@@ -0,0 +1,33 @@
+@echo off
+REM Script de démarrage du processus worker - Loots&Live
+echo ================================================
+echo Demarrage des workers Loots^&Live
+echo ================================================
+echo.
+
+REM Vérifier si le venv existe
+if not exist venv (
+    echo ERREUR: L'environnement virtuel n'existe pas
+    echo Veuillez lancer install_dependencies.bat d'abord
+    pause
+    exit /b 1
+)
+
+echo [1/2] Activation de l'environnement virtuel...
+call venv\Scripts\activate.bat
+
+echo.
+echo [2/2] Demarrage du scheduler des jobs background...
+echo.
+echo Pensez a definir WORKERS_IN_PROCESS=False dans .env
+echo pour que l'API ne lance pas les jobs en double.
+echo.
+echo Appuyez sur CTRL+C pour arreter les workers
+echo.
+
+python -m backend.app.workers
+
+REM Si le processus s'arrête
+echo.
+echo Workers arretes.
+pause